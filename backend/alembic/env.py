@@ -16,6 +16,9 @@ from app.models.artist import Artist
 from app.models.work import Work
 from app.models.relationship import Relationship
 from app.models.agent_job import AgentJob
+from app.models.agent_result_cache import AgentResultCache
+from app.models.sync_state import SyncState
+from app.models.content_fingerprint import ContentFingerprint
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,32 @@
+"""Agent job queue columns
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('agent_jobs', sa.Column('parent_id', UUID(as_uuid=True), nullable=True))
+    op.add_column('agent_jobs', sa.Column('worker_id', sa.String(255), nullable=True))
+    op.add_column('agent_jobs', sa.Column('heartbeat_at', sa.DateTime, nullable=True))
+    op.create_index('idx_agent_jobs_parent_id', 'agent_jobs', ['parent_id'])
+    op.create_index('idx_agent_jobs_queue', 'agent_jobs', ['status', 'job_type', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_agent_jobs_queue', table_name='agent_jobs')
+    op.drop_index('idx_agent_jobs_parent_id', table_name='agent_jobs')
+    op.drop_column('agent_jobs', 'heartbeat_at')
+    op.drop_column('agent_jobs', 'worker_id')
+    op.drop_column('agent_jobs', 'parent_id')
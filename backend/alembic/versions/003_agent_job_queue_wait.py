@@ -0,0 +1,23 @@
+"""Agent job queue wait time
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('agent_jobs', sa.Column('queue_wait_ms', sa.Integer, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent_jobs', 'queue_wait_ms')
@@ -0,0 +1,41 @@
+"""Agent result cache
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'agent_result_cache',
+        sa.Column('key', sa.String(64), primary_key=True),
+        sa.Column('namespace', sa.String(100), nullable=False),
+        sa.Column('value', JSONB, nullable=False),
+        sa.Column('size_bytes', sa.Integer, nullable=False),
+        sa.Column('expires_at', sa.DateTime, nullable=True),
+        sa.Column('accessed_at', sa.DateTime, nullable=False),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+    )
+    op.create_index('idx_agent_result_cache_namespace', 'agent_result_cache', ['namespace'])
+    op.create_index('idx_agent_result_cache_expires_at', 'agent_result_cache', ['expires_at'])
+    op.create_index('idx_agent_result_cache_accessed_at', 'agent_result_cache', ['accessed_at'])
+
+    op.add_column('agent_jobs', sa.Column('cache_hits', sa.Integer, nullable=False, server_default='0'))
+    op.add_column('agent_jobs', sa.Column('cache_misses', sa.Integer, nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('agent_jobs', 'cache_misses')
+    op.drop_column('agent_jobs', 'cache_hits')
+    op.drop_table('agent_result_cache')
@@ -0,0 +1,23 @@
+"""Agent job step name for workflow checkpoints
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('agent_jobs', sa.Column('step_name', sa.String(100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent_jobs', 'step_name')
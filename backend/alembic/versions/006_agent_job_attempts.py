@@ -0,0 +1,26 @@
+"""Agent job retry attempts
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('agent_jobs', sa.Column('attempts', sa.Integer, nullable=True))
+    op.add_column('agent_jobs', sa.Column('attempt_log', JSONB, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent_jobs', 'attempt_log')
+    op.drop_column('agent_jobs', 'attempts')
@@ -0,0 +1,41 @@
+"""MediaWiki recentchanges sync
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_state',
+        sa.Column('name', sa.String(100), primary_key=True),
+        sa.Column('cursor', JSONB, nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+    )
+
+    for table in ('artists', 'works'):
+        op.add_column(table, sa.Column('mediawiki_revision_id', sa.Integer, nullable=True))
+        op.add_column(table, sa.Column('mediawiki_content', sa.Text, nullable=True))
+        op.add_column(table, sa.Column('mediawiki_synced_at', sa.DateTime, nullable=True))
+        op.create_index(f'idx_{table}_mediawiki_page_title', table, ['mediawiki_page_title'])
+
+
+def downgrade() -> None:
+    for table in ('works', 'artists'):
+        op.drop_index(f'idx_{table}_mediawiki_page_title', table_name=table)
+        op.drop_column(table, 'mediawiki_synced_at')
+        op.drop_column(table, 'mediawiki_content')
+        op.drop_column(table, 'mediawiki_revision_id')
+
+    op.drop_table('sync_state')
@@ -0,0 +1,32 @@
+"""Content fingerprints for near-duplicate detection
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'content_fingerprints',
+        sa.Column('artist_key', sa.String(255), nullable=False),
+        sa.Column('source_url', sa.Text, nullable=False),
+        sa.Column('simhash', sa.BigInteger, nullable=False),
+        sa.Column('digest', sa.String(64), nullable=False),
+        sa.Column('changed_at', sa.DateTime, nullable=False),
+        sa.Column('checked_at', sa.DateTime, nullable=False),
+        sa.PrimaryKeyConstraint('artist_key', 'source_url'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('content_fingerprints')
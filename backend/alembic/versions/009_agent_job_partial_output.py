@@ -0,0 +1,23 @@
+"""Agent job partial output for streaming
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('agent_jobs', sa.Column('partial_output', sa.Text, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent_jobs', 'partial_output')
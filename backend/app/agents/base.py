@@ -12,6 +12,9 @@ logger = logging.getLogger(__name__)
 class BaseAgent(ABC):
     """모든 에이전트의 베이스 클래스"""
 
+    # 출력 형식이나 로직이 바뀌면 올려서 이전 캐시 결과를 무효화
+    version = "1"
+
     def __init__(self, name: str):
         self.name = name
         self.logger = logging.getLogger(f"agent.{name}")
@@ -40,3 +43,16 @@ class BaseAgent(ABC):
     async def validate_input(self, task_data: Dict[str, Any]) -> bool:
         """입력 데이터 검증"""
         return True
+
+    def estimate_tokens(self, task_data: Dict[str, Any]) -> int:
+        """토큰 기반 속도 제한에 사용할 예상 토큰 수 (LLM 에이전트만 해당)"""
+        return 0
+
+    def schedules_requests(self, task_data: Dict[str, Any]) -> bool:
+        """
+        작업 하나가 여러 요청을 보내 요청마다 스케줄러 슬롯을 받는지
+
+        True 이면 오케스트레이터는 작업 전체에 슬롯을 잡지 않고, 에이전트가
+        current_schedule 범위에서 요청마다 슬롯을 받습니다.
+        """
+        return False
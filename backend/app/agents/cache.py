@@ -0,0 +1,77 @@
+"""
+Agent Result Cache - 에이전트 출력 메모이제이션
+"""
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from app.core.config import settings
+from app.services.cache import CacheBackend, content_hash, create_backend
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    에이전트 결과 캐시
+
+    키는 (agent_type, agent version, task_data 정규화 해시)이며, TTL이
+    설정된 에이전트 타입만 캐시합니다. MediaWiki 처럼 부작용이 있는
+    에이전트는 TTL을 두지 않아 항상 실행됩니다.
+    """
+
+    def __init__(self, backend: CacheBackend, ttls: Dict[str, int]):
+        self.backend = backend
+        self.ttls = ttls
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, session_factory: Optional[Callable] = None) -> "ResultCache":
+        backend = create_backend(
+            settings.AGENT_CACHE_BACKEND,
+            max_bytes=settings.AGENT_CACHE_MAX_BYTES,
+            directory=settings.AGENT_CACHE_DIR,
+            session_factory=session_factory
+        )
+        return cls(backend, settings.AGENT_CACHE_TTL)
+
+    def is_cacheable(self, agent_type: str) -> bool:
+        return bool(self.ttls.get(agent_type))
+
+    def key(self, agent_type: str, version: str, task_data: Dict[str, Any]) -> str:
+        return content_hash(agent_type, version, task_data)
+
+    async def get(self, agent_type: str, version: str, task_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """캐시된 결과 조회 (백엔드 오류는 미적중으로 처리)"""
+        try:
+            value = await self.backend.get(self.key(agent_type, version, task_data))
+        except Exception as e:
+            logger.warning(f"Result cache lookup failed for {agent_type}: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, agent_type: str, version: str, task_data: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """결과 저장 (실패해도 작업 결과에는 영향 없음)"""
+        try:
+            await self.backend.set(
+                self.key(agent_type, version, task_data),
+                result,
+                ttl=self.ttls.get(agent_type),
+                namespace=agent_type
+            )
+        except Exception as e:
+            logger.warning(f"Result cache store failed for {agent_type}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -1,54 +1,252 @@
 """
 Crawler Agent - 외부 소스에서 작가 정보 수집
 """
-from typing import Dict, Any
-import httpx
-from bs4 import BeautifulSoup
+from collections import deque
+from functools import partial
+from typing import Dict, Any, List, Optional
+import time
 
 from app.agents.base import BaseAgent
+from app.core.config import settings
+from app.core.http import decode_body, http_clients, stream_get
+from app.core.loop_monitor import loop_monitor
+from app.services.crawl_frontier import CrawlFrontier, host_politeness, robots_cache
+from app.services.extractors import extract_page, merge_facts
+from app.services.fingerprints import fingerprint_facts, fingerprint_store
+from app.services.html_parser import html_parse_pool
+from app.services.http_cache import crawler_http_cache
 
 
 class CrawlerAgent(BaseAgent):
     """크롤링 에이전트"""
 
+    # 2: raw_html 대신 추출한 팩트(facts)를 반환
+    # 3: 팩트 지문(fingerprint)과 내용 기준 unchanged
+    # 4: 기준 지문은 워크플로우 성공 후 저장 (fingerprint_baseline)
+    # 5: unchanged 는 내용 지문으로만 판단 (HTTP 캐시 결과는 `http_cache` 로 분리)
+    version = "5"
+
     def __init__(self):
         super().__init__("crawler")
+        # 최근 크롤링의 수신 크기, 파싱 시간, 이벤트 루프 지연
+        self.reports: deque = deque(maxlen=100)
 
     async def execute(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         크롤링 작업 실행
 
+        본문은 스트리밍으로 CRAWLER_MAX_BYTES 까지만 받고, HTML 파싱은
+        파싱 프로세스 풀에서 실행해 이벤트 루프를 막지 않습니다.
+        `urls` 가 있으면 여러 URL(과 따라간 링크)을 프런티어로 크롤링합니다.
+
         Args:
             task_data: {
                 "url": "크롤링할 URL",
-                "artist_name": "작가 이름"
+                "urls": ["시드 URL", ...] (다중 URL 크롤링, url 대신 사용),
+                "follow": {"depth": 1, "pattern": "정규식", "same_host": true} (선택),
+                "max_pages": "최대 페이지 수 (선택)",
+                "artist_name": "작가 이름",
+                "artist_id": "작가 ID (선택, 지문 비교 기준)"
             }
 
         Returns:
-            크롤링 결과
+            크롤링 결과 (`facts`: 추출한 작가 팩트, `fingerprint`: 팩트의 SimHash,
+            `unchanged`: 마지막으로 게시한 내용 이후 의미 있게 바뀌지 않음,
+            `fingerprint_baseline`: 워크플로우 성공 후 기준으로 저장할 지문)
         """
         url = task_data.get("url")
+        urls = task_data.get("urls")
         artist_name = task_data.get("artist_name")
 
+        if urls:
+            return await self._crawl_many(urls, task_data)
         if not url:
             raise ValueError("URL is required")
 
         self.logger.info(f"Crawling data for {artist_name} from {url}")
+        page = await self._crawl_page(url)
+        baseline = await self._check_fingerprints(task_data, [page])
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=30.0)
-            response.raise_for_status()
+        extracted_data = {"name": artist_name, **page}
+        if baseline:
+            extracted_data["fingerprint_baseline"] = baseline
+
+        self.logger.info(f"Successfully crawled data for {artist_name}")
+
+        return extracted_data
+
+    async def _crawl_many(self, urls: List[str], task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """시드 URL 들을 호스트별 예의 규칙과 robots.txt 를 지키며 크롤링"""
+        artist_name = task_data.get("artist_name")
+        follow = task_data.get("follow") or {}
+        max_depth = int(follow.get("depth", 0))
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        frontier = CrawlFrontier(
+            lambda url, depth: self._crawl_page(url, with_links=depth < max_depth),
+            robots=robots_cache,
+            hosts=host_politeness,
+            max_concurrency=settings.CRAWLER_MAX_CONCURRENCY,
+            max_pages=min(int(task_data.get("max_pages") or settings.CRAWLER_MAX_PAGES), settings.CRAWLER_MAX_PAGES),
+            max_depth=max_depth,
+            follow_pattern=follow.get("pattern"),
+            same_host=follow.get("same_host", True)
+        )
 
-        # 기본 정보 추출 (예시 - 실제 구현은 소스에 따라 다름)
-        extracted_data = {
+        self.logger.info(f"Crawling {len(urls)} seed URLs for {artist_name} (depth={max_depth})")
+        pages, failed = await frontier.crawl(urls)
+        self.logger.info(f"Crawled {len(pages)} pages for {artist_name} ({len(failed)} failed)")
+
+        if not pages and failed:
+            raise RuntimeError(f"All crawls failed: {failed[0]['error']}")
+
+        baseline = await self._check_fingerprints(task_data, pages)
+
+        # 페이지별 팩트는 하나로 병합하고 목록에는 (중복 페이지도) 출처 정보만 남김
+        # (이번 크롤링의 다른 페이지와 거의 같은 페이지는 병합에서 제외)
+        crawled = {page["source_url"] for page in pages}
+        page_facts = [(page, page.pop("facts")) for page in pages]
+        facts = merge_facts(
+            [found for page, found in page_facts if page.get("duplicate_of") not in crawled],
+            token_budget=settings.CRAWLER_FACTS_TOKEN_BUDGET,
+            max_works=settings.CRAWLER_MAX_WORKS
+        )
+
+        # 팩트가 없는 페이지는 글에 반영할 내용이 없으므로 변경 판단에서 제외
+        unchanged = (
+            baseline is not None
+            and not failed
+            and all(page["unchanged"] for page in pages if "fingerprint" in page)
+        )
+        result = {
             "name": artist_name,
+            "facts": facts,
+            "pages": pages,
+            "failed": failed,
+            "unchanged": unchanged
+        }
+        if baseline:
+            result["fingerprint_baseline"] = baseline
+        return result
+
+    async def _crawl_page(self, url: str, with_links: bool = False) -> Dict[str, Any]:
+        """단일 페이지 수신 및 파싱 (with_links 이면 링크도 추출)"""
+        mark = loop_monitor.mark()
+        started = time.perf_counter()
+
+        if settings.CRAWLER_HTTP_CACHE_ENABLED:
+            # 이전에 받은 페이지는 If-None-Match/If-Modified-Since 로 재검증
+            page = await crawler_http_cache.get(url)
+            text, size, truncated, cache = page["text"], page["size"], page["truncated"], page["cache"]
+        else:
+            response, body, truncated = await stream_get(
+                http_clients.client("crawler"),
+                url,
+                max_bytes=settings.CRAWLER_MAX_BYTES,
+                content_types=settings.CRAWLER_ALLOWED_CONTENT_TYPES
+            )
+            response.raise_for_status()
+            text, size, cache = decode_body(response, body), len(body), None
+
+        fetch_ms = round((time.perf_counter() - started) * 1000, 2)
+        parsed, parse_ms = await html_parse_pool.run(
+            partial(
+                extract_page,
+                url=url,
+                with_links=with_links,
+                token_budget=settings.CRAWLER_FACTS_TOKEN_BUDGET,
+                max_works=settings.CRAWLER_MAX_WORKS
+            ),
+            text
+        )
+
+        report = {
+            "url": url,
+            "bytes": size,
+            "truncated": truncated,
+            "fetch_ms": fetch_ms,
+            "parse_ms": parse_ms,
+            "loop_stall_ms": loop_monitor.max_since(mark)
+        }
+        self.reports.append(report)
+        self.logger.info(
+            f"Crawled {url} ({size} bytes, fetch {fetch_ms}ms, parse {parse_ms}ms, "
+            f"max loop stall {report['loop_stall_ms']}ms)"
+        )
+
+        page = {
             "source_url": url,
-            "raw_html": response.text[:1000],  # 처음 1000자만
-            "title": soup.title.string if soup.title else None,
+            "title": parsed["title"],
+            "facts": parsed["facts"],
+            "truncated": truncated,
+            # HTTP 캐시는 전송 최적화일 뿐이며, 304/max-age 는 URL 단위라 이 작가의
+            # 글에 반영됐는지와 무관하므로 unchanged 는 내용 지문으로만 판단
+            "http_cache": cache,
+            "unchanged": False
         }
+        if with_links:
+            page["links"] = parsed["links"]
+        return page
 
-        self.logger.info(f"Successfully crawled data for {artist_name}")
+    async def _check_fingerprints(
+        self,
+        task_data: Dict[str, Any],
+        pages: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        팩트 지문을 기준 지문과 비교해 `unchanged` 보정
 
-        return extracted_data
+        구조화 팩트가 같고 요약 문장이 광고, 날짜 표시 정도만 달라 SimHash 가
+        CONTENT_FINGERPRINT_MAX_DISTANCE 비트 이내면 변경 없음으로 보고, 이어지는 `skip_if_unchanged`
+        단계(글 재생성, 편집)를 건너뛰게 합니다. 비교하지 못하면(지문 비활성화,
+        작가 식별자 없음, 저장소 오류) 변경으로 봅니다.
+
+        Returns:
+            워크플로우가 성공하면 오케스트레이터가 기준으로 저장할 지문
+            ({"artist_key", "pages"}, 비교하지 않았으면 None)
+        """
+        artist_key = _artist_key(task_data)
+        targets = [page for page in pages if page["facts"]]
+        if not settings.CONTENT_FINGERPRINT_ENABLED or artist_key is None or not targets:
+            return None
+
+        entries = [{"source_url": page["source_url"], **fingerprint_facts(page["facts"])} for page in targets]
+        try:
+            results = await fingerprint_store.check(artist_key, entries)
+        except Exception as e:
+            self.logger.warning(f"Fingerprint check failed for {artist_key}: {e}")
+            return None
+
+        for page, result in zip(targets, results):
+            page["fingerprint"] = result["fingerprint"]
+            if result["duplicate_of"]:
+                page["duplicate_of"] = result["duplicate_of"]
+            page["unchanged"] = not result["changed"]
+            self.logger.info(
+                f"Fingerprint {result['fingerprint']} for {page['source_url']} "
+                f"(distance={result['distance']}, changed={result['changed']}, duplicate_of={result['duplicate_of']})"
+            )
+
+        return {
+            "artist_key": artist_key,
+            "pages": [
+                {key: result[key] for key in ("source_url", "fingerprint", "digest", "moved")}
+                for result in results
+            ]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """최근 크롤링 보고와 이벤트 루프 지연 통계"""
+        recent: List[Dict[str, Any]] = list(self.reports)
+        return {
+            "recent": recent,
+            "max_loop_stall_ms": max((r["loop_stall_ms"] for r in recent), default=0.0),
+            "loop": loop_monitor.stats()
+        }
+
+
+def _artist_key(task_data: Dict[str, Any]) -> Optional[str]:
+    """지문 비교 기준 작가 식별자 (ID, 없으면 정규화한 이름)"""
+    if task_data.get("artist_id"):
+        return f"id:{task_data['artist_id']}"
+    name = " ".join(str(task_data.get("artist_name") or "").split()).casefold()
+    return f"name:{name}" if name else None
@@ -1,22 +1,30 @@
 """
 MediaWiki Agent - MediaWiki API 연동
 """
-from typing import Dict, Any, Optional
-import httpx
+from typing import Dict, Any, Callable, List, Optional
 
 from app.agents.base import BaseAgent
-from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.mediawiki import (
+    EditConflictError, MediaWikiAPIError, MediaWikiSession, RevisionLoader, content_sha1, mediawiki_session
+)
+from app.services.rendered_pages import rendered_pages
+from app.services.wiki_sync import record_edit
+
+# 편집 충돌로 실패시킬 오류 코드 (조회 이후 다른 편집/생성/삭제)
+EDIT_CONFLICT_CODES = {"editconflict", "articleexists", "pagedeleted", "missingtitle"}
 
 
 class MediaWikiAgent(BaseAgent):
     """미디어위키 연동 에이전트"""
 
-    def __init__(self):
+    def __init__(self, session: Optional[MediaWikiSession] = None, session_factory: Callable = AsyncSessionLocal):
         super().__init__("mediawiki")
-        self.api_url = settings.MEDIAWIKI_API_URL
-        self.username = settings.MEDIAWIKI_BOT_USERNAME
-        self.password = settings.MEDIAWIKI_BOT_PASSWORD
-        self.token: Optional[str] = None
+        # 로그인 세션과 CSRF 토큰은 모든 워크플로우가 공유
+        self.session = session or mediawiki_session
+        self.session_factory = session_factory
+        # 동시에 실행되는 편집 단계들의 현재 리비전 조회를 모아 처리
+        self.revisions = RevisionLoader(self.session)
 
     async def execute(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -26,7 +34,8 @@ class MediaWikiAgent(BaseAgent):
             task_data: {
                 "action": "create|edit|delete",
                 "page_title": "페이지 제목",
-                "content": "페이지 내용"
+                "content": "페이지 내용",
+                "base_revision": "미리 조회한 리비전 정보 (선택, 없으면 일괄 조회)"
             }
 
         Returns:
@@ -41,12 +50,8 @@ class MediaWikiAgent(BaseAgent):
 
         self.logger.info(f"Executing MediaWiki action: {action} for page: {page_title}")
 
-        # 토큰 획득 (필요 시)
-        if not self.token:
-            await self._login()
-
         if action == "create" or action == "edit":
-            result = await self._edit_page(page_title, content)
+            result = await self._edit_page(page_title, content, task_data.get("base_revision"))
         elif action == "delete":
             result = await self._delete_page(page_title)
         else:
@@ -56,114 +61,110 @@ class MediaWikiAgent(BaseAgent):
 
         return result
 
-    async def _login(self) -> None:
-        """MediaWiki 로그인 및 토큰 획득"""
-        async with httpx.AsyncClient() as client:
-            # 로그인 토큰 획득
-            response = await client.get(
-                self.api_url,
-                params={
-                    "action": "query",
-                    "meta": "tokens",
-                    "type": "login",
-                    "format": "json"
-                }
-            )
-            data = response.json()
-            login_token = data["query"]["tokens"]["logintoken"]
-
-            # 로그인
-            response = await client.post(
-                self.api_url,
-                data={
-                    "action": "login",
-                    "lgname": self.username,
-                    "lgpassword": self.password,
-                    "lgtoken": login_token,
-                    "format": "json"
-                }
-            )
-
-            # CSRF 토큰 획득
-            response = await client.get(
-                self.api_url,
-                params={
-                    "action": "query",
-                    "meta": "tokens",
-                    "format": "json"
-                }
-            )
-            data = response.json()
-            self.token = data["query"]["tokens"]["csrftoken"]
-
-        self.logger.info("Successfully logged in to MediaWiki")
-
-    async def _edit_page(self, page_title: str, content: str) -> Dict[str, Any]:
-        """페이지 생성/편집"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.api_url,
-                data={
-                    "action": "edit",
-                    "title": page_title,
-                    "text": content,
-                    "token": self.token,
-                    "format": "json",
-                    "bot": "1"
-                }
-            )
-            result = response.json()
-
-            if "error" in result:
-                raise Exception(f"MediaWiki API error: {result['error']}")
-
-            return {
-                "page_title": page_title,
-                "page_id": result.get("edit", {}).get("pageid"),
-                "status": "success"
-            }
+    async def _edit_page(
+        self,
+        page_title: str,
+        content: str,
+        base_revision: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        페이지 생성/편집
+
+        현재 리비전의 sha1 이 새 본문의 해시와 같으면 편집하지 않고
+        `skipped` 로 끝냅니다. 실제 편집은 조회한 리비전의 basetimestamp 와
+        starttimestamp 를 함께 보내므로, 그 사이 다른 편집이나 삭제가 있으면
+        저장하지 않고 EditConflictError 로 실패합니다 (재시도하지 않으며,
+        워크플로우를 재개하면 리비전을 다시 조회해 편집).
+        """
+        current = base_revision or await self.revisions.load(page_title)
+
+        if current.get("exists") and current.get("sha1") == content_sha1(content):
+            return self._edit_result(page_title, "skipped", current.get("page_id"), current.get("revision_id"))
+
+        data = {
+            "action": "edit",
+            "title": page_title,
+            "text": content,
+            "bot": "1"
+        }
+        if current.get("start_timestamp"):
+            data["starttimestamp"] = current["start_timestamp"]
+        if current.get("exists"):
+            data["basetimestamp"] = current.get("timestamp")
+            data["nocreate"] = "1"
+        else:
+            data["createonly"] = "1"
+
+        try:
+            result = await self.session.post(data)
+        except MediaWikiAPIError as e:
+            if e.code not in EDIT_CONFLICT_CODES:
+                raise
+            self.logger.warning(f"Edit conflict on {page_title}: {e.code}")
+            # 다른 편집으로 바뀐 페이지이므로 렌더링 캐시도 최신 리비전을 다시 확인
+            await rendered_pages.invalidate(current.get("page_id"), page_title=page_title)
+            raise EditConflictError(page_title, e.error) from e
+
+        edit = result.get("edit", {})
+        outcome = "skipped" if "nochange" in edit else "edited"
+        if outcome == "edited":
+            await rendered_pages.invalidate(edit.get("pageid"), edit.get("newrevid"), page_title)
+            await self._record_revision(page_title, edit.get("pageid"), edit.get("newrevid"), content)
+        return self._edit_result(page_title, outcome, edit.get("pageid"), edit.get("newrevid"))
+
+    async def _record_revision(
+        self,
+        page_title: str,
+        page_id: Optional[int],
+        revision_id: Optional[int],
+        content: str
+    ) -> None:
+        """
+        새 리비전을 작가/작품 행에 기록 (다른 프로세스의 렌더링 캐시가 새 리비전을 사용)
+
+        편집은 이미 반영됐으므로 기록에 실패하면 경고만 남깁니다 (동기화가 나중에 반영).
+        """
+        if page_id is None or not revision_id:
+            return
+        try:
+            async with self.session_factory() as db:
+                await record_edit(db, page_title, page_id, revision_id, content)
+        except Exception as e:
+            self.logger.warning(f"Failed to record revision {revision_id} of {page_title}: {e}")
+
+    def _edit_result(
+        self,
+        page_title: str,
+        outcome: str,
+        page_id: Optional[int],
+        revision_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return {
+            "page_title": page_title,
+            "page_id": page_id,
+            "revision_id": revision_id,
+            "status": "success",
+            "outcome": outcome  # edited | skipped
+        }
 
     async def _delete_page(self, page_title: str) -> Dict[str, Any]:
         """페이지 삭제"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.api_url,
-                data={
-                    "action": "delete",
-                    "title": page_title,
-                    "token": self.token,
-                    "format": "json"
-                }
-            )
-            result = response.json()
-
-            if "error" in result:
-                raise Exception(f"MediaWiki API error: {result['error']}")
-
-            return {
-                "page_title": page_title,
-                "status": "deleted"
-            }
+        await self.session.post({
+            "action": "delete",
+            "title": page_title
+        })
+        await rendered_pages.invalidate(page_title=page_title)
+
+        return {
+            "page_title": page_title,
+            "status": "deleted"
+        }
 
     async def get_page(self, page_title: str) -> Dict[str, Any]:
-        """페이지 조회"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.api_url,
-                params={
-                    "action": "parse",
-                    "page": page_title,
-                    "format": "json"
-                }
-            )
-            result = response.json()
-
-            if "error" in result:
-                return {"error": result["error"], "exists": False}
-
-            return {
-                "page_title": page_title,
-                "page_id": result.get("parse", {}).get("pageid"),
-                "content": result.get("parse", {}).get("wikitext", {}).get("*"),
-                "exists": True
-            }
+        """페이지 조회 (위키텍스트와 최신 리비전 정보)"""
+        pages = await self.get_pages([page_title])
+        return pages[page_title]
+
+    async def get_pages(self, page_titles: List[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 페이지 일괄 조회 (제목별 결과)"""
+        return await self.session.read_pages(titles=page_titles)
@@ -1,24 +1,48 @@
 """
 Agent Orchestrator
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 import asyncio
 import logging
+import time
+import uuid
 from datetime import datetime
 
 from app.agents.base import BaseAgent
+from app.agents.cache import ResultCache
+from app.agents.recorder import JobRecorder, create_recorder
+from app.agents.resilience import CircuitBreaker, RetryPolicy, is_retryable
+from app.agents.scheduler import AgentScheduler
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.models.agent_job import AgentJob
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.fingerprints import fingerprint_store
+from app.services.job_queue import WORKFLOW_JOB_TYPE
+from app.services.job_stream import current_job_id
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 logger = logging.getLogger(__name__)
 
+# 입력 매핑에서 워크플로우 컨텍스트를 가리키는 참조 이름
+CONTEXT_REF = "context"
+
 
 class AgentOrchestrator:
     """에이전트 오케스트레이터 - 모든 에이전트를 조율"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        recorder: Optional[JobRecorder] = None
+    ):
         self.agents: Dict[str, BaseAgent] = {}
+        self.session_factory = session_factory
+        self.recorder = recorder or create_recorder(session_factory)
+        self.scheduler = AgentScheduler()
+        self._result_cache: Optional[ResultCache] = None
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self.logger = logging.getLogger("orchestrator")
 
     def register_agent(self, agent_type: str, agent: BaseAgent) -> None:
@@ -26,19 +50,44 @@ class AgentOrchestrator:
         self.agents[agent_type] = agent
         self.logger.info(f"Registered agent: {agent_type}")
 
+    @property
+    def result_cache(self) -> ResultCache:
+        """에이전트 결과 캐시 (첫 사용 시 Settings 로 생성)"""
+        if self._result_cache is None:
+            self._result_cache = ResultCache.from_settings(self.session_factory)
+        return self._result_cache
+
+    @result_cache.setter
+    def result_cache(self, cache: ResultCache) -> None:
+        self._result_cache = cache
+
     async def execute_workflow(
         self,
         workflow: List[Dict[str, Any]],
-        db: AsyncSession,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        max_parallel: Optional[int] = None,
+        workflow_id: Optional[UUID] = None,
+        use_cache: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         워크플로우 실행
 
+        단계 중 하나라도 `depends_on` 을 선언하면 DAG 모드로 실행되어
+        서로 의존하지 않는 단계들이 동시에 실행됩니다. 선언이 없으면
+        기존과 같이 정의 순서대로 하나씩 실행됩니다.
+
+        모든 워크플로우는 `workflow` 타입의 AgentJob 으로 기록되고 각 단계의
+        출력은 단계 작업(parent_id, step_name)에 체크포인트로 남습니다.
+        기존 workflow_id 로 다시 실행하면 이미 성공한 단계는 저장된 출력으로
+        컨텍스트를 복원하고 나머지 단계만 실행합니다.
+
         Args:
             workflow: 워크플로우 정의 (에이전트 순서 및 설정)
-            db: 데이터베이스 세션
             context: 공유 컨텍스트
+            max_parallel: 동시에 실행할 최대 단계 수
+            workflow_id: 워크플로우 작업 ID (없으면 새로 생성, 있으면 체크포인트에서 재개)
+            use_cache: 결과 캐시 사용 여부 (기본값: AGENT_CACHE_ENABLED,
+                단계의 `cache` 값이 있으면 그 값이 우선)
 
         Returns:
             실행 결과
@@ -46,49 +95,396 @@ class AgentOrchestrator:
         if context is None:
             context = {}
 
-        results = []
+        graph = self._build_graph(workflow)
+        dag_mode = any(step.get("depends_on") is not None for step in workflow)
+        semaphore = asyncio.Semaphore(max_parallel or settings.WORKFLOW_MAX_PARALLEL)
 
-        for step in workflow:
-            agent_type = step.get("agent_type")
-            task_data = step.get("task_data", {})
+        base_context = dict(context)
+        outputs: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = dict(graph)
 
-            # 컨텍스트 병합
-            task_data.update(context)
+        if workflow_id is None:
+            workflow_id = uuid.uuid4()
+            await self.recorder.start(AgentJob(
+                id=workflow_id,
+                job_type=WORKFLOW_JOB_TYPE,
+                status="running",
+                input_data={
+                    "workflow": workflow,
+                    "context": base_context,
+                    "max_parallel": max_parallel,
+                    "use_cache": use_cache
+                },
+                started_at=datetime.utcnow()
+            ))
+        else:
+            # 이전 실행에서 성공한 단계는 체크포인트로 대체
+            checkpoints = await self._load_checkpoints(workflow_id)
+            for name, checkpoint in checkpoints.items():
+                if name in pending:
+                    pending.pop(name)
+                    outputs[name] = checkpoint["output"]
+                    results[name] = {
+                        "status": "success",
+                        "job_id": checkpoint["job_id"],
+                        "output": checkpoint["output"],
+                        "step": name,
+                        "resumed": True
+                    }
 
-            result = await self.execute_task(
-                agent_type=agent_type,
-                task_data=task_data,
-                db=db
+        # 에이전트 스케줄러의 워크플로우 간 공정 큐잉 단위
+        fair_key = workflow_id
+        running: Dict[asyncio.Task, str] = {}
+        failed = False
+
+        finished = False
+        try:
+            while pending or running:
+                if not failed:
+                    ready = [
+                        name for name, step in pending.items()
+                        if all(dep in outputs for dep in step["depends_on"])
+                    ]
+                    for name in ready:
+                        step = pending.pop(name)
+                        task_data = self._build_task_data(step, base_context, outputs, dag_mode)
+                        if self._can_skip(step, outputs):
+                            task = asyncio.create_task(self._skip_step(step, task_data, workflow_id))
+                        else:
+                            task = asyncio.create_task(self._run_step(
+                                step,
+                                task_data,
+                                semaphore,
+                                workflow_id=workflow_id,
+                                fair_key=fair_key,
+                                use_cache=use_cache
+                            ))
+                        running[task] = name
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    try:
+                        result = task.result()
+                    except (Exception, asyncio.CancelledError) as e:
+                        # 단계 실행 자체의 예외(기록 실패 등)도 단계 실패로 처리
+                        logger.error(f"Workflow {workflow_id} step {name} raised: {e!r}")
+                        result = {"status": "error", "error": str(e) or repr(e)}
+                    result["step"] = name
+                    results[name] = result
+
+                    if result.get("status") == "success":
+                        outputs[name] = result.get("output", {})
+                    else:
+                        # 실패 시 새 단계를 시작하지 않고 실행 중인 단계만 마무리
+                        failed = True
+            finished = True
+        finally:
+            if not finished:
+                # 취소되거나 예상 밖 오류로 중단: 남은 단계를 취소하고 워크플로우를 실패로 기록
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                ordered_results = [results[name] for name in graph if name in results]
+                await self._finish_workflow(
+                    workflow_id,
+                    ordered_results,
+                    _cache_stats(ordered_results),
+                    failed=True,
+                    error="Workflow interrupted before all steps finished"
+                )
+
+        # 다음 단계를 위해 컨텍스트 업데이트 (정의 순서대로 병합)
+        for name in graph:
+            if name in outputs:
+                context.update(outputs[name])
+                if dag_mode:
+                    context[name] = outputs[name]
+
+        ordered_results = [results[name] for name in graph if name in results]
+        cache_stats = _cache_stats(ordered_results)
+
+        if not failed:
+            await self._commit_fingerprints(outputs)
+        await self._finish_workflow(workflow_id, ordered_results, cache_stats, failed)
+
+        return {
+            "status": "failed" if failed else "completed",
+            "workflow_id": str(workflow_id),
+            "results": ordered_results,
+            "context": context,
+            "cache": cache_stats
+        }
+
+    async def _load_checkpoints(self, workflow_id: UUID) -> Dict[str, Dict[str, Any]]:
+        """워크플로우의 성공한 단계 출력 조회 (단계 이름별 최신 결과)"""
+        await self.recorder.flush()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(AgentJob.id, AgentJob.step_name, AgentJob.output_data)
+                .filter(
+                    AgentJob.parent_id == workflow_id,
+                    AgentJob.status == "success",
+                    AgentJob.step_name.isnot(None)
+                )
+                .order_by(AgentJob.completed_at)
             )
+            rows = result.all()
+
+        return {
+            row.step_name: {"job_id": str(row.id), "output": row.output_data or {}}
+            for row in rows
+        }
+
+    async def _commit_fingerprints(self, outputs: Dict[str, Dict[str, Any]]) -> None:
+        """
+        크롤링 단계가 비교한 내용 지문을 기준으로 저장
+
+        모든 단계(글 작성, 편집)가 성공한 뒤에만 기준을 옮기므로, 실패한
+        워크플로우의 변경은 다음 크롤링에서도 변경으로 감지됩니다. 체크포인트에서
+        복원한 크롤링 출력도 포함되며, 저장에 실패하면 다음 실행이 같은 변경을
+        다시 처리할 뿐이므로 경고만 남깁니다. 편집 충돌(`outcome: conflict`)로
+        저장되지 않은 단계 출력이 있으면 (예: 이전 버전이 남긴 체크포인트) 게시되지
+        않은 것이므로 기준을 옮기지 않습니다.
+        """
+        if any(output.get("outcome") == "conflict" for output in outputs.values()):
+            logger.warning("Skipping fingerprint baseline commit: a step ended in an edit conflict")
+            return
+
+        for output in outputs.values():
+            baseline = output.get("fingerprint_baseline")
+            if not baseline:
+                continue
+            try:
+                await fingerprint_store.commit(baseline["artist_key"], baseline["pages"])
+            except Exception as e:
+                logger.warning(f"Fingerprint baseline commit failed for {baseline['artist_key']}: {e}")
+
+    async def _finish_workflow(
+        self,
+        workflow_id: UUID,
+        results: List[Dict[str, Any]],
+        cache_stats: Dict[str, int],
+        failed: bool,
+        error: Optional[str] = None
+    ) -> None:
+        """워크플로우 작업 상태 기록 (단계 출력은 단계 작업에만 저장)"""
+        errors = [r.get("error") for r in results if r.get("status") != "success"]
+        if error:
+            errors.insert(0, error)
+
+        await self.recorder.finish(
+            workflow_id,
+            status="failed" if failed else "success",
+            output_data={
+                "steps": [
+                    {key: value for key, value in r.items() if key != "output"}
+                    for r in results
+                ]
+            },
+            error_message=errors[0] if errors else None,
+            cache_hits=cache_stats["hits"],
+            cache_misses=cache_stats["misses"],
+            completed_at=datetime.utcnow()
+        )
+        # 워크플로우 종료 시점에는 단계 기록까지 모두 조회 가능해야 함
+        await self.recorder.flush()
+
+    def validate_workflow(self, workflow: List[Dict[str, Any]]) -> None:
+        """워크플로우 정의 검증 (잘못된 경우 ValueError)"""
+        self._build_graph(workflow)
 
-            results.append(result)
+    def _build_graph(self, workflow: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        워크플로우 정의를 단계 이름 기반 DAG로 변환
+
+        `name` 이 없으면 agent_type 을 이름으로 사용하고, 중복되면
+        `{agent_type}_{index}` 로 구분합니다. DAG 모드가 아니면 각 단계는
+        바로 앞 단계에 의존하고, 앞선 모든 단계의 출력을 입력으로 받습니다.
+        `inputs` 를 선언한 단계는 참조한 단계에 의존하고 참조한 값만 받습니다.
+        """
+        dag_mode = any(step.get("depends_on") is not None for step in workflow)
+        graph: Dict[str, Dict[str, Any]] = {}
+        previous: Optional[str] = None
 
-            # 다음 단계를 위해 컨텍스트 업데이트
-            if result.get("status") == "success":
-                context.update(result.get("output", {}))
+        for index, step in enumerate(workflow):
+            agent_type = step.get("agent_type")
+            name = step.get("name")
+            if name is None:
+                name = agent_type if agent_type not in graph else f"{agent_type}_{index}"
+            if name in graph:
+                raise ValueError(f"Duplicate step name: {name}")
+
+            if dag_mode:
+                depends_on = list(step.get("depends_on") or [])
+                merge_from = depends_on
             else:
-                # 실패 시 중단
-                break
+                depends_on = [previous] if previous else []
+                merge_from = list(graph)
+
+            inputs = None
+            if step.get("inputs"):
+                # 명시적 입력 매핑이 있으면 참조한 값만 전달
+                inputs = {key: _parse_input_ref(name, ref) for key, ref in step["inputs"].items()}
+                merge_from = []
+                for source, _ in inputs.values():
+                    if source != CONTEXT_REF and source not in depends_on:
+                        depends_on.append(source)
+
+            graph[name] = {
+                **step,
+                "name": name,
+                "depends_on": depends_on,
+                "merge_from": merge_from,
+                "inputs": inputs
+            }
+            previous = name
+
+        for name, step in graph.items():
+            for dep in step["depends_on"]:
+                if dep not in graph:
+                    raise ValueError(f"Step '{name}' depends on unknown step '{dep}'")
+
+        # 위상 정렬로 순환 의존성 검사
+        in_degree = {name: len(step["depends_on"]) for name, step in graph.items()}
+        queue = [name for name, degree in in_degree.items() if degree == 0]
+        visited = 0
+        while queue:
+            current = queue.pop()
+            visited += 1
+            for name, step in graph.items():
+                if current in step["depends_on"]:
+                    in_degree[name] -= 1
+                    if in_degree[name] == 0:
+                        queue.append(name)
+
+        if visited != len(graph):
+            raise ValueError("Workflow contains a dependency cycle")
+
+        return graph
+
+    def _build_task_data(
+        self,
+        step: Dict[str, Any],
+        context: Dict[str, Any],
+        outputs: Dict[str, Dict[str, Any]],
+        dag_mode: bool
+    ) -> Dict[str, Any]:
+        """선행 단계의 출력을 이름별로 모아 단계 입력을 구성"""
+        task_data = dict(step.get("task_data") or {})
+
+        if step["inputs"] is not None:
+            for key, (source, path) in step["inputs"].items():
+                value = context if source == CONTEXT_REF else outputs[source]
+                task_data[key] = _resolve_path(value, path)
+            return task_data
+
+        # 컨텍스트 병합
+        task_data.update(context)
+        for dep in step["merge_from"]:
+            task_data.update(outputs[dep])
+            if dag_mode:
+                task_data[dep] = outputs[dep]
+
+        return task_data
+
+    def _can_skip(self, step: Dict[str, Any], outputs: Dict[str, Dict[str, Any]]) -> bool:
+        """`skip_if_unchanged` 단계의 모든 선행 단계 출력이 변경 없음인지"""
+        return bool(
+            step.get("skip_if_unchanged")
+            and step["depends_on"]
+            and all(outputs[dep].get("unchanged") for dep in step["depends_on"])
+        )
+
+    async def _skip_step(
+        self,
+        step: Dict[str, Any],
+        task_data: Dict[str, Any],
+        workflow_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        입력이 바뀌지 않은 단계를 실행하지 않고 성공으로 기록
+
+        출력에 `unchanged` 를 유지하므로 이어지는 `skip_if_unchanged`
+        단계(예: 크롤링 → 작성 → 편집)도 함께 건너뜁니다.
+        """
+        output = {"unchanged": True, "skipped": True}
+        now = datetime.utcnow()
+        job = AgentJob(
+            id=uuid.uuid4(),
+            job_type=step.get("agent_type"),
+            status="success",
+            parent_id=workflow_id,
+            step_name=step["name"],
+            input_data=task_data,
+            output_data=output,
+            started_at=now,
+            completed_at=now
+        )
+        await self.recorder.start(job)
 
         return {
-            "status": "completed",
-            "results": results,
-            "context": context
+            "status": "success",
+            "job_id": str(job.id),
+            "output": output,
+            "skipped": True
         }
 
+    async def _run_step(
+        self,
+        step: Dict[str, Any],
+        task_data: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        workflow_id: Optional[UUID] = None,
+        fair_key: Optional[UUID] = None,
+        use_cache: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """동시 실행 한도 내에서 단일 단계 실행"""
+        if step.get("cache") is not None:
+            use_cache = step["cache"]
+
+        async with semaphore:
+            return await self.execute_task(
+                agent_type=step.get("agent_type"),
+                task_data=task_data,
+                parent_id=workflow_id,
+                step_name=step["name"],
+                fair_key=fair_key,
+                use_cache=use_cache
+            )
+
     async def execute_task(
         self,
         agent_type: str,
         task_data: Dict[str, Any],
-        db: AsyncSession
+        parent_id: Optional[UUID] = None,
+        step_name: Optional[str] = None,
+        fair_key: Optional[UUID] = None,
+        use_cache: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         단일 에이전트 작업 실행
 
+        작업 상태는 에이전트 호출 전후에 기록기(recorder)를 통해 남기므로
+        에이전트가 I/O를 기다리는 동안에는 DB 커넥션을 점유하지 않습니다.
+        에이전트 호출은 타입별 스케줄링 정책(동시 실행 수, 초당 요청 수,
+        분당 토큰 수)을 통과한 뒤 실행되며, 대기 시간은 queue_wait_ms 로
+        기록됩니다. 일시적 오류는 에이전트 타입별 정책에 따라 재시도하고,
+        의존 서비스가 불안정하면 서킷 브레이커가 즉시 실패시킵니다.
+        결과 캐시를 사용하면 같은 에이전트 버전과 입력에 대한
+        이전 결과를 재사용하며, 적중 시 에이전트를 호출하지 않습니다.
+
         Args:
             agent_type: 에이전트 타입
             task_data: 작업 데이터
-            db: 데이터베이스 세션
+            parent_id: 소속 워크플로우 작업 ID
+            step_name: 워크플로우 내 단계 이름 (체크포인트 키)
+            fair_key: 공정 큐잉 단위 (기본값: 작업마다 별도)
+            use_cache: 결과 캐시 사용 여부 (기본값: AGENT_CACHE_ENABLED)
 
         Returns:
             실행 결과
@@ -101,48 +497,222 @@ class AgentOrchestrator:
                 "error": f"Unknown agent type: {agent_type}"
             }
 
+        if use_cache is None:
+            use_cache = settings.AGENT_CACHE_ENABLED
+        use_cache = use_cache and self.result_cache.is_cacheable(agent_type)
+
+        if use_cache:
+            cached = await self.result_cache.get(agent_type, agent.version, task_data)
+            if cached is not None:
+                now = datetime.utcnow()
+                job = AgentJob(
+                    id=uuid.uuid4(),
+                    job_type=agent_type,
+                    status="success",
+                    parent_id=parent_id,
+                    step_name=step_name,
+                    input_data=task_data,
+                    output_data=cached,
+                    cache_hits=1,
+                    started_at=now,
+                    completed_at=now
+                )
+                await self.recorder.start(job)
+
+                return {
+                    "status": "success",
+                    "job_id": str(job.id),
+                    "output": cached,
+                    "cached": True
+                }
+
         # AgentJob 생성
         job = AgentJob(
+            id=uuid.uuid4(),
             job_type=agent_type,
             status="running",
+            parent_id=parent_id,
+            step_name=step_name,
             input_data=task_data,
             started_at=datetime.utcnow()
         )
-        db.add(job)
-        await db.commit()
+        await self.recorder.start(job)
+
+        attempt_log: List[Dict[str, Any]] = []
+        # 에이전트가 부분 출력을 이 작업에 기록할 수 있도록 (예: 스트리밍 writer)
+        job_token = current_job_id.set(job.id)
 
         try:
             # 에이전트 실행
-            result = await agent.execute(task_data)
+            result = await self._call_agent(agent_type, agent, task_data, fair_key or job.id, attempt_log)
+
+            if use_cache:
+                await self.result_cache.set(agent_type, agent.version, task_data, result)
 
             # Job 업데이트
-            job.status = "success"
-            job.output_data = result
-            job.completed_at = datetime.utcnow()
+            await self.recorder.finish(
+                job.id,
+                status="success",
+                output_data=result,
+                queue_wait_ms=_total_queue_wait(attempt_log),
+                cache_misses=1 if use_cache else 0,
+                attempts=len(attempt_log),
+                attempt_log=attempt_log,
+                completed_at=datetime.utcnow()
+            )
 
             await agent.on_success(result)
 
-            return {
+            response = {
                 "status": "success",
                 "job_id": str(job.id),
-                "output": result
+                "output": result,
+                "attempts": len(attempt_log)
             }
+            if use_cache:
+                response["cached"] = False
+            return response
 
         except Exception as e:
             # Job 업데이트
-            job.status = "failed"
-            job.error_message = str(e)
-            job.completed_at = datetime.utcnow()
+            await self.recorder.finish(
+                job.id,
+                status="failed",
+                error_message=str(e),
+                queue_wait_ms=_total_queue_wait(attempt_log),
+                cache_misses=1 if use_cache else 0,
+                attempts=len(attempt_log),
+                attempt_log=attempt_log,
+                completed_at=datetime.utcnow()
+            )
 
             await agent.on_failure(e)
 
             return {
                 "status": "error",
                 "job_id": str(job.id),
-                "error": str(e)
+                "error": str(e),
+                "attempts": len(attempt_log)
             }
+
         finally:
-            await db.commit()
+            current_job_id.reset(job_token)
+
+    def circuit_breaker(self, agent_type: str) -> CircuitBreaker:
+        """에이전트 타입별 서킷 브레이커"""
+        breaker = self.circuit_breakers.get(agent_type)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                agent_type,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT
+            )
+            self.circuit_breakers[agent_type] = breaker
+        return breaker
+
+    async def _call_agent(
+        self,
+        agent_type: str,
+        agent: BaseAgent,
+        task_data: Dict[str, Any],
+        fair_key: UUID,
+        attempt_log: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        재시도 정책과 서킷 브레이커를 적용한 에이전트 호출
+
+        시도마다 스케줄러 슬롯을 새로 얻으므로 백오프 대기 중에는 슬롯을
+        점유하지 않습니다. 요청마다 슬롯을 받는 에이전트(schedules_requests)는
+        슬롯 대신 스케줄링 범위를 엽니다. 서킷이 열려 있으면 호출하지 않고 즉시 실패하며,
+        모든 시도는 attempt_log 에 기록됩니다.
+        """
+        policy = RetryPolicy.for_agent(agent_type)
+        breaker = self.circuit_breaker(agent_type)
+        tokens = agent.estimate_tokens(task_data)
+
+        for attempt in range(1, policy.max_attempts + 1):
+            entry: Dict[str, Any] = {"attempt": attempt, "started_at": datetime.utcnow().isoformat()}
+            attempt_log.append(entry)
+            if agent.schedules_requests(task_data):
+                slot = self.scheduler.scope(agent_type, fair_key)
+            else:
+                slot = self.scheduler.slot(agent_type, fair_key, tokens)
+            started = time.monotonic()
+
+            try:
+                with breaker.guard():
+                    async with slot:
+                        result = await agent.execute(task_data)
+            except Exception as e:
+                retryable = is_retryable(e)
+                entry.update(
+                    status="failed",
+                    error=str(e),
+                    retryable=retryable,
+                    queue_wait_ms=int(slot.wait_time * 1000),
+                    duration_ms=int((time.monotonic() - started) * 1000)
+                )
+
+                if not retryable or attempt == policy.max_attempts:
+                    raise
+
+                delay = policy.delay(attempt, e)
+                entry["retry_in_ms"] = int(delay * 1000)
+                self.logger.warning(
+                    f"Agent {agent_type} attempt {attempt}/{policy.max_attempts} failed, "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            entry.update(
+                status="success",
+                queue_wait_ms=int(slot.wait_time * 1000),
+                duration_ms=int((time.monotonic() - started) * 1000)
+            )
+            return result
+
+        raise RuntimeError("unreachable")
+
+
+def _parse_input_ref(step_name: str, ref: str) -> Tuple[str, List[str]]:
+    """
+    입력 참조 파싱
+
+    `<step>.output[.<field>...]` 는 단계 출력(또는 그 필드),
+    `context[.<field>...]` 는 워크플로우 컨텍스트를 가리킵니다.
+    """
+    parts = ref.split(".") if isinstance(ref, str) else []
+    if parts and parts[0] == CONTEXT_REF:
+        return CONTEXT_REF, parts[1:]
+    if len(parts) >= 2 and parts[0] and parts[1] == "output":
+        return parts[0], parts[2:]
+    raise ValueError(
+        f"Step '{step_name}' has invalid input reference '{ref}' "
+        f"(expected '<step>.output[.<field>]' or 'context[.<field>]')"
+    )
+
+
+def _resolve_path(value: Any, path: List[str]) -> Any:
+    """중첩 필드 조회 (없으면 None)"""
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _cache_stats(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """단계 결과의 결과 캐시 적중/미스 수"""
+    return {
+        "hits": sum(1 for r in results if r.get("cached") is True),
+        "misses": sum(1 for r in results if r.get("cached") is False)
+    }
+
+
+def _total_queue_wait(attempt_log: List[Dict[str, Any]]) -> int:
+    """모든 시도의 스케줄러 대기 시간 합계(ms)"""
+    return sum(entry.get("queue_wait_ms", 0) for entry in attempt_log)
 
 
 # 글로벌 오케스트레이터 인스턴스
@@ -0,0 +1,233 @@
+"""
+Job Recorder - AgentJob 상태 기록
+
+DirectJobRecorder 는 상태 변경마다 짧은 트랜잭션을 커밋하고,
+BufferedJobRecorder 는 변경을 모아 여러 행을 한 번에 INSERT/UPDATE 합니다.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from sqlalchemy import insert, update
+
+from app.core.config import settings
+from app.models.agent_job import AgentJob
+
+logger = logging.getLogger(__name__)
+
+
+class JobRecorder:
+    """AgentJob 상태 기록 인터페이스"""
+
+    def __init__(self, session_factory: Callable):
+        self.session_factory = session_factory
+
+    async def start(self, job: AgentJob) -> None:
+        """작업 행 생성"""
+        raise NotImplementedError
+
+    async def finish(self, job_id: UUID, **values: Any) -> None:
+        """작업 행 갱신"""
+        raise NotImplementedError
+
+    async def flush(self) -> None:
+        """대기 중인 변경 기록 (버퍼가 없으면 아무 것도 하지 않음)"""
+
+    async def close(self) -> None:
+        """종료 전 남은 변경 기록"""
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"recorder": type(self).__name__}
+
+
+class DirectJobRecorder(JobRecorder):
+    """상태 변경마다 단일 트랜잭션으로 즉시 기록"""
+
+    async def start(self, job: AgentJob) -> None:
+        async with self.session_factory() as db:
+            db.add(job)
+            await db.commit()
+
+    async def finish(self, job_id: UUID, **values: Any) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(AgentJob).filter(AgentJob.id == job_id).values(**values)
+            )
+            await db.commit()
+
+
+class BufferedJobRecorder(JobRecorder):
+    """
+    쓰기 지연(write-behind) 기록기
+
+    작업 생성과 상태 갱신을 메모리에 모아 두었다가 batch_size 개가 쌓이거나
+    flush_interval 초가 지나면 한 트랜잭션에서 다중 행 INSERT 와 기본 키 기준
+    일괄 UPDATE 로 기록합니다. 아직 기록되지 않은 작업의 종료 기록은 생성
+    행에 합쳐 한 번의 INSERT 로 처리합니다.
+
+    기록에 실패하면 변경을 버퍼로 되돌리고, 연속 실패 횟수에 따라
+    flush_interval 부터 max_backoff 까지 늘어나는 동안 자동 기록을 멈춥니다
+    (DB 장애 중에 상태 변경마다 실패하는 요청을 보내지 않도록). 되돌린 뒤에도
+    max_pending 행을 넘으면 실패한 변경 중 오래된 것부터 버립니다.
+
+    기록 전에 프로세스가 비정상 종료되면 버퍼의 변경은 유실되므로
+    종료 시 반드시 close() 를 호출해야 합니다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_pending: int = 50000,
+        max_backoff: float = 30.0
+    ):
+        super().__init__(session_factory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_backoff = max_backoff
+        self._consecutive_failures = 0
+        self._retry_at = 0.0  # 이 시각(monotonic) 전에는 자동 기록하지 않음
+        self._inserts: Dict[UUID, Dict[str, Any]] = {}
+        self._updates: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._inserts) + len(self._updates)
+
+    async def start(self, job: AgentJob) -> None:
+        self._inserts[job.id] = _row_values(job)
+        await self._after_write()
+
+    async def finish(self, job_id: UUID, **values: Any) -> None:
+        if job_id in self._inserts:
+            self._inserts[job_id].update(values)
+        else:
+            self._updates.setdefault(job_id, {}).update(values)
+        await self._after_write()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._inserts and not self._updates:
+                return
+
+            inserts, self._inserts = self._inserts, {}
+            updates, self._updates = self._updates, {}
+
+            try:
+                async with self.session_factory() as db:
+                    if inserts:
+                        await db.execute(insert(AgentJob), list(inserts.values()))
+                    for rows in _group_by_columns(updates).values():
+                        await db.execute(update(AgentJob), rows)
+                    await db.commit()
+            except Exception:
+                self.failures += 1
+                self._consecutive_failures += 1
+                backoff = min(self.max_backoff, self.flush_interval * 2 ** (self._consecutive_failures - 1))
+                self._retry_at = time.monotonic() + backoff
+                logger.exception(
+                    f"Failed to flush {len(inserts)} inserts and {len(updates)} updates, retrying in {backoff:.1f}s"
+                )
+                self._restore(inserts, updates)
+                return
+
+            self._consecutive_failures = 0
+            self._retry_at = 0.0
+            self.flushes += 1
+            self.rows_written += len(inserts) + len(updates)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recorder": type(self).__name__,
+            "pending": self.pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failures": self.failures,
+            "dropped": self.dropped
+        }
+
+    async def _after_write(self) -> None:
+        # 직전 기록이 실패했으면 대기 시간이 지날 때까지 주기적 기록에 맡김
+        if self.pending >= self.batch_size and time.monotonic() >= self._retry_at:
+            await self.flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """버퍼가 빌 때까지 flush_interval 마다 기록 (실패 후에는 대기 시간만큼 늦춤)"""
+        while self.pending:
+            await asyncio.sleep(max(self.flush_interval, self._retry_at - time.monotonic()))
+            await self.flush()
+
+    def _restore(self, inserts: Dict[UUID, Dict[str, Any]], updates: Dict[UUID, Dict[str, Any]]) -> None:
+        """기록 실패한 변경을 버퍼로 되돌림 (이후 변경이 우선)"""
+        for job_id, row in inserts.items():
+            row.update(self._updates.pop(job_id, {}))
+            self._inserts[job_id] = row
+        for job_id, values in updates.items():
+            values.update(self._updates.get(job_id, {}))
+            self._updates[job_id] = values
+
+        # 실패한 변경부터(오래된 순서로) 버려 버퍼 크기를 제한
+        overflow = self.pending - self.max_pending
+        if overflow > 0:
+            dropped = [*inserts, *updates][:overflow]
+            for job_id in dropped:
+                self._inserts.pop(job_id, None)
+                self._updates.pop(job_id, None)
+            self.dropped += len(dropped)
+            logger.error(f"Job recorder buffer over {self.max_pending} rows, dropped {len(dropped)} unwritten changes")
+
+
+def _row_values(job: AgentJob) -> Dict[str, Any]:
+    """
+    INSERT 용 전체 컬럼 값
+
+    모든 행이 같은 컬럼을 갖도록 비어 있는 값은 컬럼 기본값으로 채웁니다.
+    """
+    row = {}
+    for column in AgentJob.__table__.columns:
+        value = getattr(job, column.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+        row[column.key] = value
+    return row
+
+
+def _group_by_columns(updates: Dict[UUID, Dict[str, Any]]) -> Dict[frozenset, List[Dict[str, Any]]]:
+    """같은 컬럼을 갱신하는 행끼리 묶은 기본 키 기준 UPDATE 파라미터"""
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for job_id, values in updates.items():
+        groups.setdefault(frozenset(values), []).append({"id": job_id, **values})
+    return groups
+
+
+def create_recorder(session_factory: Callable) -> JobRecorder:
+    """Settings 의 JOB_RECORDER 에 따라 기록기 생성"""
+    if settings.JOB_RECORDER == "direct":
+        return DirectJobRecorder(session_factory)
+    if settings.JOB_RECORDER == "buffered":
+        return BufferedJobRecorder(
+            session_factory,
+            batch_size=settings.JOB_RECORDER_BATCH_SIZE,
+            flush_interval=settings.JOB_RECORDER_FLUSH_INTERVAL,
+            max_pending=settings.JOB_RECORDER_MAX_PENDING
+        )
+    raise ValueError(f"Unknown job recorder: {settings.JOB_RECORDER}")
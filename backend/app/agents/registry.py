@@ -0,0 +1,14 @@
+"""
+Agent Registry - 기본 에이전트 등록
+"""
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.crawler import CrawlerAgent
+from app.agents.writer import WriterAgent
+from app.agents.mediawiki import MediaWikiAgent
+
+
+def register_default_agents(orchestrator: AgentOrchestrator) -> None:
+    """API 서버와 워커가 공통으로 사용하는 에이전트 등록"""
+    orchestrator.register_agent("crawler", CrawlerAgent())
+    orchestrator.register_agent("writer", WriterAgent())
+    orchestrator.register_agent("mediawiki", MediaWikiAgent())
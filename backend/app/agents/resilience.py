@@ -0,0 +1,186 @@
+"""
+Resilience - 에이전트 호출 재시도 정책 및 서킷 브레이커
+"""
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional
+from datetime import datetime, timezone
+import asyncio
+import random
+import time
+
+import httpx
+
+from app.core.config import settings
+
+# 재시도 가능한 MediaWiki API 오류 코드
+# (maxlag/ratelimited 는 MediaWikiWriteScheduler 가 재전송하므로 여기서는 재시도하지 않음)
+RETRYABLE_MEDIAWIKI_CODES = {"readonly", "internal_api_error_DBQueryError"}
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않고 즉시 실패"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit open for {name}, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP 상태 코드 추출 (httpx, OpenAI SDK 예외)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    status_code = getattr(error, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적인 장애(타임아웃, 429, 5xx, MediaWiki readonly 등)인지 판별"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError)):
+        return True
+
+    code = getattr(error, "code", None)
+    if isinstance(code, str) and code in RETRYABLE_MEDIAWIKI_CODES:
+        return True
+
+    status_code = _status_code(error)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+
+    # OpenAI SDK의 연결/타임아웃 오류는 상태 코드가 없음
+    return type(error).__name__ in {"APIConnectionError", "APITimeoutError"}
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """서버가 지정한 재시도 대기 시간(초)"""
+    value = getattr(error, "retry_after", None)
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers or "retry-after" not in headers:
+        return None
+
+    header = headers["retry-after"]
+    try:
+        return max(0.0, float(header))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(header) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    재시도 정책
+
+    지수 백오프에 full jitter 를 적용합니다 (0 ~ min(max_delay, base_delay * 2^n)).
+    서버가 Retry-After 를 보낸 경우 그 값보다 짧게 기다리지 않습니다.
+    """
+
+    def __init__(self, max_attempts: int = 1, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def for_agent(cls, agent_type: str) -> "RetryPolicy":
+        return cls(**settings.AGENT_RETRY_POLICIES.get(agent_type, {}))
+
+    def delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """attempt 번째 실패 후 대기 시간(초)"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        server_delay = retry_after(error) if error is not None else None
+        if server_delay is not None:
+            return min(self.max_delay, max(backoff, server_delay))
+        return backoff
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커
+
+    재시도 가능한 오류가 failure_threshold 번 연속되면 열리고, reset_timeout
+    동안 호출을 즉시 실패시킵니다. 이후 half-open 상태에서 한 번의 시험
+    호출이 성공하면 닫히고, 실패하면 다시 열립니다. 재시도할 수 없는 오류나
+    취소로 끝난 시험 호출은 상태를 바꾸지 않고 다음 호출이 다시 시험합니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def before_call(self) -> bool:
+        """호출 가능 여부 확인 (열려 있으면 CircuitOpenError, half-open 시험 호출이면 True)"""
+        if self.state == "open":
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = "half_open"
+
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+            return True
+        return False
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        호출을 감싸 결과를 기록
+
+        성공하면 닫고, 재시도 가능한 오류는 실패로 셉니다. 어떻게 끝나든
+        (취소 포함) half-open 시험 호출 표시는 해제합니다.
+        """
+        probe = self.before_call()
+        try:
+            yield
+        except Exception as e:
+            if is_retryable(e):
+                self.record_failure()
+            raise
+        else:
+            self.record_success()
+        finally:
+            if probe:
+                self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = 0.0
+        if self.state == "open":
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "retry_in_seconds": retry_in
+        }
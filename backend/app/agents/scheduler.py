@@ -0,0 +1,249 @@
+"""
+Agent Scheduler - 에이전트 타입별 동시 실행 한도 및 속도 제한
+"""
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Hashable, List, Optional
+import asyncio
+import time
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한기
+
+    예약 방식으로 동작하여 잔량이 음수가 될 수 있으며, 호출자는 반환된
+    시간만큼 대기한 뒤 진행합니다. 먼저 예약한 호출이 먼저 진행되므로
+    대기 순서가 보장됩니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """amount 만큼 차감하고 대기해야 할 시간(초)을 반환"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class AgentSchedule:
+    """
+    단일 에이전트 타입의 스케줄링 정책
+
+    - max_in_flight: 동시에 실행 중인 호출 수 상한
+    - requests_per_second: 초당 호출 수 상한
+    - tokens_per_minute: 분당 토큰 사용량 상한 (LLM 에이전트)
+
+    대기 중인 호출은 워크플로우별 큐에 쌓이고 라운드 로빈으로 슬롯을
+    배정받으므로, 큰 배치가 다른 워크플로우를 굶기지 않습니다.
+    """
+
+    def __init__(
+        self,
+        agent_type: str,
+        max_in_flight: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        self.agent_type = agent_type
+        self.max_in_flight = max_in_flight
+        self.request_bucket = (
+            TokenBucket(requests_per_second, max(1.0, requests_per_second))
+            if requests_per_second else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+            if tokens_per_minute else None
+        )
+
+        self.in_flight = 0
+        self._waiters: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+        # 대기 시간 통계
+        self.calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    async def acquire(self, fair_key: Hashable, tokens: int = 0) -> float:
+        """슬롯과 속도 제한 예산을 확보하고 대기한 시간(초)을 반환"""
+        start = time.monotonic()
+
+        if self.max_in_flight is None or (self.in_flight < self.max_in_flight and not self._waiters):
+            self.in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(fair_key, deque()).append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # 슬롯을 배정받은 직후 취소된 경우 슬롯 반납
+                    self.release()
+                else:
+                    self._discard(fair_key, future)
+                raise
+
+        try:
+            delay = 0.0
+            if self.request_bucket:
+                delay = max(delay, self.request_bucket.reserve(1))
+            if self.token_bucket and tokens:
+                delay = max(delay, self.token_bucket.reserve(tokens))
+            if delay:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.release()
+            raise
+
+        waited = time.monotonic() - start
+        self.calls += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def release(self) -> None:
+        """슬롯 반납 후 다음 워크플로우의 대기 호출에 배정"""
+        self.in_flight -= 1
+
+        while self._waiters:
+            fair_key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            if queue:
+                # 같은 워크플로우의 다음 호출은 라운드 로빈 순서의 맨 뒤로
+                self._waiters.move_to_end(fair_key)
+            else:
+                del self._waiters[fair_key]
+
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+                return
+
+    def _discard(self, fair_key: Hashable, future: asyncio.Future) -> None:
+        queue = self._waiters.get(fair_key)
+        if queue and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._waiters[fair_key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "calls": self.calls,
+            "avg_queue_wait_ms": (self.total_wait / self.calls * 1000) if self.calls else 0.0,
+            "max_queue_wait_ms": self.max_wait * 1000,
+        }
+
+
+class ScheduleSlot:
+    """`async with` 로 사용하는 슬롯 (대기 시간은 wait_time 에 기록)"""
+
+    def __init__(self, schedule: AgentSchedule, fair_key: Hashable, tokens: int):
+        self.schedule = schedule
+        self.fair_key = fair_key
+        self.tokens = tokens
+        self.wait_time = 0.0
+
+    async def __aenter__(self) -> "ScheduleSlot":
+        self.wait_time = await self.schedule.acquire(self.fair_key, self.tokens)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.schedule.release()
+
+
+class ScheduleScope:
+    """
+    에이전트가 내부 요청마다 슬롯을 받는 범위 (`async with` 로 사용)
+
+    섹션별 writer 처럼 작업 하나가 여러 요청을 동시에 보내는 에이전트는 작업
+    전체에 슬롯 하나를 잡는 대신, 범위 안에서 current_schedule 로 요청마다
+    같은 fair_key 의 슬롯을 받습니다. 그래서 동시 요청 수, 초당 요청 수,
+    분당 토큰 수가 다른 작업과 같은 한도 안에서 계산되고, 바깥 슬롯을 잡은 채
+    안쪽 슬롯을 기다리는 교착도 생기지 않습니다.
+    """
+
+    def __init__(self, scheduler: "AgentScheduler", agent_type: str, fair_key: Hashable):
+        self.scheduler = scheduler
+        self.agent_type = agent_type
+        self.fair_key = fair_key
+        self.slots: List[ScheduleSlot] = []
+        self._token = None
+
+    @property
+    def wait_time(self) -> float:
+        """범위 안 요청들의 대기 시간 합계(초)"""
+        return sum(slot.wait_time for slot in self.slots)
+
+    def slot(self, tokens: int = 0) -> ScheduleSlot:
+        slot = self.scheduler.slot(self.agent_type, self.fair_key, tokens)
+        self.slots.append(slot)
+        return slot
+
+    async def __aenter__(self) -> "ScheduleScope":
+        self._token = current_schedule.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        current_schedule.reset(self._token)
+
+
+# 실행 중인 에이전트 작업의 스케줄링 범위 (내부 요청마다 슬롯을 받는 에이전트만)
+current_schedule: ContextVar[Optional[ScheduleScope]] = ContextVar("current_schedule", default=None)
+
+
+class AgentScheduler:
+    """에이전트 타입별 정책 관리 (기본값은 Settings)"""
+
+    def __init__(
+        self,
+        max_in_flight: Optional[Dict[str, int]] = None,
+        requests_per_second: Optional[Dict[str, float]] = None,
+        tokens_per_minute: Optional[Dict[str, int]] = None
+    ):
+        self.max_in_flight = settings.AGENT_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.requests_per_second = (
+            settings.AGENT_REQUESTS_PER_SECOND if requests_per_second is None else requests_per_second
+        )
+        self.tokens_per_minute = (
+            settings.AGENT_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        )
+        self.schedules: Dict[str, AgentSchedule] = {}
+
+    def get_schedule(self, agent_type: str) -> AgentSchedule:
+        schedule = self.schedules.get(agent_type)
+        if schedule is None:
+            schedule = AgentSchedule(
+                agent_type,
+                max_in_flight=self.max_in_flight.get(agent_type),
+                requests_per_second=self.requests_per_second.get(agent_type),
+                tokens_per_minute=self.tokens_per_minute.get(agent_type)
+            )
+            self.schedules[agent_type] = schedule
+        return schedule
+
+    def slot(self, agent_type: str, fair_key: Hashable, tokens: int = 0) -> ScheduleSlot:
+        return ScheduleSlot(self.get_schedule(agent_type), fair_key, tokens)
+
+    def scope(self, agent_type: str, fair_key: Hashable) -> ScheduleScope:
+        return ScheduleScope(self, agent_type, fair_key)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {agent_type: schedule.stats() for agent_type, schedule in self.schedules.items()}
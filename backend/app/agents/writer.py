@@ -1,16 +1,40 @@
 """
 Writer Agent - AI로 위키 페이지 생성
 """
-from typing import Dict, Any
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import re
+import time
+
 from openai import AsyncOpenAI
 
 from app.agents.base import BaseAgent
+from app.agents.scheduler import current_schedule
 from app.core.config import settings
+from app.services.job_stream import JobDraft, current_job_id, job_streams
+from app.services.llm_cache import llm_cache
+
+SYSTEM_PROMPT = "You are a helpful assistant that creates well-structured Wikipedia-style articles about artists."
+
+# 본문 섹션 (제목, 다룰 내용) - 이 순서로 조립하고 도입부는 맨 앞에 둠
+BODY_SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("Early Life", "their birth, family background, childhood and education"),
+    ("Career", "the development of their career, artistic periods, movements and collaborations"),
+    ("Notable Works", "their most important works, with years where known"),
+    ("Legacy and Influence", "their influence on later artists, critical reception and lasting legacy"),
+)
+HEADING_LINE_RE = re.compile(r"^\s*=+[^=\n]*=+\s*$")
+CODE_FENCE_RE = re.compile(r"^```[\w-]*\s*\n|\n?```\s*$")
 
 
 class WriterAgent(BaseAgent):
     """작성 에이전트"""
 
+    model = "gpt-4"
+    temperature = 0.7
+    max_tokens = 2000
+
     def __init__(self):
         super().__init__("writer")
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
@@ -23,7 +47,9 @@ class WriterAgent(BaseAgent):
             task_data: {
                 "artist_name": "작가 이름",
                 "artist_type": "painter|writer|musician",
-                "source_data": "수집된 데이터"
+                "source_data": "수집된 데이터",
+                "stream": "생성 중인 초안 공개 여부 (선택, 기본값 WRITER_STREAM)",
+                "sectioned": "섹션별 동시 생성 여부 (선택, 기본값 WRITER_SECTIONED)"
             }
 
         Returns:
@@ -38,38 +64,189 @@ class WriterAgent(BaseAgent):
 
         self.logger.info(f"Generating wiki page for {artist_name}")
 
-        # AI 프롬프트 생성
-        prompt = self._create_prompt(artist_name, artist_type, source_data)
+        # 스트리밍이면 받은 조각을 작업 초안(SSE, partial_output)으로 바로 공개
+        job_id = current_job_id.get()
+        draft = job_streams.open(job_id) if job_id and task_data.get("stream", settings.WRITER_STREAM) else None
+
+        # OpenAI API 호출 (같은 프롬프트의 이전 응답이 있으면 재사용)
+        try:
+            if task_data.get("sectioned", settings.WRITER_SECTIONED):
+                wiki_content = await self._write_sections(artist_name, artist_type, source_data, draft)
+            else:
+                prompt = self._create_prompt(artist_name, artist_type, source_data)
+                wiki_content = await self._complete(prompt, self.max_tokens, artist_name, sink=draft)
+        finally:
+            if draft is not None:
+                await draft.close()
+
+        result = {
+            "artist_name": artist_name,
+            "wiki_content": wiki_content,
+            "format": "wikitext",
+            "model": self.model
+        }
+
+        self.logger.info(f"Successfully generated wiki page for {artist_name}")
+
+        return result
 
-        # OpenAI API 호출
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
+    def estimate_tokens(self, task_data: Dict[str, Any]) -> int:
+        """
+        프롬프트 길이(약 4자당 1토큰)와 최대 응답 토큰으로 사용량 추정
+
+        섹션 모드는 요청마다 _request_tokens 로 따로 예약하므로 0 입니다.
+        """
+        if self.schedules_requests(task_data):
+            return 0
+
+        prompt = self._create_prompt(
+            task_data.get("artist_name", ""),
+            task_data.get("artist_type", "artist"),
+            task_data.get("source_data", {})
+        )
+        return _request_tokens(prompt, self.max_tokens)
+
+    def schedules_requests(self, task_data: Dict[str, Any]) -> bool:
+        """섹션 모드는 섹션 요청마다 writer 스케줄러 슬롯을 받음"""
+        return bool(task_data.get("sectioned", settings.WRITER_SECTIONED))
+
+    async def _complete(self, prompt: str, max_tokens: int, label: str, sink: Optional[JobDraft] = None) -> str:
+        """채팅 완성 요청 (LLM 응답 캐시 경유)"""
+        response = await llm_cache.complete(
+            self.client.chat.completions.create,
+            model=self.model,
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a helpful assistant that creates well-structured Wikipedia-style articles about artists."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            temperature=0.7,
-            max_tokens=2000
+            sink=sink,
+            temperature=self.temperature,
+            max_tokens=max_tokens
         )
+        if response["cached"]:
+            self.logger.info(f"Reused cached response for {label} ({response['usage']} tokens saved)")
+        return response["content"]
 
-        wiki_content = response.choices[0].message.content
+    async def _write_sections(
+        self,
+        artist_name: str,
+        artist_type: str,
+        source_data: Dict[str, Any],
+        draft: Optional[JobDraft] = None
+    ) -> str:
+        """
+        섹션별 동시 생성 후 위키텍스트 조립
 
-        result = {
-            "artist_name": artist_name,
-            "wiki_content": wiki_content,
-            "format": "wikitext",
-            "model": "gpt-4"
-        }
+        본문 섹션은 같은 팩트 시트로 각각 요청해 동시에 생성하고, 도입부는 완성된
+        본문을 요약하도록 마지막에 생성합니다. 요청마다 writer 스케줄러 슬롯과
+        토큰 예산을 받으므로 동시 요청 수와 속도 제한은 다른 writer 작업과 공유됩니다.
+        소요 시간은 가장 느린 본문 섹션과 짧은 도입부 하나를 더한 정도입니다.
+        제목과 섹션 순서는 모델 출력과 관계없이 BODY_SECTIONS 로 정해집니다.
+        초안에는 앞 섹션부터 완성되는 대로 본문을 추가하고, 끝나면 전체 글로 교체합니다.
+        """
+        fact_sheet = self._fact_sheet(source_data)
+        started = time.monotonic()
+        bodies: Dict[int, str] = {}
+        published = 0
 
-        self.logger.info(f"Successfully generated wiki page for {artist_name}")
+        async def write(index: int, title: str, focus: str) -> None:
+            nonlocal published
+            prompt = self._section_prompt(artist_name, artist_type, fact_sheet, title, focus)
+            async with _request_slot(_request_tokens(prompt, settings.WRITER_SECTION_MAX_TOKENS)):
+                text = await self._complete(prompt, settings.WRITER_SECTION_MAX_TOKENS, f"{artist_name} / {title}")
+            bodies[index] = _clean_section(text)
 
-        return result
+            while draft is not None and published in bodies:
+                section = _format_section(BODY_SECTIONS[published][0], bodies[published])
+                if section:
+                    draft.append(section + "\n\n")
+                published += 1
+
+        tasks = [
+            asyncio.create_task(write(index, title, focus))
+            for index, (title, focus) in enumerate(BODY_SECTIONS)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 한 섹션이 실패하면 나머지 요청도 중단. 재시도하면 모든 섹션을 다시 요청하며,
+            # 끝난 섹션을 LLM 캐시에서 재사용하는 것은 LLM_CACHE_MODE 가 켜져 있을 때뿐
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        body = _assemble(None, [(title, bodies[index]) for index, (title, _) in enumerate(BODY_SECTIONS)])
+        prompt = self._intro_prompt(artist_name, artist_type, fact_sheet, body)
+        async with _request_slot(_request_tokens(prompt, settings.WRITER_INTRO_MAX_TOKENS)):
+            intro = _clean_section(
+                await self._complete(prompt, settings.WRITER_INTRO_MAX_TOKENS, f"{artist_name} / introduction")
+            )
+
+        article = _assemble(intro, [(title, bodies[index]) for index, (title, _) in enumerate(BODY_SECTIONS)])
+        if draft is not None:
+            draft.reset()
+            draft.append(article)
+
+        self.logger.info(
+            f"Generated {len(BODY_SECTIONS) + 1} sections for {artist_name} in {time.monotonic() - started:.1f}s"
+        )
+        return article
+
+    def _fact_sheet(self, source_data: Any) -> str:
+        """섹션 프롬프트가 공유하는 팩트 시트 (크롤러 팩트가 있으면 항목별로 정리)"""
+        facts = source_data.get("facts") if isinstance(source_data, dict) else None
+        if not facts:
+            return str(source_data)
+
+        lines = []
+        for field, value in facts.items():
+            if field == "sources" or not value:
+                continue
+            if field == "works":
+                value = "; ".join(
+                    f"{work['title']} ({work['year']})" if work.get("year") else work["title"]
+                    for work in value
+                )
+            elif isinstance(value, list):
+                value = ", ".join(str(item) for item in value)
+            lines.append(f"- {field.replace('_', ' ').capitalize()}: {value}")
+        return "\n".join(lines)
+
+    def _section_prompt(self, artist_name: str, artist_type: str, fact_sheet: str, title: str, focus: str) -> str:
+        """본문 섹션 하나의 프롬프트"""
+        return f"""
+Write the "{title}" section of a Wikipedia-style article about {artist_name}, a {artist_type}.
+Cover {focus}.
+
+Facts:
+{fact_sheet}
+
+Use proper Wikipedia formatting (wikitext syntax).
+Write only the body of this section: no section heading and no other sections.
+"""
+
+    def _intro_prompt(self, artist_name: str, artist_type: str, fact_sheet: str, body: str) -> str:
+        """도입부 프롬프트 (완성된 본문을 요약)"""
+        return f"""
+Write the introduction (lead section) of a Wikipedia-style article about {artist_name}, a {artist_type}.
+Briefly summarize the article body below in one or two paragraphs, starting with the artist's name in bold.
+
+Facts:
+{fact_sheet}
+
+Article body:
+{body}
+
+Use proper Wikipedia formatting (wikitext syntax).
+Write only the introduction: no heading and do not repeat the body.
+"""
 
     def _create_prompt(self, artist_name: str, artist_type: str, source_data: Dict[str, Any]) -> str:
         """AI 프롬프트 생성"""
@@ -88,3 +265,38 @@ Please create a well-structured article with the following sections:
 
 Use proper Wikipedia formatting (wikitext syntax).
 """
+
+
+def _request_tokens(prompt: str, max_tokens: int) -> int:
+    """요청 하나의 토큰 사용량 추정 (프롬프트 약 4자당 1토큰 + 최대 응답 토큰)"""
+    return len(prompt) // 4 + max_tokens
+
+
+def _request_slot(tokens: int):
+    """
+    요청 하나의 스케줄러 슬롯
+
+    오케스트레이터가 연 스케줄링 범위가 없으면(직접 호출) 제한 없이 진행합니다.
+    """
+    scope = current_schedule.get()
+    return scope.slot(tokens) if scope is not None else nullcontext()
+
+
+def _clean_section(text: Optional[str]) -> str:
+    """모델이 덧붙인 코드 블록 표시와 앞쪽 제목 줄 제거"""
+    text = CODE_FENCE_RE.sub("", (text or "").strip()).strip()
+    lines = text.split("\n")
+    while lines and (HEADING_LINE_RE.match(lines[0]) or not lines[0].strip()):
+        lines.pop(0)
+    return "\n".join(lines).strip()
+
+
+def _format_section(title: str, text: str) -> str:
+    return f"== {title} ==\n{text}" if text else ""
+
+
+def _assemble(intro: Optional[str], sections: List[Tuple[str, str]]) -> str:
+    """도입부와 본문 섹션을 정해진 순서의 위키텍스트로 조립 (빈 섹션은 생략)"""
+    parts = [intro] if intro else []
+    parts.extend(_format_section(title, text) for title, text in sections if text)
+    return "\n\n".join(parts)
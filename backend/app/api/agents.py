@@ -2,35 +2,50 @@
 Agents API Router
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Dict, Any, Optional
 from uuid import UUID
+import json
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.http import http_clients
+from app.services.mediawiki import mediawiki_session
+from app.services.http_cache import crawler_http_cache
+from app.services.job_stream import job_streams
+from app.services.llm_cache import llm_cache
+from app.services.rendered_pages import rendered_pages
+from app.services.wiki_sync import wiki_sync
 from app.models.agent_job import AgentJob
 from app.agents.orchestrator import orchestrator
-from app.agents.crawler import CrawlerAgent
-from app.agents.writer import WriterAgent
-from app.agents.mediawiki import MediaWikiAgent
-from pydantic import BaseModel
+from app.agents.registry import register_default_agents
+from app.services import job_queue
+from app.services import batch as batch_service
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
 # 에이전트 등록
-orchestrator.register_agent("crawler", CrawlerAgent())
-orchestrator.register_agent("writer", WriterAgent())
-orchestrator.register_agent("mediawiki", MediaWikiAgent())
+register_default_agents(orchestrator)
 
 
 class WorkflowStep(BaseModel):
     agent_type: str
     task_data: Dict[str, Any]
+    name: Optional[str] = None
+    depends_on: Optional[List[str]] = None
+    inputs: Optional[Dict[str, str]] = None
+    cache: Optional[bool] = None
+    skip_if_unchanged: Optional[bool] = None
 
 
 class WorkflowRequest(BaseModel):
     workflow: List[WorkflowStep]
     context: Optional[Dict[str, Any]] = None
+    max_parallel: Optional[int] = Field(None, ge=1, le=32)
+    mode: str = Field("sync", pattern="^(sync|async)$")
+    use_cache: Optional[bool] = None
 
 
 @router.post("/jobs")
@@ -38,16 +53,114 @@ async def execute_workflow(
     request: WorkflowRequest,
     db: AsyncSession = Depends(get_db)
 ):
-    """워크플로우 실행"""
+    """
+    워크플로우 실행
+
+    `mode=async` 이면 워크플로우를 큐에 등록하고 202와 작업 ID를 즉시
+    반환합니다. 실제 실행은 `python -m app.worker` 워커가 담당합니다.
+    동기 실행 시 오케스트레이터가 작업 상태를 자체 단기 세션으로 기록하므로
+    요청 세션은 사용되지 않아 커넥션을 잡지 않습니다.
+    """
     workflow = [step.model_dump() for step in request.workflow]
-    result = await orchestrator.execute_workflow(
-        workflow=workflow,
-        db=db,
-        context=request.context or {}
-    )
+
+    if request.mode == "async":
+        try:
+            orchestrator.validate_workflow(workflow)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        job = await job_queue.enqueue_workflow(
+            db,
+            workflow=workflow,
+            context=request.context or {},
+            max_parallel=request.max_parallel,
+            use_cache=request.use_cache
+        )
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": str(job.id), "status": job.status}
+        )
+
+    try:
+        result = await orchestrator.execute_workflow(
+            workflow=workflow,
+            context=request.context or {},
+            max_parallel=request.max_parallel,
+            use_cache=request.use_cache
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
 
 
+class BatchRequest(BaseModel):
+    workflow: List[WorkflowStep]
+    artist_ids: Optional[List[UUID]] = None
+    type: Optional[str] = Field(None, pattern="^(painter|writer|musician)$")
+    search: Optional[str] = None
+    context: Optional[Dict[str, Any]] = None
+    max_parallel: Optional[int] = Field(None, ge=1, le=32)
+    max_concurrency: int = Field(10, ge=1, le=1000)
+    use_cache: Optional[bool] = None
+
+
+@router.post("/batches", status_code=202)
+async def create_batch(
+    request: BatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    작가별 워크플로우 일괄 생성
+
+    워크플로우 템플릿의 `{artist.id}`, `{artist.name}`, `{artist.type}`,
+    `{artist.nationality}` 는 작가 값으로 치환되며, 각 워크플로우의
+    컨텍스트에는 artist_id, artist_name, artist_type 이 포함됩니다.
+    """
+    workflow = [step.model_dump() for step in request.workflow]
+
+    try:
+        orchestrator.validate_workflow(workflow)
+        batch = await batch_service.create_batch(
+            db,
+            workflow=workflow,
+            artist_ids=request.artist_ids,
+            artist_type=request.type,
+            search=request.search,
+            context=request.context,
+            max_parallel=request.max_parallel,
+            max_concurrency=request.max_concurrency,
+            use_cache=request.use_cache
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "batch_id": str(batch.id),
+        "status": batch.status,
+        "total": batch.input_data["total"]
+    }
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch(
+    batch_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """배치 진행 상황 조회 (상태별 개수, 처리량, 예상 완료 시간)"""
+    result = await db.execute(
+        select(AgentJob).filter(
+            AgentJob.id == batch_id,
+            AgentJob.job_type == batch_service.BATCH_JOB_TYPE
+        )
+    )
+    batch = result.scalar_one_or_none()
+
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return await batch_service.get_batch_progress(db, batch)
+
+
 @router.get("/jobs")
 async def get_agent_jobs(
     status: Optional[str] = Query(None, pattern="^(pending|running|success|failed)$"),
@@ -97,3 +210,154 @@ async def get_agent_job(
         raise HTTPException(status_code=404, detail="Agent job not found")
 
     return job
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_agent_job(
+    job_id: UUID,
+    step: Optional[str] = Query(None, description="워크플로우 작업이면 따라갈 단계 이름")
+):
+    """
+    작업의 생성 중인 초안 스트리밍 (Server-Sent Events)
+
+    스트리밍 writer(`stream: true`)가 받은 조각을 `delta` 이벤트로 전달하고,
+    작업이 끝나면 최종 출력을 담은 `done` 이벤트로 종료합니다. 스트림이 길게
+    열려 있으므로 요청 범위의 DB 세션 대신 조회마다 짧은 세션을 사용합니다.
+    """
+    async with AsyncSessionLocal() as db:
+        exists = (await db.execute(select(AgentJob.id).filter(AgentJob.id == job_id))).scalar_one_or_none()
+    if exists is None:
+        raise HTTPException(status_code=404, detail="Agent job not found")
+
+    async def events():
+        async for event, data in job_streams.follow(job_id, step=step):
+            if event == "ping":
+                yield ": ping\n\n"
+                continue
+            payload = {"text": data} if event in ("snapshot", "delta") else data
+            yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class ResumeRequest(BaseModel):
+    mode: str = Field("sync", pattern="^(sync|async)$")
+
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_workflow(
+    job_id: UUID,
+    request: Optional[ResumeRequest] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    실패한 워크플로우 재개
+
+    이미 성공한 단계는 저장된 출력으로 컨텍스트를 복원하고 다시 실행하지
+    않습니다. `mode=async` 이면 큐에 다시 등록하고 202를 반환합니다.
+    """
+    request = request or ResumeRequest()
+
+    result = await db.execute(
+        select(AgentJob).filter(
+            AgentJob.id == job_id,
+            AgentJob.job_type == job_queue.WORKFLOW_JOB_TYPE
+        )
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Workflow job not found")
+    if job.status != "failed":
+        raise HTTPException(status_code=409, detail=f"Workflow job is {job.status}, only failed workflows can be resumed")
+
+    input_data = job.input_data or {}
+
+    # 동시에 들어온 재개 요청 중 상태를 먼저 바꾼 요청만 실행
+    status = "pending" if request.mode == "async" else "running"
+    if not await job_queue.reset_job(db, job.id, status):
+        raise HTTPException(status_code=409, detail="Workflow job is already being resumed")
+
+    if request.mode == "async":
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": str(job.id), "status": "pending"}
+        )
+
+    return await orchestrator.execute_workflow(
+        workflow=input_data.get("workflow", []),
+        context=input_data.get("context") or {},
+        max_parallel=input_data.get("max_parallel"),
+        use_cache=input_data.get("use_cache"),
+        workflow_id=job.id
+    )
+
+
+@router.get("/scheduler")
+async def get_scheduler_stats():
+    """에이전트 타입별 스케줄러 상태 (현재 프로세스 기준)"""
+    return orchestrator.scheduler.stats()
+
+
+@router.get("/circuits")
+async def get_circuit_stats():
+    """에이전트 타입별 서킷 브레이커 상태 (현재 프로세스 기준)"""
+    return {
+        agent_type: breaker.stats()
+        for agent_type, breaker in orchestrator.circuit_breakers.items()
+    }
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """에이전트 결과 캐시 적중률 (현재 프로세스 기준)"""
+    return orchestrator.result_cache.stats()
+
+
+@router.get("/http")
+async def get_http_pool_stats():
+    """업스트림별 HTTP 커넥션 풀 사용 현황 (현재 프로세스 기준)"""
+    return http_clients.stats()
+
+
+@router.get("/crawler")
+async def get_crawler_stats():
+    """최근 크롤링의 수신 크기, 파싱 시간, 이벤트 루프 지연 (현재 프로세스 기준)"""
+    crawler = orchestrator.agents.get("crawler")
+    if crawler is None:
+        raise HTTPException(status_code=404, detail="Crawler agent not registered")
+    return crawler.stats()
+
+
+@router.get("/crawler-cache")
+async def get_crawler_cache_stats():
+    """크롤러 HTTP 캐시 재검증/적중 현황 (현재 프로세스 기준)"""
+    return crawler_http_cache.stats()
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_stats():
+    """LLM 응답 캐시 적중률과 절약한 토큰/비용 (현재 프로세스 기준)"""
+    return llm_cache.stats()
+
+
+@router.get("/mediawiki")
+async def get_mediawiki_stats():
+    """MediaWiki 세션 및 쓰기 스케줄러 상태 (동시성 한도, 처리량, 대기 수)"""
+    return mediawiki_session.stats()
+
+
+@router.get("/rendered-pages")
+async def get_rendered_page_stats():
+    """렌더링 페이지 캐시 적중률 (현재 프로세스 기준)"""
+    return rendered_pages.stats()
+
+
+@router.post("/sync/mediawiki")
+async def sync_mediawiki():
+    """MediaWiki 최근 변경을 작가/작품 테이블에 즉시 반영"""
+    return await wiki_sync.run()
@@ -6,10 +6,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
 from uuid import UUID
+import httpx
 
 from app.core.database import get_db
 from app.models.artist import Artist
-from app.schemas.artist import ArtistCreate, ArtistUpdate, ArtistResponse
+from app.schemas.artist import ArtistCreate, ArtistUpdate, ArtistResponse, ArtistPageResponse
+from app.schemas.page import RenderedPage
+from app.services.mediawiki import MediaWikiAPIError
+from app.services.rendered_pages import rendered_pages
 
 router = APIRouter()
 
@@ -65,6 +69,36 @@ async def get_artist(
     return artist
 
 
+@router.get("/{artist_id}/page", response_model=ArtistPageResponse)
+async def get_artist_page(
+    artist_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """작가 상세 + 렌더링된 위키 페이지 (캐시 우선, 위키 미연결 시 rendered_page 없음)"""
+    result = await db.execute(
+        select(Artist).filter(Artist.id == artist_id)
+    )
+    artist = result.scalar_one_or_none()
+
+    if not artist:
+        raise HTTPException(status_code=404, detail="Artist not found")
+
+    page = None
+    if artist.mediawiki_page_id or artist.mediawiki_page_title:
+        try:
+            page = await rendered_pages.get(
+                page_id=artist.mediawiki_page_id,
+                revision_id=artist.mediawiki_revision_id,
+                page_title=artist.mediawiki_page_title
+            )
+        except (MediaWikiAPIError, httpx.HTTPError) as e:
+            raise HTTPException(status_code=502, detail=f"MediaWiki render failed: {e}")
+
+    response = ArtistPageResponse.model_validate(artist)
+    response.rendered_page = RenderedPage(**page) if page else None
+    return response
+
+
 @router.post("/", response_model=ArtistResponse, status_code=201)
 async def create_artist(
     artist_in: ArtistCreate,
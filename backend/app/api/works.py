@@ -6,10 +6,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Optional
 from uuid import UUID
+import httpx
 
 from app.core.database import get_db
 from app.models.work import Work
-from app.schemas.work import WorkCreate, WorkUpdate, WorkResponse
+from app.schemas.work import WorkCreate, WorkUpdate, WorkResponse, WorkPageResponse
+from app.schemas.page import RenderedPage
+from app.services.mediawiki import MediaWikiAPIError
+from app.services.rendered_pages import rendered_pages
 
 router = APIRouter()
 
@@ -65,6 +69,36 @@ async def get_work(
     return work
 
 
+@router.get("/{work_id}/page", response_model=WorkPageResponse)
+async def get_work_page(
+    work_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """작품 상세 + 렌더링된 위키 페이지 (캐시 우선, 위키 미연결 시 rendered_page 없음)"""
+    result = await db.execute(
+        select(Work).filter(Work.id == work_id)
+    )
+    work = result.scalar_one_or_none()
+
+    if not work:
+        raise HTTPException(status_code=404, detail="Work not found")
+
+    page = None
+    if work.mediawiki_page_id or work.mediawiki_page_title:
+        try:
+            page = await rendered_pages.get(
+                page_id=work.mediawiki_page_id,
+                revision_id=work.mediawiki_revision_id,
+                page_title=work.mediawiki_page_title
+            )
+        except (MediaWikiAPIError, httpx.HTTPError) as e:
+            raise HTTPException(status_code=502, detail=f"MediaWiki render failed: {e}")
+
+    response = WorkPageResponse.model_validate(work)
+    response.rendered_page = RenderedPage(**page) if page else None
+    return response
+
+
 @router.post("/", response_model=WorkResponse, status_code=201)
 async def create_work(
     work_in: WorkCreate,
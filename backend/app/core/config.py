@@ -2,7 +2,7 @@
 Application Configuration
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -15,11 +15,126 @@ class Settings(BaseSettings):
     MEDIAWIKI_API_URL: str
     MEDIAWIKI_BOT_USERNAME: str
     MEDIAWIKI_BOT_PASSWORD: str
+    MEDIAWIKI_OAUTH_TOKEN: str = ""  # OAuth 2.0 owner-only 액세스 토큰 (있으면 로그인 생략)
+    MEDIAWIKI_READ_CONCURRENCY: int = 4  # 일괄 조회 시 동시 요청 수
+
+    # MediaWiki write scheduler (maxlag + AIMD 동시성 제어)
+    MEDIAWIKI_MAXLAG: int = 5  # 복제 지연이 이 값(초)을 넘으면 위키가 쓰기를 거절
+    MEDIAWIKI_WRITE_INITIAL_CONCURRENCY: float = 2.0
+    MEDIAWIKI_WRITE_MIN_CONCURRENCY: float = 1.0
+    MEDIAWIKI_WRITE_MAX_CONCURRENCY: float = 8.0
+    MEDIAWIKI_WRITE_TARGET_LATENCY: float = 2.0  # 이보다 느린 응답이면 동시성 감소
+    MEDIAWIKI_WRITE_MAX_RETRIES: int = 5  # maxlag/ratelimited 시 재전송 횟수
+
+    # MediaWiki → DB 동기화 (recentchanges 피드)
+    MEDIAWIKI_SYNC_INTERVAL: float = 0.0  # 워커의 동기화 주기(초), 0이면 비활성
+    MEDIAWIKI_SYNC_NAMESPACES: str = "0"  # 추적할 이름공간 ("0|2" 형식)
+    MEDIAWIKI_SYNC_MAX_CHANGES: int = 5000  # 한 번에 처리할 최대 변경 수
+
+    # Rendered page cache (action=parse 결과, 메모리 LRU + 선택적 디스크 계층)
+    RENDERED_PAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RENDERED_PAGE_CACHE_DIR: str = ""  # 비어 있으면 디스크 계층 없음
+    RENDERED_PAGE_CACHE_DISK_MAX_BYTES: int = 1024 * 1024 * 1024
+    RENDERED_PAGE_LATEST_TTL: float = 300.0  # 프로세스에서 관찰한 최신 리비전의 유효 시간(초)
 
     # AI
     OPENAI_API_KEY: str
     ANTHROPIC_API_KEY: str = ""
 
+    # Agents
+    WORKFLOW_MAX_PARALLEL: int = 4
+
+    # Writer streaming (생성 중인 초안을 SSE 와 agent_jobs.partial_output 으로 공개)
+    WRITER_STREAM: bool = False  # 기본값, 작업의 task_data.stream 이 우선
+    WRITER_STREAM_FLUSH_INTERVAL: float = 1.0  # partial_output 기록 주기(초)
+    WRITER_STREAM_POLL_INTERVAL: float = 0.5  # 다른 프로세스의 작업을 SSE 로 따라갈 때 조회 주기(초)
+
+    # Writer sections (섹션별 동시 생성, 섹션 요청마다 AGENT_* 의 writer 정책 적용)
+    WRITER_SECTIONED: bool = False  # 기본값, 작업의 task_data.sectioned 가 우선
+    WRITER_SECTION_MAX_TOKENS: int = 700  # 본문 섹션 하나의 최대 응답 토큰
+    WRITER_INTRO_MAX_TOKENS: int = 300  # 도입부(마지막에 생성)의 최대 응답 토큰
+
+    # Agent scheduling (에이전트 타입별 정책, 값이 없으면 제한 없음)
+    # (mediawiki 쓰기 속도는 MEDIAWIKI_WRITE_* 스케줄러가 위키 상태에 맞춰 조절)
+    AGENT_MAX_IN_FLIGHT: Dict[str, int] = {"crawler": 16, "writer": 4, "mediawiki": 32}
+    AGENT_REQUESTS_PER_SECOND: Dict[str, float] = {"crawler": 10.0, "writer": 2.0}
+    AGENT_TOKENS_PER_MINUTE: Dict[str, int] = {"writer": 40000}
+
+    # Agent retry / circuit breaker
+    AGENT_RETRY_POLICIES: Dict[str, Dict[str, float]] = {
+        "crawler": {"max_attempts": 3, "base_delay": 1.0, "max_delay": 30.0},
+        "writer": {"max_attempts": 4, "base_delay": 2.0, "max_delay": 60.0},
+        "mediawiki": {"max_attempts": 5, "base_delay": 1.0, "max_delay": 60.0},
+    }
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = 30.0
+
+    # Agent result cache (opt-in, TTL이 있는 에이전트 타입만 캐시)
+    AGENT_CACHE_ENABLED: bool = False
+    AGENT_CACHE_BACKEND: str = "memory"  # memory | disk | postgres
+    AGENT_CACHE_TTL: Dict[str, int] = {"crawler": 86400, "writer": 604800}
+    AGENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    AGENT_CACHE_DIR: str = ".cache/agent_results"
+
+    # LLM response cache (모델, 파라미터, 메시지가 같은 생성 요청의 응답 재사용)
+    # off | read_write | replay (replay 는 캐시에 없으면 API 를 호출하지 않고 실패)
+    LLM_CACHE_MODE: str = "off"
+    LLM_CACHE_BACKEND: str = "disk"  # memory | disk | postgres
+    LLM_CACHE_TTL: int = 30 * 86400
+    LLM_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    LLM_CACHE_DIR: str = ".cache/llm_responses"
+    # 절약 금액 계산용 모델별 가격 (USD / 1M 토큰)
+    LLM_PRICES: Dict[str, Dict[str, float]] = {"gpt-4": {"prompt": 30.0, "completion": 60.0}}
+
+    # Crawler fetch / parse
+    CRAWLER_MAX_BYTES: int = 5 * 1024 * 1024  # 이보다 긴 본문은 잘라서 사용
+    CRAWLER_ALLOWED_CONTENT_TYPES: List[str] = ["text/html", "application/xhtml+xml"]
+    CRAWLER_PARSE_WORKERS: int = 2  # HTML 파싱 프로세스 수 (0이면 이벤트 루프에서 파싱)
+    CRAWLER_PARSE_INLINE_MAX_BYTES: int = 64 * 1024  # 이보다 작은 문서는 프로세스 전달 없이 파싱
+    CRAWLER_USER_AGENT: str = "ArtistWikiBot/0.1 (+https://github.com/lollol-jr/ArtistWiki)"
+    CRAWLER_ROBOTS_USER_AGENT: str = "ArtistWikiBot"  # robots.txt 규칙 매칭용 토큰
+    CRAWLER_ROBOTS_TTL: float = 86400.0
+    CRAWLER_MAX_CONCURRENCY: int = 16  # 다중 URL 크롤링 한 건의 동시 요청 수
+    CRAWLER_PER_HOST_CONCURRENCY: int = 2  # 호스트별 동시 요청 수 (프로세스 전체)
+    CRAWLER_PER_HOST_DELAY: float = 1.0  # 같은 호스트 요청 간 최소 간격(초)
+    CRAWLER_MAX_PAGES: int = 50  # 다중 URL 크롤링 한 건의 최대 페이지 수
+    CRAWLER_FACTS_TOKEN_BUDGET: int = 800  # 추출한 본문 요약의 최대 토큰 수
+    CRAWLER_MAX_WORKS: int = 30  # 팩트에 남길 최대 작품 수
+    EVENT_LOOP_MONITOR_INTERVAL: float = 0.01  # 이벤트 루프 지연 측정 주기(초)
+
+    # Crawler HTTP cache (조건부 GET 재검증, gzip 압축 디스크 저장)
+    CRAWLER_HTTP_CACHE_ENABLED: bool = True
+    CRAWLER_HTTP_CACHE_DIR: str = ".cache/crawler_http"
+    CRAWLER_HTTP_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    CRAWLER_HTTP_CACHE_DEFAULT_TTL: float = 0.0  # Cache-Control/Expires 가 없을 때 재검증 없이 쓸 시간(초)
+
+    # Content fingerprints (추출한 팩트의 SimHash 로 의미 있는 변경만 감지)
+    CONTENT_FINGERPRINT_ENABLED: bool = True
+    CONTENT_FINGERPRINT_MAX_DISTANCE: int = 3  # 이 해밍 거리(비트) 이내면 변경 없음으로 판단
+
+    # Agent job recorder (direct: 상태 변경마다 커밋, buffered: 모아서 일괄 기록)
+    JOB_RECORDER: str = "direct"
+    JOB_RECORDER_BATCH_SIZE: int = 500
+    JOB_RECORDER_FLUSH_INTERVAL: float = 0.5
+    JOB_RECORDER_MAX_PENDING: int = 50000  # 기록 실패가 이어질 때 버퍼에 남길 최대 행 수
+
+    # Shared HTTP clients (업스트림별 커넥션 풀)
+    HTTP_HTTP2: bool = True
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 10.0
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_POOL_LIMITS: Dict[str, Dict[str, int]] = {
+        "mediawiki": {"max_connections": 10, "max_keepalive_connections": 10},
+        "crawler": {"max_connections": 100, "max_keepalive_connections": 20},
+    }
+
+    # Worker
+    WORKER_CONCURRENCY: int = 4
+    WORKER_POLL_INTERVAL: float = 1.0
+    WORKER_HEARTBEAT_INTERVAL: float = 15.0
+    WORKER_STALE_TIMEOUT: float = 120.0
+
     # App
     SECRET_KEY: str
     DEBUG: bool = False
@@ -0,0 +1,158 @@
+"""
+Shared HTTP Clients - 업스트림별 커넥션 풀
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedContentTypeError(ValueError):
+    """허용되지 않은 Content-Type 응답 (재시도하지 않음)"""
+
+
+class HTTPClientManager:
+    """
+    애플리케이션 범위의 httpx.AsyncClient 관리자
+
+    업스트림(mediawiki, crawler 등)마다 별도의 커넥션 풀을 가진 클라이언트를
+    첫 사용 시 만들어 재사용하므로, 요청마다 TCP/TLS 연결을 새로 맺지 않고
+    keep-alive 연결(가능하면 HTTP/2)을 공유합니다. 풀 크기와 타임아웃은
+    Settings 의 HTTP_* 항목으로 조정하며, 종료 시 close() 로 모든 연결을 닫습니다.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, httpx.AsyncHTTPTransport] = {}
+        self._requests: Dict[str, int] = {}
+
+    def client(self, upstream: str) -> httpx.AsyncClient:
+        """업스트림 전용 클라이언트 (없으면 생성)"""
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._create_client(upstream)
+            self._clients[upstream] = client
+        return client
+
+    async def close(self) -> None:
+        """모든 클라이언트와 연결 종료"""
+        clients, self._clients = self._clients, {}
+        self._transports.clear()
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """업스트림별 풀 사용 현황"""
+        return {upstream: self._pool_stats(upstream) for upstream in self._clients}
+
+    def _create_client(self, upstream: str) -> httpx.AsyncClient:
+        limits = settings.HTTP_POOL_LIMITS.get(upstream, {})
+        http2 = settings.HTTP_HTTP2 and HTTP2_AVAILABLE
+        if settings.HTTP_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=limits.get("max_connections"),
+                max_keepalive_connections=limits.get("max_keepalive_connections"),
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        self._transports[upstream] = transport
+        self._requests[upstream] = 0
+
+        async def count_request(request: httpx.Request) -> None:
+            self._requests[upstream] += 1
+
+        headers = {}
+        if upstream == "crawler":
+            headers["User-Agent"] = settings.CRAWLER_USER_AGENT
+
+        return httpx.AsyncClient(
+            transport=transport,
+            headers=headers,
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT,
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                pool=settings.HTTP_POOL_TIMEOUT
+            ),
+            event_hooks={"request": [count_request]}
+        )
+
+    def _pool_stats(self, upstream: str) -> Dict[str, Any]:
+        limits = settings.HTTP_POOL_LIMITS.get(upstream, {})
+        # httpx 는 풀 상태를 공개하지 않으므로 내부 httpcore 풀을 조회
+        pool = getattr(self._transports.get(upstream), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "requests": self._requests.get(upstream, 0),
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "http2": sum(1 for connection in connections if "HTTP/2" in connection.info()),
+            "max_connections": limits.get("max_connections")
+        }
+
+
+async def stream_get(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: Optional[int] = None,
+    content_types: Optional[Iterable[str]] = None
+) -> Tuple[httpx.Response, bytes, bool]:
+    """
+    응답 본문을 스트리밍으로 최대 max_bytes 까지만 읽는 GET
+
+    성공 응답의 Content-Type 이 content_types 에 없으면 본문을 읽기 전에
+    UnsupportedContentTypeError 를 발생시킵니다. 한도를 넘는 본문은
+    잘라내고 나머지는 받지 않습니다.
+
+    Returns:
+        (응답, 본문 바이트, 잘림 여부)
+    """
+    async with client.stream("GET", url, headers=headers) as response:
+        if not response.is_success:
+            return response, b"", False
+
+        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_types and content_type and content_type not in content_types:
+            raise UnsupportedContentTypeError(f"Unsupported content type {content_type} for {url}")
+
+        chunks = []
+        size = 0
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            if max_bytes and size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+
+    return response, b"".join(chunks), truncated
+
+
+def decode_body(response: httpx.Response, body: bytes) -> str:
+    """응답 charset(없으면 UTF-8)으로 본문 디코딩 (잘린 멀티바이트 문자는 대체)"""
+    try:
+        return body.decode(response.charset_encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+# 글로벌 HTTP 클라이언트 관리자
+http_clients = HTTPClientManager()
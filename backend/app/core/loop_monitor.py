@@ -0,0 +1,80 @@
+"""
+Event Loop Monitor - 이벤트 루프 지연(stall) 측정
+"""
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import asyncio
+import time
+
+from app.core.config import settings
+
+
+class LoopStallMonitor:
+    """
+    이벤트 루프 지연 측정기
+
+    interval 초마다 깨어나도록 예약한 뒤 실제로 깨어난 시각과의 차이를
+    지연으로 기록합니다. CPU 를 오래 쓰는 코드가 루프를 막으면 이 값이
+    커지므로, 작업 전 mark() 와 작업 후 max_since() 로 작업 동안의
+    최대 지연을 확인할 수 있습니다. 측정 태스크는 첫 mark() 때 시작합니다.
+    """
+
+    def __init__(self, interval: float, history: int = 6000):
+        self.interval = interval
+        self._samples: Deque[Tuple[int, float]] = deque(maxlen=history)  # (seq, lag_ms)
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._expected: Optional[float] = None  # 측정 태스크가 다음에 깨어날 예정 시각
+        self.max_lag_ms = 0.0
+        self.total_lag_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "LoopStallMonitor":
+        return cls(settings.EVENT_LOOP_MONITOR_INTERVAL)
+
+    def mark(self) -> int:
+        """현재 측정 위치 (측정 태스크가 없으면 시작)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._seq
+
+    def max_since(self, mark: int) -> float:
+        """mark 이후 관찰된 최대 지연(ms, 아직 기록되지 않은 현재 지연 포함)"""
+        lag = 0.0
+        if self._expected is not None:
+            lag = max(0.0, (time.perf_counter() - self._expected) * 1000)
+        for seq, sample in reversed(self._samples):
+            if seq <= mark:
+                break
+            lag = max(lag, sample)
+        return round(lag, 2)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._expected = None
+
+    def stats(self) -> Dict[str, Any]:
+        recent = sorted(sample for _, sample in self._samples)
+        return {
+            "samples": self._seq,
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "total_lag_ms": round(self.total_lag_ms, 2),
+            "recent_p99_ms": round(recent[int(len(recent) * 0.99)], 2) if recent else 0.0,
+            "recent_max_ms": round(recent[-1], 2) if recent else 0.0
+        }
+
+    async def _run(self) -> None:
+        while True:
+            self._expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - self._expected) * 1000)
+            self._seq += 1
+            self._samples.append((self._seq, lag_ms))
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            self.total_lag_ms += lag_ms
+
+
+# 글로벌 이벤트 루프 모니터
+loop_monitor = LoopStallMonitor.from_settings()
@@ -1,14 +1,32 @@
 """
 ArtistWiki Backend - FastAPI Application
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.loop_monitor import loop_monitor
+from app.agents.orchestrator import orchestrator
+from app.services.html_parser import html_parse_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명 주기 (종료 시 버퍼된 작업 기록 flush, HTTP 연결 및 파싱 풀 종료)"""
+    yield
+    await orchestrator.recorder.close()
+    await http_clients.close()
+    html_parse_pool.close()
+    loop_monitor.stop()
+
 
 app = FastAPI(
     title="ArtistWiki API",
     description="작가/예술가 위키 시스템 - AI 에이전트 오케스트레이션",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
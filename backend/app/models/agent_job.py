@@ -1,7 +1,7 @@
 """
 Agent Job Model
 """
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Column, String, Text, DateTime, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime
 import uuid
@@ -15,12 +15,35 @@ class AgentJob(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_type = Column(String(100), nullable=False, index=True)
-    status = Column(String(50), nullable=False, index=True)  # pending, running, success, failed
+    status = Column(String(50), nullable=False, index=True)  # pending, running, success, failed (배치는 partial 도 가능)
+    parent_id = Column(UUID(as_uuid=True), nullable=True, index=True)  # 워크플로우 작업 ID
+    step_name = Column(String(100), nullable=True)  # 워크플로우 내 단계 이름
     target_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     target_type = Column(String(50), nullable=True)
     input_data = Column(JSONB, nullable=True)
     output_data = Column(JSONB, nullable=True)
+    partial_output = Column(Text, nullable=True)  # 스트리밍 중인 초안 (완료되면 비움)
     error_message = Column(Text, nullable=True)
+
+    # 워커 큐
+    worker_id = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # 스케줄러 대기 시간 (에이전트 타입별 한도로 인한 지연)
+    queue_wait_ms = Column(Integer, nullable=True)
+
+    # 재시도 기록 (시도별 상태, 오류, 대기 시간)
+    attempts = Column(Integer, nullable=True)
+    attempt_log = Column(JSONB, nullable=True)
+
+    # 결과 캐시 적중/미적중 횟수 (워크플로우 작업은 단계 합계)
+    cache_hits = Column(Integer, default=0, nullable=False)
+    cache_misses = Column(Integer, default=0, nullable=False)
+
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_agent_jobs_queue', 'status', 'job_type', 'created_at'),
+    )
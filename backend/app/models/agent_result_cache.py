@@ -0,0 +1,21 @@
+"""
+Agent Result Cache Model
+"""
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class AgentResultCache(Base):
+    """에이전트 실행 결과 캐시 모델"""
+    __tablename__ = "agent_result_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256(namespace, 입력)
+    namespace = Column(String(100), nullable=False, index=True)
+    value = Column(JSONB, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=True, index=True)
+    accessed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,23 @@
+"""
+Content Fingerprint Model
+"""
+from sqlalchemy import Column, String, Text, DateTime, BigInteger, PrimaryKeyConstraint
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class ContentFingerprint(Base):
+    """작가별, 출처 URL 별 크롤링 내용의 SimHash (마지막으로 바뀐 내용 기준)"""
+    __tablename__ = "content_fingerprints"
+
+    artist_key = Column(String(255), nullable=False)  # 작가 ID 또는 정규화한 이름
+    source_url = Column(Text, nullable=False)
+    simhash = Column(BigInteger, nullable=False)  # 요약 문장의 64비트 SimHash (부호 있는 정수로 저장)
+    digest = Column(String(64), nullable=False)  # 구조화 팩트의 sha256
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    checked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('artist_key', 'source_url'),
+    )
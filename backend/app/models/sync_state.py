@@ -0,0 +1,17 @@
+"""
+Sync State Model
+"""
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class SyncState(Base):
+    """외부 피드 동기화 지점 (예: MediaWiki recentchanges continue 값)"""
+    __tablename__ = "sync_state"
+
+    name = Column(String(100), primary_key=True)
+    cursor = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
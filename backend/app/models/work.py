@@ -1,7 +1,7 @@
 """
 Work Model
 """
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, String, Integer, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -24,10 +24,17 @@ class Work(Base):
     # MediaWiki 연동
     mediawiki_page_id = Column(Integer, unique=True, nullable=True, index=True)
     mediawiki_page_title = Column(String(500), nullable=True)
+    mediawiki_revision_id = Column(Integer, nullable=True)  # 동기화된 최신 리비전
+    mediawiki_content = Column(Text, nullable=True)  # 최신 리비전 위키텍스트 캐시
+    mediawiki_synced_at = Column(DateTime, nullable=True)
 
     # 타임스탬프
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index('idx_works_mediawiki_page_title', 'mediawiki_page_title'),
+    )
+
     # Relationships
     artist = relationship("Artist", back_populates="works")
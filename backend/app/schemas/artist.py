@@ -6,6 +6,8 @@ from typing import Optional
 from datetime import date, datetime
 from uuid import UUID
 
+from app.schemas.page import RenderedPage
+
 
 class ArtistBase(BaseModel):
     """Artist 기본 스키마"""
@@ -37,8 +39,15 @@ class ArtistResponse(ArtistBase):
     id: UUID
     mediawiki_page_id: Optional[int] = None
     mediawiki_page_title: Optional[str] = None
+    mediawiki_revision_id: Optional[int] = None
+    mediawiki_synced_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class ArtistPageResponse(ArtistResponse):
+    """렌더링된 위키 페이지를 포함한 Artist 응답 스키마"""
+    rendered_page: Optional[RenderedPage] = None
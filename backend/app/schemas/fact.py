@@ -0,0 +1,27 @@
+"""
+Fact Schemas
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class WorkFact(BaseModel):
+    """작품 팩트"""
+    title: str
+    year: Optional[int] = None
+
+
+class FactRecord(BaseModel):
+    """크롤링한 페이지에서 추출한 작가 팩트 (날짜는 YYYY-MM-DD 또는 YYYY)"""
+    name: Optional[str] = None
+    birth_date: Optional[str] = None
+    death_date: Optional[str] = None
+    birth_place: Optional[str] = None
+    death_place: Optional[str] = None
+    nationality: Optional[str] = None
+    occupations: List[str] = []
+    movements: List[str] = []
+    works: List[WorkFact] = []
+    description: Optional[str] = None
+    summary: Optional[str] = None
+    sources: List[str] = []
@@ -0,0 +1,14 @@
+"""
+Rendered Page Schemas
+"""
+from pydantic import BaseModel
+from typing import Optional
+
+
+class RenderedPage(BaseModel):
+    """렌더링된 MediaWiki 페이지"""
+    page_id: Optional[int] = None
+    revision_id: Optional[int] = None
+    title: Optional[str] = None
+    display_title: Optional[str] = None
+    html: Optional[str] = None
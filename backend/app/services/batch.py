@@ -0,0 +1,248 @@
+"""
+Batch Service - 다수 작가 대상 워크플로우 일괄 생성 및 진행 상황 집계
+"""
+from typing import Dict, Any, List, Optional
+from uuid import UUID
+from datetime import datetime
+import copy
+import re
+import uuid
+
+from sqlalchemy import select, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.agent_job import AgentJob
+from app.models.artist import Artist
+from app.services.job_queue import WORKFLOW_JOB_TYPE
+from app.services.mediawiki import EditConflictError
+
+BATCH_JOB_TYPE = "batch"
+
+# MediaWiki 편집 단계 결과 (성공한 단계의 output_data.outcome, conflict 는 충돌로 실패한 단계)
+EDIT_OUTCOMES = ("edited", "skipped", "conflict")
+
+# 템플릿 내 {artist.name}, {artist.id} 등의 자리 표시자
+PLACEHOLDER_PATTERN = re.compile(r"\{artist\.(\w+)\}")
+
+INSERT_CHUNK_SIZE = 1000
+
+
+def render_template(value: Any, artist: Dict[str, Any]) -> Any:
+    """워크플로우 템플릿의 자리 표시자를 작가 값으로 치환"""
+    if isinstance(value, str):
+        return PLACEHOLDER_PATTERN.sub(
+            lambda match: str(artist.get(match.group(1), match.group(0))),
+            value
+        )
+    if isinstance(value, dict):
+        return {key: render_template(item, artist) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render_template(item, artist) for item in value]
+    return value
+
+
+async def create_batch(
+    db: AsyncSession,
+    workflow: List[Dict[str, Any]],
+    artist_ids: Optional[List[UUID]] = None,
+    artist_type: Optional[str] = None,
+    search: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None,
+    max_parallel: Optional[int] = None,
+    use_cache: Optional[bool] = None,
+    max_concurrency: int = 10
+) -> AgentJob:
+    """
+    작가별 워크플로우 작업을 일괄 등록
+
+    배치 자체는 `batch` 타입의 AgentJob 으로 기록되고, 각 작가의 워크플로우는
+    배치를 parent_id 로 가지는 `workflow` 작업으로 큐에 등록됩니다.
+    워커는 배치의 max_concurrency 를 넘지 않도록 작업을 선점합니다.
+    """
+    query = select(Artist.id, Artist.name, Artist.type, Artist.nationality)
+    if artist_ids:
+        query = query.filter(Artist.id.in_(artist_ids))
+    if artist_type:
+        query = query.filter(Artist.type == artist_type)
+    if search:
+        query = query.filter(Artist.name.ilike(f"%{search}%"))
+
+    result = await db.execute(query.order_by(Artist.name))
+    artists = result.all()
+
+    if not artists:
+        raise ValueError("No artists matched the batch selection")
+
+    batch = AgentJob(
+        id=uuid.uuid4(),
+        job_type=BATCH_JOB_TYPE,
+        status="running",
+        input_data={
+            "workflow": workflow,
+            "artist_ids": [str(artist_id) for artist_id in artist_ids] if artist_ids else None,
+            "filter": {"type": artist_type, "search": search},
+            "max_concurrency": max_concurrency,
+            "total": len(artists)
+        },
+        started_at=datetime.utcnow()
+    )
+    db.add(batch)
+
+    now = datetime.utcnow()
+    rows = []
+    for artist in artists:
+        values = {
+            "id": str(artist.id),
+            "name": artist.name,
+            "type": artist.type,
+            "nationality": artist.nationality or ""
+        }
+        artist_context = dict(context or {})
+        artist_context.update({
+            "artist_id": values["id"],
+            "artist_name": artist.name,
+            "artist_type": artist.type
+        })
+        rows.append({
+            "id": uuid.uuid4(),
+            "job_type": WORKFLOW_JOB_TYPE,
+            "status": "pending",
+            "parent_id": batch.id,
+            "target_id": artist.id,
+            "target_type": "artist",
+            "input_data": {
+                "workflow": render_template(copy.deepcopy(workflow), values),
+                "context": artist_context,
+                "max_parallel": max_parallel,
+                "use_cache": use_cache
+            },
+            "created_at": now
+        })
+
+    await db.flush()
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await db.execute(insert(AgentJob), rows[start:start + INSERT_CHUNK_SIZE])
+    await db.commit()
+
+    return batch
+
+
+async def finalize_batch(db: AsyncSession, batch_id: UUID) -> None:
+    """
+    남은 작업이 없으면 배치를 완료 처리
+
+    모든 워크플로우가 성공하면 success, 모두 실패하면 failed, 일부만 실패하면
+    partial 로 기록하고 상태별 개수를 output_data 에 남깁니다.
+    """
+    result = await db.execute(
+        select(AgentJob.status, func.count())
+        .filter(AgentJob.parent_id == batch_id)
+        .group_by(AgentJob.status)
+    )
+    counts = {"success": 0, "failed": 0}
+    counts.update(dict(result.all()))
+    if counts.get("pending") or counts.get("running"):
+        return
+
+    if not counts["failed"]:
+        status = "success"
+    elif not counts["success"]:
+        status = "failed"
+    else:
+        status = "partial"
+
+    total = sum(counts.values())
+    await db.execute(
+        update(AgentJob)
+        .filter(AgentJob.id == batch_id, AgentJob.job_type == BATCH_JOB_TYPE, AgentJob.status == "running")
+        .values(
+            status=status,
+            output_data={"total": total, "counts": counts},
+            error_message=f"{counts['failed']} of {total} workflows failed" if counts["failed"] else None,
+            completed_at=datetime.utcnow()
+        )
+    )
+    await db.commit()
+
+
+async def get_batch_progress(db: AsyncSession, batch: AgentJob) -> Dict[str, Any]:
+    """상태별 작업 수, 처리량, 예상 완료 시간 집계"""
+    result = await db.execute(
+        select(AgentJob.status, func.count())
+        .filter(AgentJob.parent_id == batch.id)
+        .group_by(AgentJob.status)
+    )
+    counts = {"pending": 0, "running": 0, "success": 0, "failed": 0}
+    counts.update(dict(result.all()))
+
+    first_started, last_completed = (await db.execute(
+        select(func.min(AgentJob.started_at), func.max(AgentJob.completed_at))
+        .filter(AgentJob.parent_id == batch.id)
+    )).one()
+
+    total = sum(counts.values())
+    done = counts["success"] + counts["failed"]
+    remaining = counts["pending"] + counts["running"]
+
+    throughput = None
+    eta_seconds = None
+    if first_started and done:
+        end = last_completed if not remaining and last_completed else datetime.utcnow()
+        elapsed = max((end - first_started).total_seconds(), 1e-3)
+        throughput = done / elapsed
+        eta_seconds = remaining / throughput if remaining else 0.0
+
+    edits = await get_edit_outcomes(db, batch.id)
+
+    return {
+        "batch_id": str(batch.id),
+        "status": "running" if remaining else "completed",
+        "total": total,
+        "counts": counts,
+        "edits": edits,
+        "progress": done / total if total else 1.0,
+        "throughput_per_minute": throughput * 60 if throughput is not None else None,
+        "eta_seconds": eta_seconds,
+        "max_concurrency": (batch.input_data or {}).get("max_concurrency"),
+        "created_at": batch.created_at,
+        "completed_at": batch.completed_at
+    }
+
+
+async def get_edit_outcomes(db: AsyncSession, batch_id: UUID) -> Dict[str, int]:
+    """
+    배치 워크플로우들의 MediaWiki 편집 결과별 개수 (edited/skipped/conflict)
+
+    conflict 는 편집 충돌로 실패한 채 남아 있는 워크플로우 수입니다
+    (재개해 편집에 성공하면 edited/skipped 로 집계).
+    """
+    workflow = aliased(AgentJob)
+    outcome = AgentJob.output_data["outcome"].astext
+
+    result = await db.execute(
+        select(outcome, func.count())
+        .join(workflow, AgentJob.parent_id == workflow.id)
+        .filter(
+            workflow.parent_id == batch_id,
+            AgentJob.job_type == "mediawiki",
+            AgentJob.status == "success",
+            outcome.in_(EDIT_OUTCOMES)
+        )
+        .group_by(outcome)
+    )
+    edits = {name: 0 for name in EDIT_OUTCOMES}
+    edits.update(dict(result.all()))
+
+    edits["conflict"] = await db.scalar(
+        select(func.count(func.distinct(workflow.id)))
+        .join(AgentJob, AgentJob.parent_id == workflow.id)
+        .filter(
+            workflow.parent_id == batch_id,
+            workflow.status == "failed",
+            AgentJob.job_type == "mediawiki",
+            AgentJob.status == "failed",
+            AgentJob.error_message.startswith(EditConflictError.message_prefix)
+        )
+    ) or 0
+    return edits
@@ -0,0 +1,425 @@
+"""
+Cache Backends - 크기 기반 LRU 축출과 TTL을 지원하는 키-값 캐시
+
+모든 백엔드는 JSON 직렬화 가능한 값을 저장하며 같은 인터페이스를 제공합니다.
+- MemoryCacheBackend: 프로세스 내 LRU
+- DiskCacheBackend: 파일 시스템 (프로세스 간 공유, 재시작 후 유지)
+- CompressedDiskCacheBackend: gzip 으로 압축해 저장하는 DiskCacheBackend
+- PostgresCacheBackend: agent_result_cache 테이블 (노드 간 공유)
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+import zlib
+
+from sqlalchemy import select, delete, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models.agent_result_cache import AgentResultCache
+
+
+# DiskCacheBackend._read 가 만료된 항목에 대해 반환하는 값
+_EXPIRED = object()
+
+
+def _expired(entry: Dict[str, Any]) -> bool:
+    return entry.get("expires_at") is not None and entry["expires_at"] <= time.time()
+
+
+def canonical_json(value: Any) -> str:
+    """키 순서와 공백에 영향받지 않는 JSON 표현"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def content_hash(*parts: Any) -> str:
+    """여러 값을 정규화한 JSON의 sha256"""
+    return hashlib.sha256(canonical_json(list(parts)).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 호출을 한 번의 실행으로 합침
+
+    먼저 들어온 호출(소유자)만 func 를 실행하고, 그동안 같은 키로 들어온
+    호출은 그 결과나 예외를 공유합니다. 소유자가 취소되면 대기 중인 호출은
+    멈춰 있지 않고 다시 시도하며, 그중 하나가 새 소유자가 됩니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # 이 호출이 취소된 것이 아니라 소유자가 취소된 경우에만 재시도
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기자가 없어도 "exception was never retrieved" 경고가 나지 않도록
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+class CacheBackend(ABC):
+    """캐시 백엔드 인터페이스"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """값 조회 (없거나 만료되었으면 None)"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, namespace: str = "") -> None:
+        """값 저장 (ttl 초 후 만료, None이면 만료 없음)"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """값 삭제"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """프로세스 내 LRU 캐시 (총 바이트 수 기준 축출)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # key -> (value, size, expires_at)
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, size, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, namespace: str = "") -> None:
+        size = len(canonical_json(value).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        expires_at = time.time() + ttl if ttl else None
+        self._entries[key] = (value, size, expires_at)
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    파일 기반 캐시
+
+    항목마다 `<dir>/<key[:2]>/<key>.json` 파일 하나를 사용하고, 파일의
+    mtime 을 마지막 접근 시각으로 삼아 총 크기가 max_bytes 를 넘으면
+    오래된 항목부터 삭제합니다. 파일 I/O는 스레드에서 실행됩니다.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None  # path -> (size, mtime)
+        self._lock = asyncio.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{self.suffix}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        value = await asyncio.to_thread(self._read, path)
+        if value is _EXPIRED:
+            # 인덱스는 _write 의 축출과 같은 잠금 안에서만 변경
+            async with self._lock:
+                await asyncio.to_thread(self._remove_expired, path)
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, namespace: str = "") -> None:
+        payload = self._encode(canonical_json({
+            "expires_at": time.time() + ttl if ttl else None,
+            "namespace": namespace,
+            "value": value
+        }).encode("utf-8"))
+        if len(payload) > self.max_bytes:
+            return
+
+        async with self._lock:
+            await asyncio.to_thread(self._write, self._path(key), payload)
+
+    async def delete(self, key: str) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._remove, self._path(key))
+
+    def _read(self, path: str) -> Any:
+        """값 읽기 (만료되었으면 _EXPIRED, 삭제는 호출자가 잠금을 잡고 수행)"""
+        entry = self._load(path)
+        if entry is None:
+            return None
+        if _expired(entry):
+            return _EXPIRED
+
+        # LRU 갱신
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return entry.get("value")
+
+    def _load(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                return json.loads(self._decode(f.read()))
+        except (ValueError, OSError, EOFError, zlib.error):
+            return None
+
+    def _remove_expired(self, path: str) -> None:
+        # 읽은 뒤 다른 호출이 새 값을 저장했을 수 있으므로 다시 확인
+        entry = self._load(path)
+        if entry is not None and _expired(entry):
+            self._remove(path)
+
+    def _encode(self, payload: bytes) -> bytes:
+        return payload
+
+    def _decode(self, payload: bytes) -> bytes:
+        return payload
+
+    def _write(self, path: str, payload: bytes) -> None:
+        index = self._load_index()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        index[path] = (len(payload), time.time())
+
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+
+        # 다른 프로세스의 접근 시각을 반영하도록 mtime을 다시 읽어 축출
+        for candidate in list(index):
+            try:
+                index[candidate] = (index[candidate][0], os.path.getmtime(candidate))
+            except FileNotFoundError:
+                index.pop(candidate)
+        for candidate, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if candidate != path:
+                self._remove(candidate)
+                total -= size
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        if self._index is not None:
+            self._index.pop(path, None)
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(self.suffix):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        self._index[path] = (stat.st_size, stat.st_mtime)
+        return self._index
+
+
+class CompressedDiskCacheBackend(DiskCacheBackend):
+    """
+    gzip 으로 압축해 저장하는 파일 기반 캐시
+
+    HTML 처럼 큰 텍스트 값에 사용하며, 크기 한도(max_bytes)는 압축된
+    파일 크기 기준입니다.
+    """
+
+    suffix = ".json.gz"
+
+    def __init__(self, directory: str, max_bytes: int, compresslevel: int = 6):
+        super().__init__(directory, max_bytes)
+        self.compresslevel = compresslevel
+
+    def _encode(self, payload: bytes) -> bytes:
+        return gzip.compress(payload, compresslevel=self.compresslevel)
+
+    def _decode(self, payload: bytes) -> bytes:
+        return gzip.decompress(payload)
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    agent_result_cache 테이블 기반 캐시
+
+    여러 노드의 API 서버와 워커가 같은 캐시를 공유합니다. 총 크기가
+    max_bytes 를 넘으면 accessed_at 기준으로 오래된 항목을 삭제하며,
+    축출은 evict_every 번의 저장마다 한 번 실행됩니다. scope 를 지정하면
+    그 namespace 의 항목만 크기를 세고 축출합니다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        max_bytes: int,
+        evict_every: int = 100,
+        scope: Optional[str] = None
+    ):
+        self.session_factory = session_factory
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.scope = scope
+        self._sets = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(AgentResultCache)
+                .filter(
+                    AgentResultCache.key == key,
+                    (AgentResultCache.expires_at.is_(None)) | (AgentResultCache.expires_at > now)
+                )
+                .values(accessed_at=now)
+                .returning(AgentResultCache.value)
+            )
+            value = result.scalar_one_or_none()
+            await db.commit()
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, namespace: str = "") -> None:
+        now = datetime.utcnow()
+        values = {
+            "key": key,
+            "namespace": namespace,
+            "value": value,
+            "size_bytes": len(canonical_json(value).encode("utf-8")),
+            "expires_at": now + timedelta(seconds=ttl) if ttl else None,
+            "accessed_at": now,
+            "created_at": now
+        }
+        statement = pg_insert(AgentResultCache).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[AgentResultCache.key],
+            set_={
+                "value": statement.excluded.value,
+                "size_bytes": statement.excluded.size_bytes,
+                "expires_at": statement.excluded.expires_at,
+                "accessed_at": statement.excluded.accessed_at
+            }
+        )
+
+        async with self.session_factory() as db:
+            await db.execute(statement)
+            await db.commit()
+
+        self._sets += 1
+        if self._sets % self.evict_every == 0:
+            await self.evict()
+
+    async def delete(self, key: str) -> None:
+        async with self.session_factory() as db:
+            await db.execute(delete(AgentResultCache).filter(AgentResultCache.key == key))
+            await db.commit()
+
+    async def evict(self) -> None:
+        """만료 항목 및 크기 한도를 넘는 오래된 항목 삭제"""
+        scoped = [AgentResultCache.namespace == self.scope] if self.scope is not None else []
+        running_total = (
+            select(
+                AgentResultCache.key,
+                func.sum(AgentResultCache.size_bytes)
+                .over(order_by=AgentResultCache.accessed_at.desc())
+                .label("running_total")
+            )
+            .filter(*scoped)
+            .subquery()
+        )
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(AgentResultCache).filter(AgentResultCache.expires_at <= datetime.utcnow(), *scoped)
+            )
+            await db.execute(
+                delete(AgentResultCache).filter(
+                    AgentResultCache.key.in_(
+                        select(running_total.c.key).filter(running_total.c.running_total > self.max_bytes)
+                    )
+                )
+            )
+            await db.commit()
+
+
+def create_backend(
+    kind: str,
+    max_bytes: int,
+    directory: Optional[str] = None,
+    session_factory: Optional[Callable] = None,
+    scope: Optional[str] = None
+) -> CacheBackend:
+    """설정 값으로 백엔드 생성 (memory | disk | postgres, scope 는 postgres 축출 범위)"""
+    if kind == "memory":
+        return MemoryCacheBackend(max_bytes)
+    if kind == "disk":
+        if not directory:
+            raise ValueError("Disk cache backend requires a directory")
+        return DiskCacheBackend(directory, max_bytes)
+    if kind == "postgres":
+        if session_factory is None:
+            raise ValueError("Postgres cache backend requires a session factory")
+        return PostgresCacheBackend(session_factory, max_bytes, scope=scope)
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -0,0 +1,294 @@
+"""
+Crawl Frontier - 다중 URL 크롤링 스케줄링 (호스트별 예의, robots.txt, 중복 제거)
+"""
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+import asyncio
+import logging
+import re
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import http_clients
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    중복 제거용 URL 정규화
+
+    상대 경로를 base 기준으로 풀고, fragment 와 기본 포트를 제거하며
+    scheme/host 를 소문자로 바꿉니다. http(s) 가 아니거나 잘못된 URL
+    (예: 숫자가 아닌 포트, 닫히지 않은 IPv6 주소)이면 None.
+    """
+    try:
+        url = urldefrag(urljoin(base, url.strip()) if base else url.strip())[0]
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    scheme = parts.scheme.lower()
+    netloc = parts.hostname.lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+class RobotsCache:
+    """
+    호스트별 robots.txt 캐시
+
+    호스트마다 한 번만 받아 ttl 동안 재사용하며, 같은 호스트의 동시
+    조회는 한 번의 요청으로 합쳐집니다. 404 등 4xx 는 전체 허용,
+    5xx 나 연결 실패는 전체 금지로 보고 error_ttl 동안만 유지합니다.
+    """
+
+    def __init__(self, user_agent: str, ttl: float, error_ttl: float = 600.0, upstream: str = "crawler"):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.upstream = upstream
+        self._parsers: Dict[str, Tuple[RobotFileParser, float]] = {}  # origin -> (parser, expires_at)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.fetches = 0
+
+    @classmethod
+    def from_settings(cls) -> "RobotsCache":
+        return cls(settings.CRAWLER_ROBOTS_USER_AGENT, settings.CRAWLER_ROBOTS_TTL)
+
+    async def allowed(self, url: str) -> bool:
+        parser = await self._parser(url)
+        return parser.can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        parser = await self._parser(url)
+        delay = parser.crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+    async def _parser(self, url: str) -> RobotFileParser:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+
+        cached = self._parsers.get(origin)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
+        lock = self._locks.setdefault(origin, asyncio.Lock())
+        async with lock:
+            cached = self._parsers.get(origin)
+            if cached is not None and cached[1] > time.time():
+                return cached[0]
+
+            parser, ttl = await self._fetch(origin)
+            self._parsers[origin] = (parser, time.time() + ttl)
+            return parser
+
+    async def _fetch(self, origin: str) -> Tuple[RobotFileParser, float]:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        self.fetches += 1
+        try:
+            response = await http_clients.client(self.upstream).get(f"{origin}/robots.txt", follow_redirects=True)
+        except httpx.HTTPError as e:
+            logger.warning(f"robots.txt fetch failed for {origin}: {e}")
+            parser.disallow_all = True
+            return parser, self.error_ttl
+
+        if response.status_code >= 500:
+            parser.disallow_all = True
+            return parser, self.error_ttl
+        if response.status_code >= 400:
+            parser.allow_all = True
+            return parser, self.ttl
+
+        parser.parse(response.text.splitlines())
+        return parser, self.ttl
+
+
+class HostPoliteness:
+    """
+    호스트별 동시 요청 수와 요청 간격 제한
+
+    프로세스 안의 모든 크롤링이 공유하므로 여러 작업이 같은 호스트를
+    크롤링해도 합쳐서 concurrency 개, delay 초 간격을 넘지 않습니다.
+    robots.txt 의 Crawl-delay 가 더 길면 그 값을 사용합니다.
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._in_flight: Dict[str, int] = {}
+        self._next_at: Dict[str, float] = {}
+        self._delays: Dict[str, float] = {}
+
+    @classmethod
+    def from_settings(cls) -> "HostPoliteness":
+        return cls(settings.CRAWLER_PER_HOST_CONCURRENCY, settings.CRAWLER_PER_HOST_DELAY)
+
+    def try_acquire(self, host: str) -> bool:
+        """지금 요청할 수 있으면 슬롯을 예약하고 True"""
+        now = time.monotonic()
+        if self._in_flight.get(host, 0) >= self.concurrency or self._next_at.get(host, 0.0) > now:
+            return False
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        self._next_at[host] = now + self._delays.get(host, self.delay)
+        return True
+
+    def release(self, host: str) -> None:
+        self._in_flight[host] = max(0, self._in_flight.get(host, 0) - 1)
+
+    def wait_time(self, host: str) -> Optional[float]:
+        """다음 요청까지 남은 시간 (슬롯이 가득 차 있으면 None)"""
+        if self._in_flight.get(host, 0) >= self.concurrency:
+            return None
+        return max(0.0, self._next_at.get(host, 0.0) - time.monotonic())
+
+    def set_crawl_delay(self, host: str, delay: Optional[float]) -> None:
+        self._delays[host] = max(self.delay, delay or 0.0)
+
+
+class CrawlFrontier:
+    """
+    다중 URL 크롤링 프런티어
+
+    시드 URL 과 (선택적으로) 링크를 따라 발견한 URL 을 호스트별 큐에 넣고,
+    요청 가능한 호스트부터 돌아가며 전체 max_concurrency 개까지 동시에
+    가져옵니다. 한 호스트가 간격 제한으로 기다리는 동안 다른 호스트를
+    크롤링하므로 전체 처리량은 높이면서 호스트별 부하는 제한됩니다.
+    URL 은 정규화해 한 번만 방문하고 robots.txt 가 금지한 URL 은 건너뜁니다.
+    """
+
+    # 다른 크롤링이 호스트 슬롯을 쓰고 있을 때 다시 확인하는 간격(초)
+    poll_interval = 0.05
+
+    def __init__(
+        self,
+        fetch: Callable[[str, int], Awaitable[Dict[str, Any]]],
+        robots: RobotsCache,
+        hosts: HostPoliteness,
+        max_concurrency: int,
+        max_pages: int,
+        max_depth: int = 0,
+        follow_pattern: Optional[str] = None,
+        same_host: bool = True
+    ):
+        self.fetch = fetch
+        self.robots = robots
+        self.hosts = hosts
+        self.max_concurrency = max_concurrency
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.follow_pattern = re.compile(follow_pattern) if follow_pattern else None
+        self.same_host = same_host
+
+    async def crawl(self, seeds: Iterable[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        크롤링 실행
+
+        Returns:
+            (발견 순서대로 정렬한 페이지 목록, 실패 목록 [{"url", "error"}])
+        """
+        queues: Dict[str, Deque[Tuple[str, int]]] = {}
+        seen: Dict[str, int] = {}  # URL -> 발견 순서
+        seed_hosts: Set[str] = set()
+        for seed in seeds:
+            url = normalize_url(seed)
+            if url is None:
+                continue
+            seed_hosts.add(host_of(url))
+            self._enqueue(queues, seen, url, 0)
+
+        pages: List[Tuple[int, Dict[str, Any]]] = []
+        failed: List[Dict[str, Any]] = []
+        running: Dict[asyncio.Task, Tuple[str, str, int]] = {}
+
+        try:
+            while running or any(queues.values()):
+                # 요청 가능한 호스트를 돌아가며 하나씩 시작
+                progressed = True
+                while progressed and len(running) < self.max_concurrency:
+                    progressed = False
+                    for host, queue in queues.items():
+                        if len(running) >= self.max_concurrency:
+                            break
+                        if queue and self.hosts.try_acquire(host):
+                            url, depth = queue.popleft()
+                            task = asyncio.create_task(self._visit(url, depth))
+                            running[task] = (host, url, depth)
+                            progressed = True
+
+                waits = [self.hosts.wait_time(host) for host, queue in queues.items() if queue]
+                timeout = None
+                if waits:
+                    timeout = min(self.poll_interval if wait is None else wait for wait in waits)
+                if not running:
+                    await asyncio.sleep(timeout or 0)
+                    continue
+
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    host, url, depth = running.pop(task)
+                    self.hosts.release(host)
+                    try:
+                        page = task.result()
+                    except Exception as e:
+                        logger.warning(f"Crawl failed for {url}: {e}")
+                        failed.append({"url": url, "error": str(e)})
+                        continue
+                    if page is None:
+                        failed.append({"url": url, "error": "disallowed by robots.txt"})
+                        continue
+
+                    links = page.pop("links", None) or []
+                    pages.append((seen[url], page))
+                    if depth < self.max_depth:
+                        for link in links:
+                            link_url = normalize_url(link, base=page.get("source_url") or url)
+                            if link_url and self._should_follow(link_url, seed_hosts):
+                                self._enqueue(queues, seen, link_url, depth + 1)
+        finally:
+            # 오류나 취소로 중단되면 남은 요청을 취소하고 공유 호스트 슬롯을 반납
+            for task, (host, _, _) in running.items():
+                task.cancel()
+                self.hosts.release(host)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        # 완료 순서와 관계없이 같은 입력이면 같은 결과가 되도록 정렬
+        pages.sort(key=lambda item: item[0])
+        return [page for _, page in pages], failed
+
+    async def _visit(self, url: str, depth: int) -> Optional[Dict[str, Any]]:
+        if not await self.robots.allowed(url):
+            return None
+        self.hosts.set_crawl_delay(host_of(url), await self.robots.crawl_delay(url))
+        return await self.fetch(url, depth)
+
+    def _enqueue(self, queues: Dict[str, Deque[Tuple[str, int]]], seen: Dict[str, int], url: str, depth: int) -> None:
+        if url in seen or len(seen) >= self.max_pages:
+            return
+        seen[url] = len(seen)
+        queues.setdefault(host_of(url), deque()).append((url, depth))
+
+    def _should_follow(self, url: str, seed_hosts: Set[str]) -> bool:
+        if self.same_host and host_of(url) not in seed_hosts:
+            return False
+        return self.follow_pattern is None or bool(self.follow_pattern.search(url))
+
+
+# 글로벌 robots.txt 캐시와 호스트별 제한 (프로세스 내 모든 크롤링이 공유)
+robots_cache = RobotsCache.from_settings()
+host_politeness = HostPoliteness.from_settings()
@@ -0,0 +1,533 @@
+"""
+Fact Extractors - 크롤링한 HTML 에서 작가 팩트 추출
+
+추출기 파이프라인은 구조화된 정보(인포박스, JSON-LD, OpenGraph)를 우선
+사용하고, 본문은 주요 문단만 골라 토큰 예산에 맞게 잘라 요약 텍스트로
+만듭니다. 결과는 원본 HTML 대신 다음 단계(writer)에 전달되는 작은
+FactRecord 입니다. 파싱 프로세스 풀에서 실행되므로 추출기는 이 모듈을
+import 할 때 등록되어야 합니다.
+
+문서는 조각 단위로 증분 파싱하면서 추출기가 읽지 않는 하위 트리(탐색, 폼,
+스크립트 등)를 닫히는 즉시 트리에서 떼어 내므로, 트리와 이후 XPath 탐색은
+필요한 부분(head, 인포박스, 본문)만 대상으로 합니다. 링크는 떼어 내기 전에
+모아 둡니다.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+import json
+import re
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from app.schemas.fact import FactRecord
+
+# writer 의 토큰 추정과 같은 비율 (약 4자당 1토큰)
+CHARS_PER_TOKEN = 4
+# 이보다 짧은 문단은 캡션/버튼 등으로 보고 본문에서 제외
+MIN_PARAGRAPH_CHARS = 40
+
+MONTHS = {
+    name: index + 1
+    for index, names in enumerate([
+        ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+        ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+        ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"), ("december", "dec")
+    ])
+    for name in names
+}
+MONTH_PATTERN = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+DAY_MONTH_YEAR_RE = re.compile(rf"\b(\d{{1,2}})\s+({MONTH_PATTERN})\.?\s+(\d{{3,4}})\b", re.I)
+MONTH_DAY_YEAR_RE = re.compile(rf"\b({MONTH_PATTERN})\.?\s+(\d{{1,2}}),?\s+(\d{{3,4}})\b", re.I)
+YEAR_RE = re.compile(r"\b(1[0-9]{3}|20[0-9]{2})\b")
+WORK_YEAR_RE = re.compile(r"^(.*?)\s*\((?:c\.\s*)?(\d{4})[^)]*\)\s*$")
+FOOTNOTE_RE = re.compile(r"\[\s*(?:\d+|[a-z]|note \d+|citation needed)\s*\]", re.I)
+WHITESPACE_RE = re.compile(r"\s+")
+LIST_SPLIT_RE = re.compile(r"\s*(?:,|;|·|•|\n)\s*")
+# 작품 제목에는 쉼표가 들어갈 수 있으므로 줄바꿈/세미콜론으로만 분리
+WORK_SPLIT_RE = re.compile(r"\s*(?:;|·|•|\n)\s*")
+TITLE_SEPARATORS_RE = re.compile(r"\s+[|\-–—]\s+")
+
+# JSON-LD 에서 작품으로 취급할 타입
+WORK_TYPES = {
+    "CreativeWork", "VisualArtwork", "Painting", "Sculpture", "Photograph",
+    "Book", "Novel", "MusicAlbum", "MusicRecording", "MusicComposition", "Movie"
+}
+
+# 본문 추출 전에 제거할 요소 (탐색, 광고, 각주, 표)
+BOILERPLATE_XPATH = (
+    "//script|//style|//noscript|//nav|//header|//footer|//aside|//form|//table|//figure"
+    "|//sup[contains(@class, 'reference')]"
+    "|//*[contains(concat(' ', normalize-space(@class), ' '), ' navbox ')]"
+    "|//*[contains(concat(' ', normalize-space(@class), ' '), ' reflist ')]"
+    "|//*[@role='navigation']"
+)
+MAIN_CONTENT_XPATH = "//main|//article|//*[@role='main']|//*[@id='mw-content-text']|//*[@id='content']"
+
+# 파싱 중 바로 버리는 하위 트리 (어느 추출기도 읽지 않음, JSON-LD 가 아닌 script 포함)
+PRUNED_TAGS = frozenset({"style", "noscript", "nav", "footer", "aside", "form", "svg", "iframe", "template"})
+JSON_LD_TYPE = "application/ld+json"
+# 증분 파싱에 넣는 조각 크기 (조각마다 닫힌 하위 트리를 정리)
+PARSE_CHUNK_BYTES = 64 * 1024
+
+
+class FactExtractor:
+    """
+    팩트 추출기 베이스
+
+    hosts 가 있으면 해당 호스트(하위 도메인 포함)의 페이지에만 적용합니다.
+    extract 는 FactRecord 필드 중 찾은 값만 담은 사전을 반환합니다.
+    """
+
+    name = "base"
+    hosts: Tuple[str, ...] = ()
+
+    def matches(self, url: str) -> bool:
+        if not self.hosts:
+            return True
+        host = urlsplit(url).hostname or ""
+        return any(host == suffix or host.endswith(f".{suffix}") for suffix in self.hosts)
+
+    def extract(self, doc: lxml_html.HtmlElement, url: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class InfoboxExtractor(FactExtractor):
+    """MediaWiki 계열(위키백과 등) 인포박스 표"""
+
+    name = "infobox"
+
+    # 인포박스 항목 이름 → 팩트 필드
+    LABELS = {
+        "born": "born",
+        "died": "died",
+        "nationality": "nationality",
+        "citizenship": "nationality",
+        "occupation": "occupations",
+        "occupations": "occupations",
+        "profession": "occupations",
+        "known for": "occupations",
+        "movement": "movements",
+        "notable work": "works",
+        "notable works": "works",
+        "works": "works",
+    }
+
+    def extract(self, doc: lxml_html.HtmlElement, url: str) -> Dict[str, Any]:
+        tables = doc.xpath("//table[contains(concat(' ', normalize-space(@class), ' '), ' infobox ')]")
+        if not tables:
+            return {}
+
+        table = tables[0]
+        facts: Dict[str, Any] = {}
+        caption = table.xpath(".//caption|.//th[contains(@class, 'infobox-above')]")
+        if caption:
+            facts["name"] = clean_text(caption[0].text_content())
+
+        for row in table.xpath(".//tr[th and td]"):
+            label = clean_text(row.xpath("./th")[0].text_content()).lower()
+            field = self.LABELS.get(label)
+            if field is None:
+                continue
+            cell = row.xpath("./td")[0]
+
+            if field == "born":
+                facts["birth_date"] = _microformat_date(cell, "bday") or parse_date(cell.text_content())
+                facts["birth_place"] = _place(cell, "birthplace")
+            elif field == "died":
+                facts["death_date"] = _microformat_date(cell, "dday") or parse_date(cell.text_content())
+                facts["death_place"] = _place(cell, "deathplace")
+            elif field == "nationality":
+                facts["nationality"] = clean_text(cell.text_content())
+            elif field == "works":
+                facts["works"] = [parse_work(item) for item in _list_items(cell, WORK_SPLIT_RE)]
+            else:
+                facts.setdefault(field, []).extend(_list_items(cell))
+
+        return facts
+
+
+class JsonLdExtractor(FactExtractor):
+    """schema.org JSON-LD (Person 과 작품 항목)"""
+
+    name = "json_ld"
+
+    def extract(self, doc: lxml_html.HtmlElement, url: str) -> Dict[str, Any]:
+        facts: Dict[str, Any] = {}
+        works: List[Dict[str, Any]] = []
+
+        for item in _json_ld_items(doc):
+            types = item.get("@type")
+            types = set(types) if isinstance(types, list) else {types}
+
+            if "Person" in types and "name" not in facts:
+                facts["name"] = _ld_text(item.get("name"))
+                facts["birth_date"] = parse_date(_ld_text(item.get("birthDate")))
+                facts["death_date"] = parse_date(_ld_text(item.get("deathDate")))
+                facts["birth_place"] = _ld_text(item.get("birthPlace"))
+                facts["death_place"] = _ld_text(item.get("deathPlace"))
+                facts["nationality"] = _ld_text(item.get("nationality"))
+                facts["occupations"] = _ld_list(item.get("jobTitle")) + _ld_list(item.get("hasOccupation"))
+                facts["description"] = _ld_text(item.get("description"))
+                for key in ("notableWork", "workExample"):
+                    works.extend(_ld_work(work) for work in _as_list(item.get(key)))
+            elif types & WORK_TYPES:
+                works.append(_ld_work(item))
+
+        works = [work for work in works if work]
+        if works:
+            facts["works"] = works
+        return facts
+
+
+class OpenGraphExtractor(FactExtractor):
+    """OpenGraph / meta description"""
+
+    name = "open_graph"
+
+    def extract(self, doc: lxml_html.HtmlElement, url: str) -> Dict[str, Any]:
+        def meta(*names: str) -> Optional[str]:
+            for name in names:
+                values = doc.xpath(f"//meta[@property='{name}' or @name='{name}']/@content")
+                if values and values[0].strip():
+                    return clean_text(values[0])
+            return None
+
+        facts: Dict[str, Any] = {"description": meta("og:description", "description")}
+        title = meta("og:title")
+        if title:
+            # "Pablo Picasso | MoMA" → "Pablo Picasso"
+            facts["name"] = TITLE_SEPARATORS_RE.split(title)[0]
+        return facts
+
+
+# 앞에 있는 추출기의 값이 우선 (구조화 정도가 높은 순서)
+EXTRACTORS: List[FactExtractor] = [InfoboxExtractor(), JsonLdExtractor(), OpenGraphExtractor()]
+
+
+def register_extractor(extractor: FactExtractor, first: bool = True) -> None:
+    """추출기 추가 (first 이면 기존 추출기보다 우선, 모듈 import 시 호출)"""
+    if first:
+        EXTRACTORS.insert(0, extractor)
+    else:
+        EXTRACTORS.append(extractor)
+
+
+def extract_page(
+    html: str,
+    url: str,
+    with_links: bool = False,
+    token_budget: int = 800,
+    max_works: int = 30
+) -> Dict[str, Any]:
+    """
+    페이지에서 제목, 팩트, (선택) 링크 추출
+
+    프로세스 풀에서 실행되는 최상위 함수이며 입력과 출력은 pickle 가능한 값입니다.
+
+    Returns:
+        {"title": 문서 제목, "facts": FactRecord 사전, "links": 절대 URL 목록 (with_links 일 때)}
+    """
+    doc, hrefs = _parse(html)
+    if doc is None:
+        return {"title": None, "facts": {}, "links": []}
+
+    title = clean_text(doc.findtext(".//title") or "") or None
+    links = _links(hrefs, url) if with_links else []
+
+    records = []
+    for extractor in EXTRACTORS:
+        if not extractor.matches(url):
+            continue
+        try:
+            found = extractor.extract(doc, url)
+        except Exception:
+            # 한 추출기의 예상 밖 구조가 나머지 추출을 막지 않도록 무시
+            continue
+        if any(found.values()):
+            records.append({**found, "sources": [extractor.name]})
+
+    # 본문 추출은 문서를 변경하므로 마지막에 실행
+    summary = main_text(doc, token_budget)
+    if summary:
+        records.append({"summary": summary, "sources": ["main_content"]})
+
+    return {
+        "title": title,
+        "facts": merge_facts(records, token_budget=token_budget, max_works=max_works),
+        "links": links
+    }
+
+
+def merge_facts(
+    records: Iterable[Dict[str, Any]],
+    token_budget: int = 800,
+    max_works: int = 30
+) -> Dict[str, Any]:
+    """
+    여러 팩트 사전을 하나의 FactRecord 로 병합
+
+    단일 값은 먼저 나온 값이, 목록은 중복을 제거한 합집합이 사용되며
+    요약은 이어 붙인 뒤, 설명(description)은 그대로 토큰 예산에 맞춰 자릅니다.
+    빈 필드는 생략합니다.
+    """
+    merged: Dict[str, Any] = {}
+    summaries: List[str] = []
+    for record in records:
+        for field, value in record.items():
+            if value in (None, "", []):
+                continue
+            if field == "summary":
+                if value not in summaries:
+                    summaries.append(value)
+            elif field == "works":
+                merged["works"] = _merge_works(merged.get("works", []), value)
+            elif isinstance(value, list):
+                merged[field] = _merge_list(merged.get(field, []), value)
+            else:
+                merged.setdefault(field, value)
+
+    if summaries:
+        merged["summary"] = trim_to_budget("\n".join(summaries), token_budget)
+    if "description" in merged:
+        merged["description"] = trim_to_budget(merged["description"], token_budget)
+    if "works" in merged:
+        merged["works"] = merged["works"][:max_works]
+
+    return FactRecord.model_validate(merged).model_dump(exclude_defaults=True)
+
+
+def main_text(doc: lxml_html.HtmlElement, token_budget: int) -> str:
+    """탐색/각주 등을 제거한 주요 본문 문단 (토큰 예산 이내)"""
+    for element in doc.xpath(BOILERPLATE_XPATH):
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    candidates = doc.xpath(MAIN_CONTENT_XPATH)
+    root = candidates[0] if candidates else _densest_block(doc)
+    if root is None:
+        return ""
+
+    paragraphs = [clean_text(p.text_content()) for p in root.iter("p")]
+    if not any(len(p) >= MIN_PARAGRAPH_CHARS for p in paragraphs):
+        # 문단 표시가 없으면 링크(탐색 메뉴 등)를 뺀 나머지 텍스트
+        for anchor in root.xpath(".//a"):
+            anchor.drop_tree()
+        paragraphs = [clean_text(root.text_content())]
+
+    paragraphs = [p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS]
+    return trim_to_budget("\n".join(paragraphs), token_budget)
+
+
+def trim_to_budget(text: str, token_budget: int) -> str:
+    """토큰 예산(약 4자당 1토큰)에 맞게 문장 경계에서 자르기"""
+    limit = token_budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+
+    cut = text[:limit]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary > limit // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip()
+
+
+def parse_date(text: Optional[str]) -> Optional[str]:
+    """문장 속 날짜를 YYYY-MM-DD (연도만 있으면 YYYY) 로 변환"""
+    if not text:
+        return None
+
+    match = ISO_DATE_RE.search(text)
+    if match:
+        return match.group(0)
+    match = DAY_MONTH_YEAR_RE.search(text)
+    if match:
+        day, month, year = match.groups()
+        return f"{int(year):04d}-{MONTHS[month.lower()]:02d}-{int(day):02d}"
+    match = MONTH_DAY_YEAR_RE.search(text)
+    if match:
+        month, day, year = match.groups()
+        return f"{int(year):04d}-{MONTHS[month.lower()]:02d}-{int(day):02d}"
+    match = YEAR_RE.search(text)
+    return match.group(1) if match else None
+
+
+def parse_work(text: str) -> Dict[str, Any]:
+    """"Guernica (1937)" → {"title": "Guernica", "year": 1937}"""
+    match = WORK_YEAR_RE.match(text)
+    if match and match.group(1):
+        return {"title": match.group(1).strip(" ,"), "year": int(match.group(2))}
+    return {"title": text}
+
+
+def clean_text(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", FOOTNOTE_RE.sub("", text)).strip()
+
+
+def _parse(html: str) -> Tuple[Optional[lxml_html.HtmlElement], List[str]]:
+    """
+    문서 트리와 모든 링크의 href
+
+    PRUNED_TAGS 하위 트리는 닫히는 즉시 떼어 내 트리에 남기지 않습니다.
+    """
+    if not html or not html.strip():
+        return None, []
+
+    # 문자열을 UTF-8 로 넘기므로 문서의 인코딩 선언은 무시
+    parser = etree.HTMLPullParser(events=("end",), encoding="utf-8")
+    parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+    hrefs: List[str] = []
+    data = html.encode("utf-8")
+    try:
+        for start in range(0, len(data), PARSE_CHUNK_BYTES):
+            parser.feed(data[start:start + PARSE_CHUNK_BYTES])
+            _prune(parser.read_events(), hrefs)
+        doc = parser.close()
+    except etree.ParserError:
+        return None, []
+    _prune(parser.read_events(), hrefs)
+    return doc, hrefs
+
+
+def _prune(events: Iterable[Tuple[str, Any]], hrefs: List[str]) -> None:
+    """닫힌 요소 중 링크는 모으고 필요 없는 하위 트리는 떼어 냄"""
+    for _, element in events:
+        tag = element.tag
+        if tag == "a":
+            href = element.get("href")
+            if href is not None:
+                hrefs.append(href)
+        elif tag in PRUNED_TAGS or (tag == "script" and element.get("type") != JSON_LD_TYPE):
+            if element.getparent() is not None:
+                element.drop_tree()
+
+
+def _links(hrefs: Iterable[str], url: str) -> List[str]:
+    """링크의 절대 URL (잘못된 링크 하나가 페이지 추출 전체를 실패시키지 않도록 건너뜀)"""
+    links = []
+    for href in hrefs:
+        try:
+            link = urljoin(url, href)
+            urlsplit(link).port
+        except ValueError:
+            # 닫히지 않은 IPv6 주소, 숫자가 아닌 포트 등
+            continue
+        links.append(link)
+    return links
+
+
+def _microformat_date(cell: lxml_html.HtmlElement, css_class: str) -> Optional[str]:
+    values = cell.xpath(f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+    return parse_date(values[0].text_content()) if values else None
+
+
+def _place(cell: lxml_html.HtmlElement, css_class: str) -> Optional[str]:
+    """장소 (microformat 이 없으면 날짜 다음 줄, 예: "14 November 1840<br>Paris")"""
+    values = cell.xpath(f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+    if values:
+        return clean_text(values[0].text_content()) or None
+    lines = [clean_text(line) for line in _cell_text(cell).split("\n")]
+    lines = [line for line in lines if line]
+    return lines[-1] if len(lines) > 1 else None
+
+
+def _list_items(cell: lxml_html.HtmlElement, separators: re.Pattern = LIST_SPLIT_RE) -> List[str]:
+    """인포박스 칸의 목록 항목 (li 가 없으면 separators 로 분리)"""
+    items = [clean_text(li.text_content()) for li in cell.iter("li")]
+    if not items:
+        items = [clean_text(part) for part in separators.split(_cell_text(cell))]
+    return [item for item in items if item]
+
+
+def _cell_text(cell: lxml_html.HtmlElement) -> str:
+    """br 을 줄바꿈으로 바꾼 칸 텍스트 (문서는 변경하지 않음)"""
+    parts = [cell.text or ""]
+    for child in cell:
+        if child.tag == "br":
+            parts.append("\n")
+        elif isinstance(child.tag, str):
+            parts.append(_cell_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _json_ld_items(doc: lxml_html.HtmlElement) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    for script in doc.xpath("//script[@type='application/ld+json']"):
+        try:
+            data = json.loads(script.text_content())
+        except ValueError:
+            continue
+        for item in _as_list(data):
+            if isinstance(item, dict):
+                items.extend(entry for entry in _as_list(item.get("@graph")) if isinstance(entry, dict))
+                items.append(item)
+    return items
+
+
+def _ld_text(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("name")
+    return clean_text(str(value)) or None if value else None
+
+
+def _ld_list(value: Any) -> List[str]:
+    return [text for text in (_ld_text(item) for item in _as_list(value)) if text]
+
+
+def _ld_work(item: Any) -> Optional[Dict[str, Any]]:
+    title = _ld_text(item)
+    if not title:
+        return None
+    year = None
+    if isinstance(item, dict):
+        date = parse_date(_ld_text(item.get("dateCreated")) or _ld_text(item.get("datePublished")))
+        year = int(date[:4]) if date else None
+    return {"title": title, "year": year}
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _merge_list(current: List[str], values: List[str]) -> List[str]:
+    seen = {value.lower() for value in current}
+    merged = list(current)
+    for value in values:
+        if value.lower() not in seen:
+            seen.add(value.lower())
+            merged.append(value)
+    return merged
+
+
+def _merge_works(current: List[Dict[str, Any]], values: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_title = {work["title"].lower(): work for work in current}
+    merged = list(current)
+    for work in values:
+        existing = by_title.get(work["title"].lower())
+        if existing is None:
+            work = dict(work)
+            by_title[work["title"].lower()] = work
+            merged.append(work)
+        elif not existing.get("year") and work.get("year"):
+            existing["year"] = work["year"]
+    return merged
+
+
+def _densest_block(doc: lxml_html.HtmlElement) -> Optional[lxml_html.HtmlElement]:
+    """main/article 표시가 없을 때 문단 텍스트가 가장 많은 요소"""
+    scores: Dict[lxml_html.HtmlElement, int] = {}
+    for paragraph in doc.iter("p"):
+        parent = paragraph.getparent()
+        if parent is not None:
+            scores[parent] = scores.get(parent, 0) + len(paragraph.text_content())
+    if scores:
+        return max(scores, key=scores.get)
+    body = doc.find("body")
+    return body if body is not None else doc
@@ -0,0 +1,191 @@
+"""
+Content Fingerprints - SimHash 기반 크롤링 내용 변경 감지
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import re
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.content_fingerprint import ContentFingerprint
+from app.services.cache import content_hash
+
+SIMHASH_BITS = 64
+# 단어 n-gram 크기 (문장 일부만 바뀌면 일부 특징만 바뀌도록)
+SHINGLE_SIZE = 3
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# 출처 표시는 추출 방법이므로 내용 비교에서 제외
+IGNORED_FACT_FIELDS = {"sources"}
+# 문장으로 된 필드 (SimHash 로 비교, 나머지 구조화 필드는 정확히 비교)
+PROSE_FACT_FIELDS = ("description", "summary")
+
+
+def simhash(text: str) -> int:
+    """
+    64비트 SimHash
+
+    단어 SHINGLE_SIZE-gram 을 특징으로 쓰므로 광고 문구, 날짜 표시처럼
+    일부만 바뀐 문서는 몇 비트만 달라지고, 내용이 바뀐 문서는 많이 달라집니다.
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) > SHINGLE_SIZE:
+        features = [" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+    else:
+        features = [" ".join(tokens)] if tokens else []
+
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def fingerprint_facts(facts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    팩트 지문
+
+    날짜, 작품 목록 같은 구조화 필드는 하나만 바뀌어도 글에 반영해야 하므로
+    정규화한 값의 해시(`digest`)로 정확히 비교하고, 요약 문장만 SimHash 로
+    비교합니다.
+
+    Returns:
+        {"simhash": 문장 필드의 SimHash, "digest": 구조화 필드의 sha256}
+    """
+    structured = {
+        field: value for field, value in facts.items()
+        if field not in IGNORED_FACT_FIELDS and field not in PROSE_FACT_FIELDS
+    }
+    prose = "\n".join(facts[field] for field in PROSE_FACT_FIELDS if facts.get(field))
+    return {"simhash": simhash(prose), "digest": content_hash(structured)}
+
+
+def _to_signed(value: int) -> int:
+    """BIGINT 컬럼에 맞게 부호 있는 64비트 정수로 변환"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value & ((1 << SIMHASH_BITS) - 1)
+
+
+class FingerprintStore:
+    """
+    작가별, 출처 URL 별 SimHash 저장소
+
+    출처마다 마지막으로 "바뀌었다"고 판단해 게시한 내용의 지문을 기준으로
+    보관하므로, 구조화 필드가 바뀌거나 요약의 작은 변경이 여러 번 쌓여
+    기준에서 max_distance 비트보다 멀어지면 그때 변경으로 판단합니다. 같은 작가의 다른 출처 중 지문이
+    가까운 것이 있으면 `duplicate_of` 로 알려 주며, 처음 보는 출처라도
+    이미 본 내용의 미러라면 변경 없음으로 봅니다.
+    """
+
+    def __init__(self, session_factory: Callable = AsyncSessionLocal, max_distance: Optional[int] = None):
+        self.session_factory = session_factory
+        self.max_distance = settings.CONTENT_FINGERPRINT_MAX_DISTANCE if max_distance is None else max_distance
+
+    async def check(self, artist_key: str, pages: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        페이지 지문을 기준 지문과 비교 (저장소는 변경하지 않음)
+
+        페이지는 주어진 순서대로 비교하므로 같은 크롤링 안에서 앞선 페이지와
+        거의 같은 페이지도 `duplicate_of` 로 표시됩니다. 기준 지문은 글이
+        게시된 뒤 commit() 으로 갱신하므로, 이후 단계가 실패하면 다음 크롤링도
+        같은 변경을 다시 감지합니다.
+
+        Args:
+            artist_key: 작가 식별자
+            pages: [{"source_url", "simhash", "digest"}, ...] (fingerprint_facts 결과)
+
+        Returns:
+            페이지별 {"source_url", "fingerprint", "digest", "distance", "changed", "moved", "duplicate_of"}
+            (distance 는 같은 출처의 이전 지문과의 해밍 거리, 처음이면 None,
+            moved 는 기준 지문을 이 지문으로 바꿔야 하는지)
+        """
+        async with self.session_factory() as db:
+            rows = (await db.execute(
+                select(ContentFingerprint).filter(ContentFingerprint.artist_key == artist_key)
+            )).scalars().all()
+        known = {row.source_url: (_to_unsigned(row.simhash), row.digest) for row in rows}
+
+        results: List[Dict[str, Any]] = []
+        for page in pages:
+            url, fingerprint, digest = page["source_url"], page["simhash"], page["digest"]
+            previous = known.get(url)
+            distance = None
+            if previous is not None and previous[1] == digest:
+                distance = hamming(previous[0], fingerprint)
+            duplicate_of = self._nearest(fingerprint, digest, url, known)
+            moved = distance is None or distance > self.max_distance
+            if moved:
+                known[url] = (fingerprint, digest)
+
+            results.append({
+                "source_url": url,
+                "fingerprint": f"{fingerprint:016x}",
+                "digest": digest,
+                "distance": distance,
+                # 다른 출처에서 이미 본 내용이면 새 정보가 없으므로 변경 아님
+                "changed": moved and duplicate_of is None,
+                "moved": moved,
+                "duplicate_of": duplicate_of
+            })
+
+        return results
+
+    async def commit(self, artist_key: str, pages: Iterable[Dict[str, Any]]) -> None:
+        """
+        check() 결과로 기준 지문 갱신
+
+        `moved` 인 페이지는 지문을 이 내용으로 바꾸고, 나머지는 확인 시각만
+        갱신합니다. 글 작성과 편집이 끝난 뒤 호출해야 합니다.
+
+        Args:
+            artist_key: 작가 식별자
+            pages: [{"source_url", "fingerprint", "digest", "moved"}, ...]
+        """
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            for page in pages:
+                simhash_value = _to_signed(int(page["fingerprint"], 16))
+                values = {"checked_at": now}
+                if page["moved"]:
+                    values.update(simhash=simhash_value, digest=page["digest"], changed_at=now)
+                await db.execute(
+                    pg_insert(ContentFingerprint)
+                    .values(
+                        artist_key=artist_key,
+                        source_url=page["source_url"],
+                        simhash=simhash_value,
+                        digest=page["digest"],
+                        changed_at=now,
+                        checked_at=now
+                    )
+                    .on_conflict_do_update(index_elements=["artist_key", "source_url"], set_=values)
+                )
+            await db.commit()
+
+    def _nearest(self, fingerprint: int, digest: str, url: str, known: Dict[str, Tuple[int, str]]) -> Optional[str]:
+        """구조화 필드가 같은 다른 출처 중 max_distance 이내로 가장 가까운 URL"""
+        best: Optional[str] = None
+        best_distance = self.max_distance + 1
+        for other_url, (other, other_digest) in sorted(known.items()):
+            if other_url == url or other_digest != digest:
+                continue
+            distance = hamming(other, fingerprint)
+            if distance < best_distance:
+                best, best_distance = other_url, distance
+        return best
+
+
+# 글로벌 지문 저장소
+fingerprint_store = FingerprintStore()
@@ -0,0 +1,63 @@
+"""
+HTML Parser - HTML 파싱 프로세스 풀
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import multiprocessing
+import time
+
+from app.core.config import settings
+
+
+class HTMLParsePool:
+    """
+    HTML 파싱 프로세스 풀
+
+    큰 문서의 파싱은 CPU 를 오래 쓰므로 별도 프로세스에서 실행해
+    이벤트 루프가 다른 요청을 계속 처리하게 합니다. UTF-8 로 inline_max_bytes
+    이하인 작은 문서는 프로세스 간 전달 비용이 더 크므로 바로 파싱합니다.
+    풀은 첫 사용 시 spawn 방식으로 만들고 종료 시 close() 로 정리합니다.
+    파싱 함수는 pickle 가능한 모듈 최상위 함수(또는 그 functools.partial)여야 합니다.
+    """
+
+    def __init__(self, max_workers: int, inline_max_bytes: int):
+        self.max_workers = max_workers
+        self.inline_max_bytes = inline_max_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_settings(cls) -> "HTMLParsePool":
+        return cls(settings.CRAWLER_PARSE_WORKERS, settings.CRAWLER_PARSE_INLINE_MAX_BYTES)
+
+    async def run(self, func: Callable[[str], Dict[str, Any]], html: str) -> Tuple[Dict[str, Any], float]:
+        """
+        파싱 함수 실행
+
+        Returns:
+            (파싱 결과, 파싱 시간 ms)
+        """
+        started = time.perf_counter()
+        if self.max_workers <= 0 or len(html.encode("utf-8")) <= self.inline_max_bytes:
+            result = func(html)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool(), func, html)
+        return result, round((time.perf_counter() - started) * 1000, 2)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork 는 실행 중인 스레드(DB 드라이버, to_thread)를 복제하므로 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+
+# 글로벌 HTML 파싱 풀
+html_parse_pool = HTMLParsePool.from_settings()
@@ -0,0 +1,215 @@
+"""
+HTTP Cache - 조건부 GET(ETag/Last-Modified) 기반 응답 캐시
+"""
+from typing import Any, Dict, Iterable, Optional
+from email.utils import parsedate_to_datetime
+import hashlib
+import logging
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import decode_body, http_clients, stream_get
+from app.services.cache import CacheBackend, CompressedDiskCacheBackend, content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class ConditionalHTTPCache:
+    """
+    조건부 GET 응답 캐시
+
+    응답 본문을 ETag/Last-Modified 와 함께 저장하고, 다음 요청에서
+    `If-None-Match` / `If-Modified-Since` 로 재검증합니다. 서버가 304 를
+    돌려주면 본문을 다시 받지 않고 저장된 본문을 사용합니다.
+
+    `Cache-Control: max-age`(또는 `Expires`)로 신선한 항목은 요청 없이
+    사용하고, `no-store` 응답은 저장하지 않으며 `no-cache` 응답은 항상
+    재검증합니다. 검증자가 없는 서버라도 본문 해시가 같으면 변경 없음으로 봅니다.
+    저장소는 크기 한도를 넘으면 오래 사용하지 않은 항목부터 축출합니다.
+    본문은 스트리밍으로 max_bytes 까지만 받고, content_types 이외의 응답은 거절합니다.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        upstream: str = "crawler",
+        default_ttl: float = 0.0,
+        max_bytes: Optional[int] = None,
+        content_types: Optional[Iterable[str]] = None
+    ):
+        self.backend = backend
+        self.upstream = upstream
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.content_types = set(content_types) if content_types else None
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @classmethod
+    def from_settings(cls) -> "ConditionalHTTPCache":
+        backend = CompressedDiskCacheBackend(
+            settings.CRAWLER_HTTP_CACHE_DIR,
+            settings.CRAWLER_HTTP_CACHE_MAX_BYTES
+        )
+        return cls(
+            backend,
+            default_ttl=settings.CRAWLER_HTTP_CACHE_DEFAULT_TTL,
+            max_bytes=settings.CRAWLER_MAX_BYTES,
+            content_types=settings.CRAWLER_ALLOWED_CONTENT_TYPES
+        )
+
+    async def get(self, url: str) -> Dict[str, Any]:
+        """
+        URL 조회 (캐시 우선, 필요하면 재검증)
+
+        Returns:
+            {
+                "url": 최종 URL,
+                "status_code": 원본 응답 상태 코드,
+                "text": 본문,
+                "size": 받은 본문 크기(바이트),
+                "truncated": max_bytes 에서 잘렸는지,
+                "unchanged": 캐시에 저장된 이전 본문과 같은지 (URL 단위 전송 정보),
+                "cache": "fresh | revalidated | miss"
+            }
+        """
+        key = content_hash("http", url)
+        entry = await self._load(key)
+
+        if entry is not None and entry.get("fresh_until", 0) > time.time():
+            self.fresh_hits += 1
+            return self._result(entry, unchanged=True, cache="fresh")
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response, body, truncated = await stream_get(
+            http_clients.client(self.upstream),
+            url,
+            headers=headers,
+            max_bytes=self.max_bytes,
+            content_types=self.content_types
+        )
+
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            self.bytes_saved += entry.get("size", 0)
+            entry = {
+                **entry,
+                "etag": response.headers.get("etag") or entry.get("etag"),
+                "last_modified": response.headers.get("last-modified") or entry.get("last_modified"),
+                "fresh_until": self._fresh_until(response)
+            }
+            await self._store(key, entry, response)
+            return self._result(entry, unchanged=True, cache="revalidated")
+
+        response.raise_for_status()
+        self.misses += 1
+
+        text = decode_body(response, body)
+        digest = hashlib.sha256(body).hexdigest()
+        new_entry = {
+            "url": str(response.url),
+            "status_code": response.status_code,
+            "text": text,
+            "sha256": digest,
+            "size": len(body),
+            "truncated": truncated,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fresh_until": self._fresh_until(response)
+        }
+        await self._store(key, new_entry, response)
+
+        unchanged = entry is not None and entry.get("sha256") == digest
+        return self._result(new_entry, unchanged=unchanged, cache="miss")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.fresh_hits + self.revalidated + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": (self.fresh_hits + self.revalidated) / total if total else 0.0,
+            "bytes_saved": self.bytes_saved
+        }
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"HTTP cache lookup failed: {e}")
+            return None
+
+    async def _store(self, key: str, entry: Dict[str, Any], response: httpx.Response) -> None:
+        if "no-store" in _cache_control(response):
+            return
+        try:
+            await self.backend.set(key, entry, namespace=self.upstream)
+        except Exception as e:
+            logger.warning(f"HTTP cache store failed: {e}")
+
+    def _fresh_until(self, response: httpx.Response) -> float:
+        """Cache-Control/Expires 기준 신선도 만료 시각 (없으면 default_ttl)"""
+        now = time.time()
+        directives = _cache_control(response)
+        if "no-cache" in directives or "no-store" in directives:
+            return 0.0
+
+        try:
+            age = float(response.headers.get("age", 0))
+        except ValueError:
+            age = 0.0
+
+        if "max-age" in directives:
+            try:
+                return now + max(0.0, float(directives["max-age"]) - age)
+            except ValueError:
+                return 0.0
+
+        expires = response.headers.get("expires")
+        if expires:
+            try:
+                expires_at = parsedate_to_datetime(expires).timestamp()
+                date = response.headers.get("date")
+                server_now = parsedate_to_datetime(date).timestamp() if date else now
+            except (TypeError, ValueError):
+                # 잘못된 Expires 는 이미 만료된 것으로 취급
+                return 0.0
+            return now + max(0.0, expires_at - server_now)
+
+        return now + self.default_ttl if self.default_ttl else 0.0
+
+    def _result(self, entry: Dict[str, Any], unchanged: bool, cache: str) -> Dict[str, Any]:
+        return {
+            "url": entry["url"],
+            "status_code": entry["status_code"],
+            "text": entry["text"],
+            "size": entry.get("size", 0),
+            "truncated": entry.get("truncated", False),
+            "unchanged": unchanged,
+            "cache": cache
+        }
+
+
+def _cache_control(response: httpx.Response) -> Dict[str, str]:
+    """Cache-Control 헤더를 지시어 사전으로 변환 (값 없는 지시어는 빈 문자열)"""
+    directives: Dict[str, str] = {}
+    for part in response.headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+    return directives
+
+
+# 글로벌 크롤러 HTTP 캐시
+crawler_http_cache = ConditionalHTTPCache.from_settings()
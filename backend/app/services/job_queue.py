@@ -0,0 +1,230 @@
+"""
+Job Queue - AgentJob 테이블 기반 워크플로우 작업 큐
+"""
+from typing import Dict, Any, List, Optional, Sequence
+from uuid import UUID
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, func, or_, Integer
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.agent_job import AgentJob
+
+WORKFLOW_JOB_TYPE = "workflow"
+
+
+async def enqueue_workflow(
+    db: AsyncSession,
+    workflow: List[Dict[str, Any]],
+    context: Optional[Dict[str, Any]] = None,
+    max_parallel: Optional[int] = None,
+    use_cache: Optional[bool] = None,
+    parent_id: Optional[UUID] = None
+) -> AgentJob:
+    """워크플로우를 pending 상태의 AgentJob으로 등록"""
+    job = AgentJob(
+        job_type=WORKFLOW_JOB_TYPE,
+        status="pending",
+        parent_id=parent_id,
+        input_data={
+            "workflow": workflow,
+            "context": context or {},
+            "max_parallel": max_parallel,
+            "use_cache": use_cache
+        }
+    )
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def claim_jobs(db: AsyncSession, worker_id: str, limit: int) -> List[AgentJob]:
+    """
+    대기 중인 워크플로우 작업 선점
+
+    `SELECT ... FOR UPDATE SKIP LOCKED` 로 다른 워커가 잡고 있는 행은
+    건너뛰므로 여러 노드의 워커가 같은 큐를 안전하게 나눠 가집니다.
+    배치에 속한 작업은 배치의 max_concurrency 를 넘지 않도록 선점합니다.
+    """
+    batch = aliased(AgentJob)
+    sibling = aliased(AgentJob)
+    running_siblings = (
+        select(func.count())
+        .select_from(sibling)
+        .filter(sibling.parent_id == AgentJob.parent_id, sibling.status == "running")
+        .scalar_subquery()
+    )
+    batch_cap = (
+        select(batch.input_data["max_concurrency"].astext.cast(Integer))
+        .filter(batch.id == AgentJob.parent_id)
+        .scalar_subquery()
+    )
+
+    result = await db.execute(
+        select(AgentJob)
+        .filter(
+            AgentJob.status == "pending",
+            AgentJob.job_type == WORKFLOW_JOB_TYPE,
+            or_(
+                AgentJob.parent_id.is_(None),
+                batch_cap.is_(None),
+                running_siblings < batch_cap
+            )
+        )
+        .order_by(AgentJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=AgentJob)
+    )
+    candidates = list(result.scalars().all())
+
+    # 같은 배치의 작업을 한 번에 여러 개 선점하는 경우를 위한 정확한 한도 적용
+    parent_ids = sorted({job.parent_id for job in candidates if job.parent_id})
+    headroom = await _batch_headroom(db, parent_ids) if parent_ids else {}
+
+    jobs = []
+    for job in candidates:
+        if job.parent_id in headroom:
+            if headroom[job.parent_id] <= 0:
+                continue
+            headroom[job.parent_id] -= 1
+        jobs.append(job)
+
+    now = datetime.utcnow()
+    for job in jobs:
+        job.status = "running"
+        job.worker_id = worker_id
+        job.started_at = now
+        job.heartbeat_at = now
+
+    await db.commit()
+    return jobs
+
+
+async def _batch_headroom(db: AsyncSession, batch_ids: List[UUID]) -> Dict[UUID, int]:
+    """
+    배치별로 추가로 시작할 수 있는 워크플로우 수
+
+    배치 행을 FOR UPDATE 로 잠가 여러 워커의 동시 선점을 직렬화하므로
+    max_concurrency 가 워커 수와 관계없이 지켜집니다. 한도가 없는 배치는
+    결과에 포함되지 않습니다.
+    """
+    result = await db.execute(
+        select(AgentJob.id, AgentJob.input_data)
+        .filter(AgentJob.id.in_(batch_ids))
+        .order_by(AgentJob.id)
+        .with_for_update()
+    )
+    caps = {
+        row.id: int(row.input_data["max_concurrency"])
+        for row in result.all()
+        if row.input_data and row.input_data.get("max_concurrency")
+    }
+    if not caps:
+        return {}
+
+    result = await db.execute(
+        select(AgentJob.parent_id, func.count())
+        .filter(AgentJob.parent_id.in_(list(caps)), AgentJob.status == "running")
+        .group_by(AgentJob.parent_id)
+    )
+    running = dict(result.all())
+
+    return {batch_id: cap - running.get(batch_id, 0) for batch_id, cap in caps.items()}
+
+
+async def heartbeat(db: AsyncSession, worker_id: str, job_ids: List[UUID]) -> None:
+    """실행 중인 작업의 heartbeat 갱신"""
+    if not job_ids:
+        return
+
+    await db.execute(
+        update(AgentJob)
+        .filter(AgentJob.id.in_(job_ids), AgentJob.worker_id == worker_id)
+        .values(heartbeat_at=datetime.utcnow())
+    )
+    await db.commit()
+
+
+async def requeue_stale_jobs(db: AsyncSession, timeout: float) -> int:
+    """
+    heartbeat가 끊긴 워커의 작업을 다시 pending으로 되돌림
+
+    죽은 워커가 실행하던 단계 작업은 같은 트랜잭션에서 failed 로 표시합니다.
+    재실행 시 체크포인트가 없는 단계는 새 행으로 다시 실행되므로, 남겨 두면
+    실행 중인 단계처럼 보이는 행이 계속 남습니다.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=timeout)
+    result = await db.execute(
+        update(AgentJob)
+        .filter(
+            AgentJob.status == "running",
+            AgentJob.job_type == WORKFLOW_JOB_TYPE,
+            AgentJob.heartbeat_at < cutoff
+        )
+        .values(status="pending", worker_id=None, heartbeat_at=None)
+        .returning(AgentJob.id)
+    )
+    workflow_ids = list(result.scalars().all())
+
+    if workflow_ids:
+        await db.execute(
+            update(AgentJob)
+            .filter(
+                AgentJob.parent_id.in_(workflow_ids),
+                AgentJob.job_type != WORKFLOW_JOB_TYPE,
+                AgentJob.status == "running"
+            )
+            .values(
+                status="failed",
+                error_message="Interrupted: worker stopped sending heartbeats",
+                partial_output=None,
+                completed_at=now
+            )
+        )
+    await db.commit()
+    return len(workflow_ids)
+
+
+async def reset_job(
+    db: AsyncSession,
+    job_id: UUID,
+    status: str,
+    from_statuses: Sequence[str] = ("failed",)
+) -> bool:
+    """
+    재개할 워크플로우 작업을 pending(큐 재등록) 또는 running(즉시 실행) 상태로 되돌림
+
+    상태 확인과 변경을 조건부 UPDATE 한 번으로 처리하므로, 같은 작업에 대한
+    동시 재개 요청 중 하나만 성공합니다.
+
+    Returns:
+        작업이 from_statuses 중 하나여서 상태를 바꿨으면 True
+    """
+    result = await db.execute(
+        update(AgentJob)
+        .filter(AgentJob.id == job_id, AgentJob.status.in_(from_statuses))
+        .values(
+            status=status,
+            worker_id=None,
+            heartbeat_at=None,
+            error_message=None,
+            started_at=datetime.utcnow() if status == "running" else None,
+            completed_at=None
+        )
+        .returning(AgentJob.id)
+    )
+    reset = result.scalar_one_or_none() is not None
+    await db.commit()
+    return reset
+
+
+async def fail_job(db: AsyncSession, job_id: UUID, error: str) -> None:
+    """워크플로우 실행 자체가 실패한 경우 기록"""
+    await db.execute(
+        update(AgentJob)
+        .filter(AgentJob.id == job_id)
+        .values(status="failed", error_message=error, completed_at=datetime.utcnow())
+    )
+    await db.commit()
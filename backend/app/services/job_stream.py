@@ -0,0 +1,271 @@
+"""
+Job Stream - 실행 중인 작업의 부분 출력(초안) 공유
+"""
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.agent_job import AgentJob
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("success", "failed")
+# 변화가 없을 때 연결 유지용 이벤트를 보내는 간격(초)
+PING_INTERVAL = 15.0
+
+# 오케스트레이터가 에이전트를 호출하는 동안의 작업 ID
+current_job_id: ContextVar[Optional[UUID]] = ContextVar("current_job_id", default=None)
+
+
+class JobDraft:
+    """
+    작업 하나의 스트리밍 초안
+
+    생성 중인 텍스트 조각을 한 곳에만 모아 두고, 같은 프로세스의 구독자에게
+    바로 전달하며, agent_jobs.partial_output 에는 flush_interval 마다 한 번씩만
+    기록합니다. 완료 시 최종 본문은 이 조각들을 한 번 이어 붙여 만듭니다.
+    """
+
+    def __init__(self, hub: "JobStreamHub", job_id: UUID):
+        self.hub = hub
+        self.job_id = job_id
+        self._parts: List[str] = []
+        self._subscribers: List[asyncio.Queue] = []
+        self._flushed_at = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def append(self, delta: str) -> None:
+        if not delta:
+            return
+        self._parts.append(delta)
+        self._publish(("delta", delta))
+
+        if time.monotonic() - self._flushed_at >= self.hub.flush_interval and self._flush_task is None:
+            self._flushed_at = time.monotonic()
+            self._flush_task = asyncio.create_task(self._flush())
+
+    def reset(self) -> None:
+        """재시도 등으로 처음부터 다시 생성할 때 지금까지의 초안 폐기"""
+        self._parts = []
+        self._publish(("reset", ""))
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    async def close(self) -> None:
+        """구독 종료 (최종 본문은 작업 출력에 기록되므로 partial_output 은 비움)"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.hub._write(self.job_id, None)
+        self._publish(None)
+        self.hub._drafts.pop(self.job_id, None)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        # 구독 시점까지의 초안을 먼저 전달
+        queue.put_nowait(("snapshot", self.text()))
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _publish(self, event: Optional[Tuple[str, str]]) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    async def _flush(self) -> None:
+        try:
+            await self.hub._write(self.job_id, self.text())
+        finally:
+            self._flush_task = None
+
+
+class JobStreamHub:
+    """
+    작업별 스트리밍 초안 관리
+
+    같은 프로세스에서 실행 중인 작업은 `subscribe` 로 조각 단위 이벤트를
+    받을 수 있고, 다른 프로세스(워커)에서 실행 중인 작업은
+    agent_jobs.partial_output 을 조회해 따라갈 수 있습니다.
+    """
+
+    def __init__(self, session_factory: Callable = AsyncSessionLocal, flush_interval: float = 1.0):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._drafts: Dict[UUID, JobDraft] = {}
+
+    @classmethod
+    def from_settings(cls) -> "JobStreamHub":
+        return cls(flush_interval=settings.WRITER_STREAM_FLUSH_INTERVAL)
+
+    def open(self, job_id: UUID) -> JobDraft:
+        """작업의 초안 열기 (재시도로 다시 열면 기존 초안을 비우고 이어서 사용)"""
+        draft = self._drafts.get(job_id)
+        if draft is not None and not draft.closed:
+            draft.reset()
+            return draft
+        draft = JobDraft(self, job_id)
+        self._drafts[job_id] = draft
+        return draft
+
+    async def subscribe(self, job_id: UUID) -> AsyncIterator[Tuple[str, str]]:
+        """
+        같은 프로세스에서 실행 중인 작업의 초안 이벤트
+
+        ("snapshot", 지금까지의 초안), ("delta", 추가된 조각), ("reset", "") 를
+        초안이 닫힐 때까지 전달합니다. 실행 중인 초안이 없으면 바로 끝납니다.
+        """
+        draft = self._drafts.get(job_id)
+        if draft is None or draft.closed:
+            return
+        queue = draft.subscribe()
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            draft.unsubscribe(queue)
+
+    async def follow(
+        self,
+        job_id: UUID,
+        step: Optional[str] = None,
+        poll_interval: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        작업이 끝날 때까지 초안 이벤트 전달 (SSE 용)
+
+        같은 프로세스에서 실행 중이면 조각 단위로 바로 전달하고, 아니면
+        partial_output 을 poll_interval 마다 조회해 늘어난 부분만 전달합니다.
+        step 을 주면 job_id 워크플로우의 해당 단계 작업을 따라갑니다.
+
+        Yields:
+            ("snapshot", 초안 전체) - 초안을 이 값으로 교체 (처음, 재시도 시)
+            ("delta", 추가된 조각)
+            ("ping", None) - 변화 없이 PING_INTERVAL 이 지남
+            ("done", {"job_id", "status", "output", "error"})
+        """
+        poll_interval = poll_interval or settings.WRITER_STREAM_POLL_INTERVAL
+        if step is not None:
+            step_job_id = None
+            async for kind, value in self._wait_for_step(job_id, step, poll_interval):
+                if kind == "ping":
+                    yield kind, value
+                else:
+                    step_job_id = value
+            if step_job_id is None:
+                yield "done", {"job_id": None, "status": "failed", "output": None, "error": f"Step '{step}' did not run"}
+                return
+            job_id = step_job_id
+
+        sent = 0  # 전달한 초안 길이
+        idle_since = time.monotonic()
+        while True:
+            draft = self._drafts.get(job_id)
+            if draft is not None and not draft.closed:
+                async for kind, text in self.subscribe(job_id):
+                    if kind == "delta":
+                        sent += len(text)
+                        yield "delta", text
+                    else:
+                        sent = len(text)
+                        yield "snapshot", text
+                idle_since = time.monotonic()
+
+            async with self.session_factory() as db:
+                row = (await db.execute(
+                    select(AgentJob.status, AgentJob.partial_output, AgentJob.output_data, AgentJob.error_message)
+                    .filter(AgentJob.id == job_id)
+                )).one_or_none()
+            if row is None:
+                yield "done", {"job_id": str(job_id), "status": "missing", "output": None, "error": "Agent job not found"}
+                return
+
+            partial = row.partial_output or ""
+            if len(partial) > sent:
+                yield "delta", partial[sent:]
+                sent = len(partial)
+                idle_since = time.monotonic()
+            elif partial and len(partial) < sent:
+                # 다른 프로세스에서 재시도로 처음부터 다시 생성 중
+                yield "snapshot", partial
+                sent = len(partial)
+
+            if row.status in FINISHED_STATUSES:
+                yield "done", {
+                    "job_id": str(job_id),
+                    "status": row.status,
+                    "output": row.output_data,
+                    "error": row.error_message
+                }
+                return
+
+            if time.monotonic() - idle_since >= PING_INTERVAL:
+                idle_since = time.monotonic()
+                yield "ping", None
+            await asyncio.sleep(poll_interval)
+
+    async def _wait_for_step(
+        self,
+        workflow_id: UUID,
+        step: str,
+        poll_interval: float
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        워크플로우 단계 작업이 생길 때까지 대기
+
+        기다리는 동안 PING_INTERVAL 마다 ("ping", None) 을, 끝나면 ("step", 단계 작업 ID)
+        (워크플로우가 먼저 끝나면 ("step", None)) 을 전달합니다.
+        """
+        idle_since = time.monotonic()
+        while True:
+            async with self.session_factory() as db:
+                child = (await db.execute(
+                    select(AgentJob.id)
+                    .filter(AgentJob.parent_id == workflow_id, AgentJob.step_name == step)
+                    .order_by(AgentJob.created_at.desc())
+                    .limit(1)
+                )).scalar_one_or_none()
+                status = None if child is not None else (await db.execute(
+                    select(AgentJob.status).filter(AgentJob.id == workflow_id)
+                )).scalar_one_or_none()
+            if child is not None or status is None or status in FINISHED_STATUSES:
+                yield "step", child
+                return
+
+            if time.monotonic() - idle_since >= PING_INTERVAL:
+                idle_since = time.monotonic()
+                yield "ping", None
+            await asyncio.sleep(poll_interval)
+
+    async def _write(self, job_id: UUID, text: Optional[str]) -> None:
+        """partial_output 기록 (실패해도 생성에는 영향 없음)"""
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(AgentJob)
+                    .filter(AgentJob.id == job_id, AgentJob.status == "running")
+                    .values(partial_output=text)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record partial output for job {job_id}: {e}")
+
+
+# 글로벌 작업 스트림 허브
+job_streams = JobStreamHub.from_settings()
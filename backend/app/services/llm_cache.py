@@ -0,0 +1,229 @@
+"""
+LLM Response Cache - 같은 생성 요청의 응답 재사용
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.cache import CacheBackend, SingleFlight, content_hash, create_backend
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_NAMESPACE = "llm"
+LLM_CACHE_MODES = ("off", "read_write", "replay")
+
+
+class TextSink(Protocol):
+    """스트리밍 조각을 받는 대상"""
+
+    def append(self, delta: str) -> None: ...
+
+    def text(self) -> str: ...
+
+
+class LLMCacheMissError(LookupError):
+    """replay 모드에서 캐시에 없는 요청 (재시도해도 결과가 같으므로 재시도 대상 아님)"""
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시
+
+    키는 (모델, 생성 파라미터, 메시지 정규화 해시)이므로 재시도, 재실행,
+    배치의 중복 항목처럼 프롬프트가 같은 요청은 API 를 한 번만 호출하고,
+    동시에 들어온 같은 요청도 하나로 합쳐집니다. 응답은 사용량(토큰)과
+    함께 저장해 적중 시 절약한 토큰과 비용을 집계합니다.
+
+    - off: 항상 API 호출
+    - read_write: 캐시 조회 후 없으면 호출해 저장
+    - replay: 캐시만 사용하고 없으면 LLMCacheMissError (결정적 재실행용)
+
+    백엔드 오류는 미적중으로 처리하므로 캐시 장애가 생성 자체를 막지 않습니다.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend],
+        mode: str = "read_write",
+        ttl: Optional[int] = None,
+        prices: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        if backend is None and mode != "off":
+            raise ValueError(f"LLM cache mode '{mode}' requires a backend")
+        self.backend = backend
+        self.mode = mode
+        self.ttl = ttl
+        self.prices = prices or {}
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+        self.saved_usd = 0.0
+
+    @classmethod
+    def from_settings(cls, session_factory: Optional[Callable] = None) -> "LLMResponseCache":
+        if settings.LLM_CACHE_MODE == "off":
+            return cls(None, mode="off", prices=settings.LLM_PRICES)
+        backend = create_backend(
+            settings.LLM_CACHE_BACKEND,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            directory=settings.LLM_CACHE_DIR,
+            session_factory=session_factory or AsyncSessionLocal,
+            scope=LLM_CACHE_NAMESPACE
+        )
+        return cls(backend, mode=settings.LLM_CACHE_MODE, ttl=settings.LLM_CACHE_TTL, prices=settings.LLM_PRICES)
+
+    def key(self, model: str, params: Dict[str, Any], messages: List[Dict[str, Any]]) -> str:
+        return content_hash(LLM_CACHE_NAMESPACE, model, params, messages)
+
+    async def complete(
+        self,
+        create: Callable[..., Awaitable[Any]],
+        model: str,
+        messages: List[Dict[str, Any]],
+        sink: Optional[TextSink] = None,
+        **params: Any
+    ) -> Dict[str, Any]:
+        """
+        채팅 완성 요청 (캐시 경유)
+
+        sink 가 있으면 스트리밍으로 요청해 받은 조각을 바로 sink 에 추가하고,
+        최종 본문은 sink 에 모인 텍스트를 사용합니다 (캐시 적중 시에는 전체
+        본문을 한 번에 추가). 스트리밍 여부는 캐시 키에 포함되지 않습니다.
+
+        Args:
+            create: `client.chat.completions.create`
+            model: 모델 이름
+            messages: 메시지 목록
+            sink: 생성 중인 텍스트를 받을 대상 (append/text, 예: JobDraft)
+            **params: temperature, max_tokens 등 생성 파라미터 (키에 포함)
+
+        Returns:
+            {"content", "finish_reason", "usage": {"prompt_tokens", "completion_tokens"},
+             "model", "cached"}
+        """
+        if self.mode == "off":
+            return {**await _call(create, model, messages, params, sink), "cached": False}
+
+        key = self.key(model, params, messages)
+        entry = await self._get(key)
+        if entry is not None:
+            self._record_hit(model, entry)
+            return _replayed(entry, sink)
+
+        if self.mode == "replay":
+            self.misses += 1
+            raise LLMCacheMissError(f"No cached response for {model} request {key[:12]} in replay mode")
+
+        async def call() -> Dict[str, Any]:
+            self.misses += 1
+            entry = await _call(create, model, messages, params, sink)
+            await self._set(key, entry)
+            return entry
+
+        # 같은 요청이 이미 실행 중이면 그 응답을 공유
+        entry, shared = await self._flights.run(key, call)
+        if shared:
+            self._record_hit(model, entry)
+            return _replayed(entry, sink)
+        return {**entry, "cached": False}
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_prompt_tokens": self.saved_prompt_tokens,
+            "saved_completion_tokens": self.saved_completion_tokens,
+            "saved_usd": round(self.saved_usd, 4)
+        }
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+
+    async def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        try:
+            await self.backend.set(key, entry, ttl=self.ttl, namespace=LLM_CACHE_NAMESPACE)
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+
+    def _record_hit(self, model: str, entry: Dict[str, Any]) -> None:
+        usage = entry.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        price = self.prices.get(model, {})
+
+        self.hits += 1
+        self.saved_prompt_tokens += prompt_tokens
+        self.saved_completion_tokens += completion_tokens
+        self.saved_usd += (
+            prompt_tokens * price.get("prompt", 0.0) + completion_tokens * price.get("completion", 0.0)
+        ) / 1_000_000
+
+
+async def _call(
+    create: Callable[..., Awaitable[Any]],
+    model: str,
+    messages: List[Dict[str, Any]],
+    params: Dict[str, Any],
+    sink: Optional[TextSink] = None
+) -> Dict[str, Any]:
+    """API 호출 후 응답에서 캐시할 값만 추출 (sink 가 있으면 스트리밍)"""
+    if sink is None:
+        response = await create(model=model, messages=messages, **params)
+        choice = response.choices[0]
+        return _entry(choice.message.content, choice.finish_reason, response.usage, response.model)
+
+    stream = await create(
+        model=model,
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
+        **params
+    )
+    finish_reason, usage, response_model = None, None, model
+    async for chunk in stream:
+        response_model = chunk.model or response_model
+        if chunk.usage is not None:
+            usage = chunk.usage
+        for choice in chunk.choices:
+            if choice.delta.content:
+                sink.append(choice.delta.content)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+    # 조각은 sink 에만 모으고 최종 본문은 한 번만 이어 붙임
+    return _entry(sink.text(), finish_reason, usage, response_model)
+
+
+def _entry(content: Optional[str], finish_reason: Optional[str], usage: Any, model: str) -> Dict[str, Any]:
+    return {
+        "content": content,
+        "finish_reason": finish_reason,
+        "usage": {
+            "prompt_tokens": usage.prompt_tokens if usage else 0,
+            "completion_tokens": usage.completion_tokens if usage else 0
+        },
+        "model": model
+    }
+
+
+def _replayed(entry: Dict[str, Any], sink: Optional[TextSink]) -> Dict[str, Any]:
+    """저장된 응답 반환 (sink 에는 전체 본문을 한 번에 전달)"""
+    if sink is not None and entry.get("content"):
+        sink.append(entry["content"])
+    return {**entry, "cached": True}
+
+
+# 글로벌 LLM 응답 캐시
+llm_cache = LLMResponseCache.from_settings()
@@ -0,0 +1,593 @@
+"""
+MediaWiki Session - 로그인 상태를 유지하는 MediaWiki API 클라이언트
+"""
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Set, Union
+import asyncio
+import hashlib
+import logging
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import http_clients
+
+logger = logging.getLogger(__name__)
+
+# 세션/토큰을 갱신한 뒤 한 번 더 시도할 오류 코드
+BADTOKEN_CODES = {"badtoken"}
+SESSION_LOST_CODES = {"assertuserfailed", "assertbotfailed", "notloggedin"}
+
+# 쓰기 스케줄러가 동시성을 줄이고 잠시 멈출 오류 코드 (DB 복제 지연, 편집 속도 제한)
+THROTTLE_CODES = {"maxlag", "ratelimited"}
+
+# 다중 값 파라미터 한도 (apihighlimits 권한이 있으면 500)
+READ_CHUNK_SIZE = 50
+READ_CHUNK_SIZE_HIGH = 500
+
+
+class MediaWikiAPIError(Exception):
+    """MediaWiki API 오류 응답"""
+
+    def __init__(self, error: Dict[str, Any], retry_after: Optional[float] = None):
+        super().__init__(f"MediaWiki API error: {error}")
+        self.error = error
+        self.code = error.get("code")
+        self.retry_after = retry_after
+
+
+class EditConflictError(MediaWikiAPIError):
+    """
+    조회 이후 다른 편집/생성/삭제가 있어 저장하지 못한 편집
+
+    재시도해도 같은 기준 리비전으로는 성공할 수 없으므로 재시도 대상이 아니며,
+    단계를 실패시켜 워크플로우를 재개(리비전 재조회 후 편집)하도록 합니다.
+    """
+
+    message_prefix = "Edit conflict"
+
+    def __init__(self, page_title: str, error: Dict[str, Any]):
+        super().__init__(error)
+        self.page_title = page_title
+        self.args = (f"{self.message_prefix} on {page_title}: {self.code}",)
+
+
+class MediaWikiWriteScheduler:
+    """
+    MediaWiki 쓰기 요청 스케줄러 (AIMD 동시성 제어)
+
+    모든 쓰기 요청에 `maxlag` 를 보내고, 동시에 보낼 수 있는 요청 수를
+    관측한 상태에 따라 조정합니다.
+
+    - 응답이 target_latency 안에 오면 동시성을 천천히 늘림 (요청당 +1/limit)
+    - 응답이 느리면 동시성을 조금 줄임 (x0.8)
+    - `maxlag`/`ratelimited` 오류면 동시성을 절반으로 줄이고 Retry-After
+      동안 모든 쓰기를 멈춘 뒤 같은 요청을 다시 보냄 (최대 max_retries 회)
+
+    이렇게 위키가 감당할 수 있는 최대 처리량 근처에서 편집하면서
+    복제 지연이 커지면 즉시 물러납니다.
+    """
+
+    def __init__(
+        self,
+        initial: float = 2.0,
+        minimum: float = 1.0,
+        maximum: float = 8.0,
+        target_latency: float = 2.0,
+        max_retries: int = 5,
+        default_pause: float = 5.0
+    ):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.default_pause = default_pause
+
+        self.in_flight = 0
+        self.waiting = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+        self._completed: Deque[float] = deque()
+
+        self.completed = 0
+        self.throttled = 0
+        self.last_lag: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "MediaWikiWriteScheduler":
+        return cls(
+            initial=settings.MEDIAWIKI_WRITE_INITIAL_CONCURRENCY,
+            minimum=settings.MEDIAWIKI_WRITE_MIN_CONCURRENCY,
+            maximum=settings.MEDIAWIKI_WRITE_MAX_CONCURRENCY,
+            target_latency=settings.MEDIAWIKI_WRITE_TARGET_LATENCY,
+            max_retries=settings.MEDIAWIKI_WRITE_MAX_RETRIES
+        )
+
+    async def run(self, send: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """동시성 한도와 일시 정지를 지키며 쓰기 요청 실행"""
+        for attempt in range(self.max_retries + 1):
+            await self._acquire()
+            started = time.monotonic()
+            try:
+                result = await send()
+                self._on_success(time.monotonic() - started)
+                return result
+            except MediaWikiAPIError as e:
+                if e.code not in THROTTLE_CODES:
+                    raise
+                self._on_throttle(e)
+                if attempt == self.max_retries:
+                    raise
+            finally:
+                # 한도 조정 후 반납해야 늘어난 한도만큼 대기 중인 요청이 깨어남
+                await self._release()
+
+        raise RuntimeError("unreachable")
+
+    def rate(self, window: float = 60.0) -> float:
+        """최근 window 초 동안의 초당 완료 수"""
+        self._trim(time.monotonic() - window)
+        return len(self._completed) / window
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "backlog": self.waiting,
+            "edits_per_minute": round(self.rate() * 60, 1),
+            "paused_for": max(0.0, round(self._paused_until - time.monotonic(), 1)),
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "last_lag": self.last_lag
+        }
+
+    async def _acquire(self) -> None:
+        self.waiting += 1
+        try:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                async with self._condition:
+                    if self.in_flight < max(1, int(self.limit)):
+                        self.in_flight += 1
+                        return
+                    await self._condition.wait()
+        finally:
+            self.waiting -= 1
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        self.completed += 1
+        self._completed.append(time.monotonic())
+        if latency > self.target_latency:
+            self.limit = max(self.minimum, self.limit * 0.8)
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def _on_throttle(self, error: MediaWikiAPIError) -> None:
+        self.throttled += 1
+        lag = error.error.get("lag")
+        self.last_lag = float(lag) if isinstance(lag, (int, float)) else self.last_lag
+
+        # 같은 지연 구간에 동시에 실패한 요청들은 한 번만 감소
+        now = time.monotonic()
+        if now >= self._paused_until:
+            self.limit = max(self.minimum, self.limit / 2)
+
+        pause = error.retry_after if error.retry_after is not None else self.default_pause
+        self._paused_until = max(self._paused_until, now + pause)
+        logger.warning(
+            f"MediaWiki write throttled ({error.code}, lag={lag}), "
+            f"pausing {pause:.1f}s, concurrency limit {self.limit:.2f}"
+        )
+
+    def _trim(self, since: float) -> None:
+        while self._completed and self._completed[0] < since:
+            self._completed.popleft()
+
+
+class MediaWikiSession:
+    """
+    MediaWiki API 세션
+
+    봇 비밀번호(`Username@BotName`)로 한 번 로그인하거나 OAuth 2.0 액세스
+    토큰을 사용하고, 로그인 쿠키는 MediaWiki 전용 공유 HTTP 클라이언트의
+    쿠키 저장소에 유지합니다. CSRF 토큰은 처음 쓰기 전에 한 번 받아 두고
+    `badtoken` 이면 토큰만, `assertuserfailed` 이면 로그인부터 다시 한 뒤
+    요청을 한 번 재시도합니다. 따라서 정상 상태의 편집은 HTTP 요청 1회입니다.
+
+    로그인/토큰 갱신은 잠금으로 직렬화되어 여러 워크플로우가 동시에
+    공유해도 갱신은 한 번만 일어납니다.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        username: str = "",
+        password: str = "",
+        oauth_token: str = "",
+        upstream: str = "mediawiki"
+    ):
+        self.api_url = api_url
+        self.username = username
+        self.password = password
+        self.oauth_token = oauth_token
+        self.upstream = upstream
+        self.csrf_token: Optional[str] = None
+        self._logged_in = False
+        self._lock = asyncio.Lock()
+        self._high_limits: Optional[bool] = None
+        self.writes = MediaWikiWriteScheduler.from_settings()
+        self.logins = 0
+        self.token_refreshes = 0
+
+    @classmethod
+    def from_settings(cls) -> "MediaWikiSession":
+        return cls(
+            settings.MEDIAWIKI_API_URL,
+            username=settings.MEDIAWIKI_BOT_USERNAME,
+            password=settings.MEDIAWIKI_BOT_PASSWORD,
+            oauth_token=settings.MEDIAWIKI_OAUTH_TOKEN
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return http_clients.client(self.upstream)
+
+    async def get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """읽기 요청 (로그인 세션으로 조회, 오류 시 MediaWikiAPIError)"""
+        await self._ensure_login()
+        return await self._request("GET", params)
+
+    async def post(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        쓰기 요청 (CSRF 토큰, assert=user, maxlag 자동 추가)
+
+        쓰기 스케줄러를 거쳐 전송되며, 토큰 만료나 세션 유실로 실패하면
+        갱신 후 한 번 재시도합니다.
+        """
+        return await self.writes.run(lambda: self._post(data))
+
+    async def _post(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        token = await self._ensure_token()
+        try:
+            return await self._request("POST", self._write_params(data, token))
+        except MediaWikiAPIError as e:
+            if e.code in BADTOKEN_CODES:
+                token = await self._refresh(token, relogin=False)
+            elif e.code in SESSION_LOST_CODES:
+                token = await self._refresh(token, relogin=True)
+            else:
+                raise
+            logger.info(f"Retrying MediaWiki {data.get('action')} after {e.code}")
+            return await self._request("POST", self._write_params(data, token))
+
+    async def read_pages(
+        self,
+        titles: Optional[Sequence[str]] = None,
+        pageids: Optional[Sequence[int]] = None,
+        max_concurrency: Optional[int] = None,
+        content: bool = True
+    ) -> Dict[Union[str, int], Dict[str, Any]]:
+        """
+        여러 페이지의 최신 리비전 위키텍스트와 메타데이터 일괄 조회
+
+        `action=parse` 로 한 페이지씩 렌더링하지 않고 `prop=revisions` 로
+        50개(봇 권한이 있으면 500개)씩 묶어 조회하며, 묶음들은
+        max_concurrency 개까지 동시에 요청합니다. 응답이 잘리면
+        continue 값을 따라 나머지를 받아옵니다.
+
+        Args:
+            titles: 페이지 제목 목록
+            pageids: 페이지 ID 목록 (titles 와 함께 쓸 수 없음)
+            max_concurrency: 동시 요청 수 (기본값: MEDIAWIKI_READ_CONCURRENCY)
+            content: 위키텍스트 포함 여부 (False 면 리비전 메타데이터만)
+
+        Returns:
+            요청한 제목(또는 ID)별 페이지 정보. 없는 페이지는 exists=False
+        """
+        if titles is not None and pageids is not None:
+            raise ValueError("Pass either titles or pageids, not both")
+
+        key = "titles" if titles is not None else "pageids"
+        values = list(dict.fromkeys(titles if titles is not None else pageids or []))
+        if not values:
+            return {}
+
+        await self._ensure_login()
+        chunk_size = READ_CHUNK_SIZE_HIGH if await self._has_high_limits() else READ_CHUNK_SIZE
+        semaphore = asyncio.Semaphore(max_concurrency or settings.MEDIAWIKI_READ_CONCURRENCY)
+
+        async def read_chunk(chunk: List[Any]) -> Dict[Union[str, int], Dict[str, Any]]:
+            async with semaphore:
+                return await self._read_chunk(key, chunk, content)
+
+        pages: Dict[Union[str, int], Dict[str, Any]] = {}
+        for result in await asyncio.gather(*(
+            read_chunk(values[i:i + chunk_size]) for i in range(0, len(values), chunk_size)
+        )):
+            pages.update(result)
+        return pages
+
+    async def _read_chunk(
+        self,
+        key: str,
+        chunk: List[Any],
+        content: bool = True
+    ) -> Dict[Union[str, int], Dict[str, Any]]:
+        """한 묶음 조회 (continue 를 따라 모든 리비전 수집)"""
+        params: Dict[str, Any] = {
+            "action": "query",
+            "prop": "revisions",
+            "rvprop": "ids|timestamp|sha1|size|content" if content else "ids|timestamp|sha1|size",
+            "rvslots": "main",
+            "curtimestamp": "1",
+            "formatversion": "2",
+            key: "|".join(str(value) for value in chunk)
+        }
+        by_id: Dict[Any, Dict[str, Any]] = {}
+        normalized: Dict[str, str] = {}
+        start_timestamp = None
+
+        while True:
+            result = await self._request("GET", params)
+            # 편집 시 starttimestamp 로 사용 (조회 이후 삭제된 페이지 감지)
+            start_timestamp = start_timestamp or result.get("curtimestamp")
+            query = result.get("query", {})
+            for entry in query.get("normalized", []):
+                normalized[entry["from"]] = entry["to"]
+            for page in query.get("pages", []):
+                # 없는 페이지 ID 는 title 없이 pageid 와 missing 만 반환됨
+                merged = by_id.setdefault(page.get("pageid") or page.get("title"), {})
+                if "revisions" in page or not merged:
+                    merged.update(page)
+
+            if "continue" not in result:
+                break
+            params = {**params, **result["continue"]}
+
+        pages_by_title = {page["title"]: page for page in by_id.values() if page.get("title")}
+        pages_by_pageid = {page["pageid"]: page for page in by_id.values() if page.get("pageid")}
+
+        pages: Dict[Union[str, int], Dict[str, Any]] = {}
+        for value in chunk:
+            if key == "pageids":
+                page = pages_by_pageid.get(int(value)) or by_id.get(int(value))
+            else:
+                title = value
+                while title in normalized and normalized[title] != title:
+                    title = normalized[title]
+                page = pages_by_title.get(title)
+            pages[value] = _page_info(value, page, start_timestamp)
+        return pages
+
+    async def _has_high_limits(self) -> bool:
+        """apihighlimits 권한 여부 (첫 조회 후 캐시)"""
+        if self._high_limits is None:
+            result = await self._request("GET", {"action": "query", "meta": "userinfo", "uiprop": "rights"})
+            rights = result.get("query", {}).get("userinfo", {}).get("rights", [])
+            self._high_limits = "apihighlimits" in rights
+        return self._high_limits
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "logged_in": self._logged_in,
+            "auth": "oauth" if self.oauth_token else "botpassword",
+            "logins": self.logins,
+            "token_refreshes": self.token_refreshes,
+            "writes": self.writes.stats()
+        }
+
+    def _write_params(self, data: Dict[str, Any], token: str) -> Dict[str, Any]:
+        return {"assert": "user", "maxlag": settings.MEDIAWIKI_MAXLAG, **data, "token": token}
+
+    async def _request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        params = {**params, "format": "json"}
+        headers = {"Authorization": f"Bearer {self.oauth_token}"} if self.oauth_token else None
+
+        if method == "GET":
+            response = await self.client.get(self.api_url, params=params, headers=headers)
+        else:
+            response = await self.client.post(self.api_url, data=params, headers=headers)
+
+        # 5xx, 점검 페이지 등은 JSON 이 아니므로 상태 코드로 먼저 실패 (재시도 판별용)
+        response.raise_for_status()
+        result = response.json()
+        if "error" in result:
+            raise MediaWikiAPIError(result["error"], _retry_after(response))
+        return result
+
+    async def _ensure_login(self) -> None:
+        if self._logged_in:
+            return
+        async with self._lock:
+            if not self._logged_in:
+                await self._login()
+
+    async def _ensure_token(self) -> str:
+        token = self.csrf_token
+        if token is not None:
+            return token
+        async with self._lock:
+            if not self._logged_in:
+                await self._login()
+            if self.csrf_token is None:
+                await self._fetch_token()
+            return self.csrf_token
+
+    async def _refresh(self, failed_token: str, relogin: bool) -> str:
+        """실패한 토큰이 아직 현재 토큰이면 갱신 (동시 실패 시 한 번만)"""
+        async with self._lock:
+            if self.csrf_token == failed_token:
+                if relogin:
+                    self._logged_in = False
+                    self.client.cookies.clear()
+                    await self._login()
+                await self._fetch_token()
+            return self.csrf_token
+
+    async def _login(self) -> None:
+        """봇 비밀번호 로그인 (OAuth 토큰을 쓰면 생략)"""
+        if self.oauth_token:
+            self._logged_in = True
+            return
+
+        # 로그인 토큰 획득
+        result = await self._request("GET", {"action": "query", "meta": "tokens", "type": "login"})
+        login_token = result["query"]["tokens"]["logintoken"]
+
+        # 로그인 (세션 쿠키는 공유 클라이언트에 저장)
+        result = await self._request("POST", {
+            "action": "login",
+            "lgname": self.username,
+            "lgpassword": self.password,
+            "lgtoken": login_token
+        })
+        login = result.get("login", {})
+        if login.get("result") != "Success":
+            raise MediaWikiAPIError({"code": "loginfailed", "info": login.get("reason", login.get("result"))})
+
+        self._logged_in = True
+        self.csrf_token = None
+        self.logins += 1
+        logger.info("Successfully logged in to MediaWiki")
+
+    async def _fetch_token(self) -> None:
+        """CSRF 토큰 획득"""
+        result = await self._request("GET", {"action": "query", "meta": "tokens"})
+        self.csrf_token = result["query"]["tokens"]["csrftoken"]
+        self.token_refreshes += 1
+
+
+class RevisionLoader:
+    """
+    동시에 요청된 최신 리비전 조회를 모아 한 번에 조회
+
+    여러 워크플로우의 편집 단계가 거의 동시에 각자 페이지 상태를 물어도
+    window 초 동안(또는 max_batch 개가 모일 때까지) 요청을 모아
+    `read_pages(content=False)` 한 번으로 처리합니다.
+    """
+
+    def __init__(self, session: MediaWikiSession, window: float = 0.05, max_batch: int = READ_CHUNK_SIZE):
+        self.session = session
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 실행 중인 조회 태스크 (이벤트 루프는 약한 참조만 유지하므로 끝날 때까지 보관)
+        self._tasks: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.batches = 0
+
+    async def load(self, title: str) -> Dict[str, Any]:
+        """페이지의 최신 리비전 정보 (sha1, timestamp, start_timestamp)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(title, []).append(future)
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.batches += 1
+            task = asyncio.create_task(self._fetch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, pending: Dict[str, List[asyncio.Future]]) -> None:
+        """조회 후 대기 중인 요청에 결과 전달 (어떻게 끝나든 모든 요청을 완료)"""
+        try:
+            pages = await self.session.read_pages(titles=list(pending), content=False)
+        except asyncio.CancelledError:
+            _fail(pending, RuntimeError("Revision lookup was cancelled"))
+            raise
+        except Exception as e:
+            _fail(pending, e)
+            return
+
+        for title, futures in pending.items():
+            page = pages.get(title)
+            for future in futures:
+                if future.done():
+                    continue
+                if page is None:
+                    future.set_exception(LookupError(f"No revision info returned for {title}"))
+                else:
+                    future.set_result(page)
+
+
+def _fail(pending: Dict[str, List[asyncio.Future]], error: Exception) -> None:
+    for futures in pending.values():
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+
+def content_sha1(text: Optional[str]) -> str:
+    """
+    MediaWiki 리비전 sha1 과 비교할 수 있는 본문 해시
+
+    MediaWiki 는 저장 시 줄바꿈을 \n 으로 바꾸고 끝의 공백을 제거하므로
+    같은 방식으로 정규화한 뒤 SHA-1(16진수)을 계산합니다.
+    """
+    normalized = (text or "").replace("\r\n", "\n").replace("\r", "\n").rstrip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _page_info(
+    requested: Union[str, int],
+    page: Optional[Dict[str, Any]],
+    start_timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """prop=revisions 응답(formatversion=2)을 페이지 정보로 변환"""
+    if page is None or page.get("missing") or page.get("invalid"):
+        return {
+            "page_title": page.get("title") if page else (requested if isinstance(requested, str) else None),
+            "page_id": None,
+            "exists": False,
+            "start_timestamp": start_timestamp
+        }
+
+    revision = (page.get("revisions") or [{}])[0]
+    main = revision.get("slots", {}).get("main", {})
+    return {
+        "page_title": page["title"],
+        "page_id": page.get("pageid"),
+        "exists": True,
+        "revision_id": revision.get("revid"),
+        "timestamp": revision.get("timestamp"),
+        "sha1": revision.get("sha1"),
+        "size": revision.get("size"),
+        "content": main.get("content"),
+        "start_timestamp": start_timestamp
+    }
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """maxlag 등의 응답에 포함된 Retry-After 헤더(초)"""
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+# 글로벌 MediaWiki 세션 (에이전트와 서비스가 공유)
+mediawiki_session = MediaWikiSession.from_settings()
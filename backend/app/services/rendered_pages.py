@@ -0,0 +1,251 @@
+"""
+Rendered Page Cache - MediaWiki 렌더링 결과(action=parse) 캐시
+"""
+from typing import Any, Dict, Optional, Set, Tuple
+import logging
+import time
+
+from app.core.config import settings
+from app.services.cache import DiskCacheBackend, MemoryCacheBackend, SingleFlight, content_hash
+from app.services.mediawiki import MediaWikiAPIError, MediaWikiSession, mediawiki_session
+
+logger = logging.getLogger(__name__)
+
+# 페이지/리비전이 없을 때의 parse 오류 코드
+MISSING_PAGE_CODES = {"missingtitle", "nosuchpageid", "nosuchrevid", "permissiondenied"}
+
+
+class RenderedPageCache:
+    """
+    렌더링된 위키 페이지의 read-through 캐시
+
+    항목은 (page_id, revision_id) 로 저장되므로 리비전이 바뀌면 자연히
+    새 항목을 렌더링합니다. 메모리 LRU 를 먼저 보고, 디스크 계층이 있으면
+    그 다음에 조회하며, 둘 다 없을 때만 위키에 `action=parse` 를 요청합니다.
+    같은 페이지의 동시 미적중은 한 번의 요청으로 합쳐집니다.
+
+    캐시와 무효화는 프로세스별입니다. 페이지별 현재 리비전은 DB 의
+    mediawiki_revision_id(호출 시 전달)와 이 프로세스에서 관찰한 리비전 중
+    큰 값을 사용합니다. 다른 프로세스(워커)의 편집은 MediaWikiAgent 가 DB 에
+    새 리비전을 기록해 반영되고, 위키에서 직접 한 편집은 recentchanges 동기화가
+    DB 에 기록합니다. 관찰한 리비전은 latest_ttl 초 동안만 사용하므로, DB 에
+    리비전이 없는 페이지도 그 뒤에는 최신 리비전을 다시 확인합니다.
+    MediaWikiAgent 의 편집·삭제와 recentchanges 동기화가 같은 프로세스의
+    invalidate() 를 호출합니다.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryCacheBackend,
+        disk: Optional[DiskCacheBackend] = None,
+        wiki: Optional[MediaWikiSession] = None,
+        latest_ttl: float = 300.0
+    ):
+        self.memory = memory
+        self.disk = disk
+        self.wiki = wiki or mediawiki_session
+        self.latest_ttl = latest_ttl
+        self._current: Dict[int, Tuple[int, float]] = {}  # page_id -> (최신 revision_id, 관찰 시각)
+        self._revisions: Dict[int, Set[int]] = {}  # page_id -> 캐시된 revision_id
+        self._page_ids: Dict[str, int] = {}  # page_title -> page_id
+        self._flights = SingleFlight()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> "RenderedPageCache":
+        disk = None
+        if settings.RENDERED_PAGE_CACHE_DIR:
+            disk = DiskCacheBackend(settings.RENDERED_PAGE_CACHE_DIR, settings.RENDERED_PAGE_CACHE_DISK_MAX_BYTES)
+        return cls(
+            MemoryCacheBackend(settings.RENDERED_PAGE_CACHE_MAX_BYTES),
+            disk,
+            latest_ttl=settings.RENDERED_PAGE_LATEST_TTL
+        )
+
+    async def get(
+        self,
+        page_id: Optional[int] = None,
+        revision_id: Optional[int] = None,
+        page_title: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        렌더링된 페이지 조회
+
+        Args:
+            page_id: 위키 페이지 ID (없으면 page_title 로 조회)
+            revision_id: DB 에 기록된 리비전 ID (없으면 최신 리비전)
+            page_title: 위키 페이지 제목
+
+        Returns:
+            {"page_id", "revision_id", "title", "display_title", "html"}
+            (페이지가 없으면 None)
+        """
+        if page_id is None and page_title:
+            page_id = self._page_ids.get(page_title)
+        if page_id is None and not page_title:
+            return None
+
+        if page_id is not None:
+            known = [value for value in (revision_id, self._observed(page_id)) if value]
+            revision_id = max(known) if known else None
+            if revision_id:
+                key = self._key(page_id, revision_id)
+                page = await self._lookup(key)
+                if page is not None:
+                    return page
+                return await self._render_once(key, page_id, revision_id, page_title)
+
+        return await self._render_once(
+            f"latest:{page_id or page_title}", page_id, None, page_title
+        )
+
+    async def invalidate(
+        self,
+        page_id: Optional[int] = None,
+        revision_id: Optional[int] = None,
+        page_title: Optional[str] = None
+    ) -> None:
+        """
+        페이지의 캐시 항목 제거
+
+        새 리비전을 알고 있으면 이후 조회가 그 리비전을 렌더링하고,
+        삭제처럼 모르면 다음 조회 때 최신 리비전을 다시 확인합니다.
+        """
+        if page_id is None and page_title:
+            page_id = self._page_ids.get(page_title)
+        if page_id is None:
+            return
+
+        stale = self._revisions.pop(page_id, set())
+        if revision_id:
+            self._current[page_id] = (revision_id, time.monotonic())
+            stale.discard(revision_id)
+        else:
+            self._current.pop(page_id, None)
+
+        for stale_revision in stale:
+            key = self._key(page_id, stale_revision)
+            await self.memory.delete(key)
+            if self.disk is not None:
+                try:
+                    await self.disk.delete(key)
+                except Exception as e:
+                    logger.warning(f"Rendered page cache delete failed for {page_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / total if total else 0.0,
+            "memory_bytes": self.memory.total_bytes,
+            "pages": len(self._revisions),
+            "disk": self.disk is not None
+        }
+
+    def _observed(self, page_id: int) -> Optional[int]:
+        """이 프로세스에서 관찰한 최신 리비전 (latest_ttl 이 지났으면 None)"""
+        current = self._current.get(page_id)
+        if current is None or time.monotonic() - current[1] > self.latest_ttl:
+            return None
+        return current[0]
+
+    def _key(self, page_id: int, revision_id: int) -> str:
+        return content_hash("rendered_page", page_id, revision_id)
+
+    async def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        page = await self.memory.get(key)
+        if page is not None:
+            self.memory_hits += 1
+            return page
+
+        if self.disk is not None:
+            try:
+                page = await self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"Rendered page cache lookup failed: {e}")
+                page = None
+            if page is not None:
+                self.disk_hits += 1
+                await self.memory.set(key, page)
+                self._remember(page)
+                return page
+        return None
+
+    async def _render_once(
+        self,
+        flight_key: str,
+        page_id: Optional[int],
+        revision_id: Optional[int],
+        page_title: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """같은 페이지의 동시 렌더링 요청을 하나로 합침"""
+        page, _ = await self._flights.run(
+            flight_key, lambda: self._render(page_id, revision_id, page_title)
+        )
+        return page
+
+    async def _render(
+        self,
+        page_id: Optional[int],
+        revision_id: Optional[int],
+        page_title: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        self.misses += 1
+        params: Dict[str, Any] = {
+            "action": "parse",
+            "prop": "text|displaytitle|revid",
+            "disableeditsection": "1",
+            "disablelimitreport": "1",
+            "formatversion": "2"
+        }
+        if revision_id:
+            params["oldid"] = revision_id
+        elif page_id is not None:
+            params["pageid"] = page_id
+        else:
+            params["page"] = page_title
+
+        try:
+            result = await self.wiki.get(params)
+        except MediaWikiAPIError as e:
+            if e.code in MISSING_PAGE_CODES:
+                return None
+            raise
+
+        parsed = result.get("parse", {})
+        page = {
+            "page_id": parsed.get("pageid"),
+            "revision_id": parsed.get("revid"),
+            "title": parsed.get("title"),
+            "display_title": parsed.get("displaytitle"),
+            "html": parsed.get("text")
+        }
+        if page["page_id"] is None or not page["revision_id"]:
+            return page
+
+        key = self._key(page["page_id"], page["revision_id"])
+        await self.memory.set(key, page)
+        if self.disk is not None:
+            try:
+                await self.disk.set(key, page)
+            except Exception as e:
+                logger.warning(f"Rendered page cache store failed: {e}")
+        self._remember(page)
+        return page
+
+    def _remember(self, page: Dict[str, Any]) -> None:
+        page_id, revision_id = page["page_id"], page["revision_id"]
+        self._revisions.setdefault(page_id, set()).add(revision_id)
+        if page.get("title"):
+            self._page_ids[page["title"]] = page_id
+        current = self._current.get(page_id)
+        if current is None or revision_id >= current[0]:
+            self._current[page_id] = (revision_id, time.monotonic())
+
+
+# 글로벌 렌더링 페이지 캐시
+rendered_pages = RenderedPageCache.from_settings()
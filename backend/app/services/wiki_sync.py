@@ -0,0 +1,344 @@
+"""
+Wiki Sync Service - MediaWiki recentchanges 피드를 Postgres 에 반영
+"""
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from datetime import datetime
+import logging
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.artist import Artist
+from app.models.sync_state import SyncState
+from app.models.work import Work
+from app.services.mediawiki import MediaWikiSession, mediawiki_session
+from app.services.rendered_pages import rendered_pages
+
+logger = logging.getLogger(__name__)
+
+RECENTCHANGES_STATE = "mediawiki_recentchanges"
+
+
+class RecentChangesSync:
+    """
+    MediaWiki → Postgres 증분 동기화
+
+    저장된 지점부터 `list=recentchanges` 를 읽어 바뀐 페이지만 모은 뒤
+    `read_pages` 로 최신 리비전을 일괄 조회하고, 연결된 작가/작품의
+    mediawiki_* 컬럼(페이지 ID, 제목, 리비전 ID, 위키텍스트)을 한 번에
+    갱신합니다. 비용은 위키 전체 크기가 아니라 변경 수에 비례합니다.
+
+    페이지는 이미 연결된 mediawiki_page_id 로, 없으면 제목(작가 이름,
+    작품 제목)이 정확히 하나와 일치할 때 연결합니다.
+
+    여러 워커가 같은 주기로 실행해도 위키를 읽는 것은 한 곳뿐입니다. 실행은
+    먼저 advisory lock(pg_try_advisory_xact_lock, 행은 잠그지 않음)을 기다리지
+    않고 시도해, 다른 실행이 잡고 있으면 위키를 읽지 않고 `busy` 로 끝납니다.
+    적용할 때는 동기화 상태 행을 잠가 읽을 때의 지점과 같은지 확인
+    (compare-and-set)한 뒤 갱신과 새 지점을 같은 트랜잭션에서 커밋합니다.
+    중간에 실패하면 이전 지점부터 다시 읽습니다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        wiki: Optional[MediaWikiSession] = None,
+        namespaces: Optional[str] = None,
+        max_changes: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.wiki = wiki or mediawiki_session
+        self.namespaces = namespaces or settings.MEDIAWIKI_SYNC_NAMESPACES
+        self.max_changes = max_changes or settings.MEDIAWIKI_SYNC_MAX_CHANGES
+
+    async def run(self) -> Dict[str, Any]:
+        """한 번 동기화하고 처리 결과를 반환 (다른 실행이 동기화 중이면 `busy`)"""
+        async with self.session_factory() as guard:
+            # 트랜잭션 범위 잠금이므로 이 세션을 닫을(롤백할) 때 해제
+            claimed = (await guard.execute(
+                select(func.pg_try_advisory_xact_lock(func.hashtext(RECENTCHANGES_STATE)))
+            )).scalar()
+            if not claimed:
+                return {"status": "busy"}
+            try:
+                return await self._sync()
+            finally:
+                await guard.rollback()
+
+    async def _sync(self) -> Dict[str, Any]:
+        async with self.session_factory() as db:
+            await db.execute(
+                pg_insert(SyncState)
+                .values(name=RECENTCHANGES_STATE, cursor={}, updated_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=[SyncState.name])
+            )
+            await db.commit()
+            cursor = dict((await db.execute(
+                select(SyncState.cursor).filter(SyncState.name == RECENTCHANGES_STATE)
+            )).scalar_one_or_none() or {})
+
+        if not cursor.get("timestamp"):
+            # 첫 실행: 현재 시점부터 추적 (기존 페이지 전체를 읽지 않음)
+            initial = {"timestamp": _wiki_timestamp(datetime.utcnow()), "rcid": 0}
+            async with self.session_factory() as db:
+                state = await self._lock_state(db, cursor)
+                if state is None:
+                    return {"status": "busy"}
+                state.cursor = initial
+                await db.commit()
+            return {"status": "initialized", "cursor": initial}
+
+        # 위키 조회는 잠금 없이 (느린 위키가 DB 트랜잭션을 붙잡지 않도록)
+        changes, next_cursor = await self._read_changes(cursor)
+        stats: Dict[str, Any] = {"status": "synced", "changes": len(changes)}
+        existing: List[Dict[str, Any]] = []
+        deleted_titles: Set[str] = set()
+
+        if changes:
+            changed_ids, deleted_titles = _classify(changes)
+            pages = await self.wiki.read_pages(pageids=sorted(changed_ids)) if changed_ids else {}
+            existing = [page for page in pages.values() if page["exists"]]
+            live_titles = {page["page_title"] for page in existing}
+            deleted_titles -= live_titles
+            stats["pages"] = len(existing)
+
+        async with self.session_factory() as db:
+            state = await self._lock_state(db, cursor)
+            if state is None:
+                return {"status": "busy"}
+            if changes:
+                stats.update(await self._apply(db, existing, deleted_titles))
+            state.cursor = next_cursor
+            await db.commit()
+
+        # 새 리비전과 삭제된 페이지의 렌더링 캐시 무효화
+        for page in existing:
+            await rendered_pages.invalidate(page["page_id"], page["revision_id"], page["page_title"])
+        for title in deleted_titles:
+            await rendered_pages.invalidate(page_title=title)
+
+        stats["cursor"] = next_cursor
+        logger.info(f"MediaWiki sync: {stats}")
+        return stats
+
+    async def _lock_state(self, db, expected: Dict[str, Any]) -> Optional[SyncState]:
+        """
+        동기화 상태 행을 잠그고 지점이 expected 와 같은지 확인
+
+        다른 실행이 잠그고 있거나 이미 지점을 옮겼으면 None.
+        """
+        state = (await db.execute(
+            select(SyncState)
+            .filter(SyncState.name == RECENTCHANGES_STATE)
+            .with_for_update(skip_locked=True)
+        )).scalar_one_or_none()
+        if state is None or dict(state.cursor or {}) != expected:
+            return None
+        return state
+
+    async def _read_changes(self, cursor: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """저장된 지점 이후의 변경 목록과 다음 지점"""
+        params: Dict[str, Any] = {
+            "action": "query",
+            "list": "recentchanges",
+            "rcdir": "newer",
+            "rcprop": "title|ids|timestamp|loginfo",
+            "rctype": "edit|new|log",
+            "rcnamespace": self.namespaces,
+            "rclimit": "max",
+            "formatversion": "2"
+        }
+        if cursor.get("rccontinue"):
+            params["rccontinue"] = cursor["rccontinue"]
+        else:
+            params["rcstart"] = cursor["timestamp"]
+
+        last_rcid = cursor.get("rcid", 0)
+        changes: List[Dict[str, Any]] = []
+        next_cursor = {"timestamp": cursor["timestamp"], "rcid": last_rcid}
+
+        while True:
+            result = await self.wiki.get(params)
+            for change in result.get("query", {}).get("recentchanges", []):
+                # rcstart 는 같은 시각의 이미 처리한 변경도 포함
+                if change["rcid"] <= last_rcid:
+                    continue
+                changes.append(change)
+                next_cursor = {"timestamp": change["timestamp"], "rcid": change["rcid"]}
+
+            rccontinue = result.get("continue", {}).get("rccontinue")
+            if not rccontinue:
+                break
+            if len(changes) >= self.max_changes:
+                # 남은 변경은 다음 실행에서 이어서 처리
+                next_cursor["rccontinue"] = rccontinue
+                break
+            params = {key: value for key, value in params.items() if key != "rcstart"}
+            params["rccontinue"] = rccontinue
+
+        return changes, next_cursor
+
+    async def _apply(
+        self,
+        db,
+        pages: List[Dict[str, Any]],
+        deleted_titles: Set[str]
+    ) -> Dict[str, int]:
+        """페이지 정보를 작가 → 작품 순서로 연결하고 삭제된 페이지 연결 해제"""
+        now = datetime.utcnow()
+        stats: Dict[str, int] = {}
+        remaining = pages
+
+        for model, title_column, label in ((Artist, Artist.name, "artists"), (Work, Work.title, "works")):
+            rows, remaining = await _match(db, model, title_column, remaining)
+            if rows:
+                for row in rows:
+                    row["mediawiki_synced_at"] = now
+                await db.execute(update(model), rows)
+            stats[f"{label}_updated"] = len(rows)
+
+            if deleted_titles:
+                result = await db.execute(
+                    update(model)
+                    .filter(model.mediawiki_page_title.in_(deleted_titles))
+                    .values(
+                        mediawiki_page_id=None,
+                        mediawiki_revision_id=None,
+                        mediawiki_content=None,
+                        mediawiki_synced_at=now
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                stats[f"{label}_unlinked"] = result.rowcount
+
+        stats["unmatched"] = len(remaining)
+        return stats
+
+
+async def record_edit(
+    db,
+    page_title: str,
+    page_id: int,
+    revision_id: int,
+    content: Optional[str] = None
+) -> int:
+    """
+    편집으로 만든 새 리비전을 연결된 작가/작품 행에 기록
+
+    다른 프로세스(API)의 렌더링 캐시는 DB 의 mediawiki_revision_id 로 현재
+    리비전을 판단하므로, 워커의 편집이 동기화 없이도 바로 보이게 합니다.
+    페이지 ID 로 연결된 행, 없으면 mediawiki_page_title 이 같은 유일한 행을
+    갱신하며 이미 더 새 리비전이 기록돼 있으면 그대로 둡니다.
+
+    Returns:
+        갱신한 행 수
+    """
+    now = datetime.utcnow()
+    updated = 0
+    for model in (Artist, Work):
+        ids = (await db.execute(
+            select(model.id).filter(model.mediawiki_page_id == page_id)
+        )).scalars().all()
+        if not ids:
+            ids = (await db.execute(
+                select(model.id).filter(model.mediawiki_page_id.is_(None), model.mediawiki_page_title == page_title)
+            )).scalars().all()
+            if len(ids) != 1:
+                continue
+
+        result = await db.execute(
+            update(model)
+            .filter(
+                model.id.in_(ids),
+                or_(model.mediawiki_revision_id.is_(None), model.mediawiki_revision_id < revision_id)
+            )
+            .values(
+                mediawiki_page_id=page_id,
+                mediawiki_page_title=page_title,
+                mediawiki_revision_id=revision_id,
+                mediawiki_content=content,
+                mediawiki_synced_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+    await db.commit()
+    return updated
+
+
+async def _match(
+    db,
+    model: Type,
+    title_column,
+    pages: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    페이지와 행을 연결 (페이지 ID 우선, 없으면 유일한 제목 일치)
+
+    Returns:
+        (기본 키 기준 UPDATE 파라미터, 연결되지 않은 페이지)
+    """
+    if not pages:
+        return [], []
+
+    page_ids = [page["page_id"] for page in pages]
+    titles = [page["page_title"] for page in pages]
+    result = await db.execute(
+        select(model.id, model.mediawiki_page_id, title_column.label("title"))
+        .filter(or_(
+            model.mediawiki_page_id.in_(page_ids),
+            and_(model.mediawiki_page_id.is_(None), title_column.in_(titles))
+        ))
+    )
+
+    by_page_id: Dict[int, Any] = {}
+    by_title: Dict[str, List[Any]] = {}
+    for row in result.all():
+        if row.mediawiki_page_id is not None:
+            by_page_id[row.mediawiki_page_id] = row.id
+        else:
+            by_title.setdefault(row.title, []).append(row.id)
+
+    rows: List[Dict[str, Any]] = []
+    unmatched: List[Dict[str, Any]] = []
+    for page in pages:
+        row_id = by_page_id.get(page["page_id"])
+        if row_id is None and len(by_title.get(page["page_title"], [])) == 1:
+            row_id = by_title[page["page_title"]][0]
+        if row_id is None:
+            unmatched.append(page)
+            continue
+        rows.append({
+            "id": row_id,
+            "mediawiki_page_id": page["page_id"],
+            "mediawiki_page_title": page["page_title"],
+            "mediawiki_revision_id": page["revision_id"],
+            "mediawiki_content": page["content"]
+        })
+    return rows, unmatched
+
+
+def _classify(changes: List[Dict[str, Any]]) -> Tuple[Set[int], Set[str]]:
+    """변경 목록을 다시 읽을 페이지 ID 와 삭제된 제목으로 분류"""
+    changed_ids: Set[int] = set()
+    deleted_titles: Set[str] = set()
+
+    for change in changes:
+        if change.get("type") == "log" and change.get("logtype") == "delete" \
+                and change.get("logaction") in ("delete", "delete_redir"):
+            deleted_titles.add(change["title"])
+        elif change.get("pageid"):
+            # 편집, 생성, 이동(페이지 ID 유지), 복구
+            changed_ids.add(change["pageid"])
+
+    return changed_ids, deleted_titles
+
+
+def _wiki_timestamp(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# 글로벌 동기화 인스턴스
+wiki_sync = RecentChangesSync()
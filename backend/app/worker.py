@@ -0,0 +1,164 @@
+"""
+ArtistWiki Worker - 큐에 등록된 워크플로우 실행
+
+사용법:
+    python -m app.worker [--concurrency N] [--worker-id ID]
+"""
+from typing import Dict, Optional
+from uuid import UUID
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.http import http_clients
+from app.core.loop_monitor import loop_monitor
+from app.agents.orchestrator import orchestrator
+from app.agents.registry import register_default_agents
+from app.services import job_queue
+from app.services.batch import finalize_batch
+from app.services.html_parser import html_parse_pool
+from app.services.wiki_sync import wiki_sync
+
+logger = logging.getLogger("worker")
+
+
+class Worker:
+    """AgentJob 큐를 폴링하며 워크플로우를 실행하는 워커"""
+
+    def __init__(self, worker_id: Optional[str] = None, concurrency: Optional[int] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.running: Dict[UUID, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """새 작업 선점 중단 (실행 중인 작업은 마무리)"""
+        logger.info(f"Worker {self.worker_id} stopping")
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """메인 루프"""
+        logger.info(f"Worker {self.worker_id} started (concurrency={self.concurrency})")
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        sync_task = (
+            asyncio.create_task(self._sync_loop())
+            if settings.MEDIAWIKI_SYNC_INTERVAL > 0 else None
+        )
+
+        try:
+            while not self._stopping.is_set():
+                free_slots = self.concurrency - len(self.running)
+                claimed = 0
+
+                if free_slots > 0:
+                    async with AsyncSessionLocal() as db:
+                        jobs = await job_queue.claim_jobs(db, self.worker_id, free_slots)
+                    for job in jobs:
+                        task = asyncio.create_task(
+                            self._run_job(job.id, job.input_data or {}, job.parent_id)
+                        )
+                        self.running[job.id] = task
+                    claimed = len(jobs)
+
+                # 큐가 비었거나 슬롯이 가득 찬 경우에만 대기
+                if claimed == 0 or len(self.running) >= self.concurrency:
+                    await self._wait(settings.WORKER_POLL_INTERVAL)
+        finally:
+            if self.running:
+                await asyncio.gather(*self.running.values(), return_exceptions=True)
+            heartbeat_task.cancel()
+            if sync_task:
+                sync_task.cancel()
+
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _wait(self, timeout: float) -> None:
+        """작업 완료, 종료 신호 또는 타임아웃까지 대기"""
+        waiters = [asyncio.create_task(self._stopping.wait())]
+        waiters.extend(self.running.values())
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        waiters[0].cancel()
+
+    async def _run_job(self, job_id: UUID, input_data: Dict, parent_id: Optional[UUID] = None) -> None:
+        """선점한 워크플로우 작업 실행"""
+        logger.info(f"Running workflow job {job_id}")
+        try:
+            # 결과 및 단계 체크포인트는 오케스트레이터가 기록
+            await orchestrator.execute_workflow(
+                workflow=input_data.get("workflow", []),
+                context=input_data.get("context") or {},
+                max_parallel=input_data.get("max_parallel"),
+                use_cache=input_data.get("use_cache"),
+                workflow_id=job_id
+            )
+        except Exception as e:
+            logger.exception(f"Workflow job {job_id} failed")
+            async with AsyncSessionLocal() as db:
+                await job_queue.fail_job(db, job_id, str(e))
+        finally:
+            self.running.pop(job_id, None)
+
+        if parent_id:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await finalize_batch(db, parent_id)
+            except Exception:
+                logger.exception(f"Failed to finalize batch {parent_id}")
+
+    async def _heartbeat_loop(self) -> None:
+        """실행 중인 작업의 heartbeat 갱신 및 중단된 작업 회수"""
+        while True:
+            await asyncio.sleep(settings.WORKER_HEARTBEAT_INTERVAL)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await job_queue.heartbeat(db, self.worker_id, list(self.running))
+                    requeued = await job_queue.requeue_stale_jobs(db, settings.WORKER_STALE_TIMEOUT)
+                if requeued:
+                    logger.warning(f"Requeued {requeued} stale workflow jobs")
+            except Exception:
+                logger.exception("Heartbeat failed")
+
+    async def _sync_loop(self) -> None:
+        """MediaWiki 최근 변경 주기적 동기화 (모든 워커가 시도하고 잠금을 얻은 한 곳만 위키를 읽음)"""
+        while True:
+            try:
+                await wiki_sync.run()
+            except Exception:
+                logger.exception("MediaWiki sync failed")
+            await asyncio.sleep(settings.MEDIAWIKI_SYNC_INTERVAL)
+
+
+async def main(worker_id: Optional[str] = None, concurrency: Optional[int] = None) -> None:
+    """워커 실행 (SIGINT/SIGTERM 시 graceful shutdown)"""
+    register_default_agents(orchestrator)
+    worker = Worker(worker_id=worker_id, concurrency=concurrency)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await orchestrator.recorder.close()
+        await http_clients.close()
+        html_parse_pool.close()
+        loop_monitor.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ArtistWiki agent worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시에 실행할 워크플로우 수")
+    parser.add_argument("--worker-id", default=None, help="워커 식별자 (기본값: hostname:pid)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if settings.DEBUG else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(main(worker_id=args.worker_id, concurrency=args.concurrency))
@@ -0,0 +1,110 @@
+"""
+AgentJob 기록 방식 벤치마크
+
+에이전트 호출 시간을 0에 가깝게 두고 작업 상태 기록 비용만 비교합니다.
+
+- direct:   상태 변경마다 짧은 트랜잭션으로 커밋 (기본값)
+- buffered: 변경을 모아 다중 행 INSERT/UPDATE 로 일괄 커밋
+
+순차 실행으로 단계당 오버헤드를, 동시 실행으로 처리량과 커밋 수를
+측정합니다.
+
+사용법:
+    cd backend
+    python -m benchmarks.job_recorder [--workflows 200] [--db-latency 0.002]
+"""
+from typing import Dict, Any
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks._simulated_db import SimulatedPool, SimulatedSession, SleepAgent, sample_workflow
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.recorder import BufferedJobRecorder, DirectJobRecorder
+from app.agents.scheduler import AgentScheduler
+
+
+def build_orchestrator(mode: str, pool: SimulatedPool, args: argparse.Namespace) -> AgentOrchestrator:
+    def session_factory():
+        return SimulatedSession(pool, args.db_latency)
+
+    if mode == "direct":
+        recorder = DirectJobRecorder(session_factory)
+    else:
+        recorder = BufferedJobRecorder(
+            session_factory, batch_size=args.batch_size, flush_interval=args.flush_interval
+        )
+
+    orchestrator = AgentOrchestrator(session_factory=session_factory, recorder=recorder)
+    # 기록 비용만 측정하도록 에이전트 속도 제한은 해제
+    orchestrator.scheduler = AgentScheduler({}, {}, {})
+    for agent_type in ("crawler", "writer", "mediawiki"):
+        orchestrator.register_agent(agent_type, SleepAgent(agent_type, args.agent_latency))
+    return orchestrator
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    steps_per_workflow = len(sample_workflow())
+
+    # 순차 실행: 단계당 오버헤드
+    pool = SimulatedPool(args.pool_size, args.pool_timeout)
+    orchestrator = build_orchestrator(mode, pool, args)
+    start = time.perf_counter()
+    for _ in range(args.sequential):
+        await orchestrator.execute_workflow(sample_workflow())
+    sequential_elapsed = time.perf_counter() - start
+    await orchestrator.recorder.close()
+
+    # 동시 실행: 처리량과 커밋 수
+    pool = SimulatedPool(args.pool_size, args.pool_timeout)
+    orchestrator = build_orchestrator(mode, pool, args)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        orchestrator.execute_workflow(sample_workflow()) for _ in range(args.workflows)
+    ))
+    await orchestrator.recorder.close()
+    elapsed = time.perf_counter() - start
+
+    steps = args.workflows * steps_per_workflow
+    return {
+        "step_overhead_ms": sequential_elapsed / (args.sequential * steps_per_workflow) * 1000,
+        "elapsed_s": elapsed,
+        "commits": pool.commits,
+        "statements": pool.statements,
+        "commits_per_step": pool.commits / steps,
+        "commits_per_s": pool.commits / elapsed,
+        "steps_per_s": steps / elapsed,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"workflows={args.workflows} sequential={args.sequential} pool_size={args.pool_size} "
+        f"db_latency={args.db_latency * 1000:.1f}ms batch_size={args.batch_size} "
+        f"flush_interval={args.flush_interval}s"
+    )
+    print(f"{'mode':<9} {'step ovh':>9} {'commits':>8} {'stmts':>7} {'commit/step':>11} "
+          f"{'commit/s':>9} {'steps/s':>9} {'elapsed':>8}")
+
+    for mode in ("direct", "buffered"):
+        stats = await run_mode(mode, args)
+        print(
+            f"{mode:<9} {stats['step_overhead_ms']:>7.2f}ms {stats['commits']:>8} "
+            f"{stats['statements']:>7} {stats['commits_per_step']:>11.3f} "
+            f"{stats['commits_per_s']:>9.1f} {stats['steps_per_s']:>9.1f} {stats['elapsed_s']:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AgentJob recorder benchmark")
+    parser.add_argument("--workflows", type=int, default=200, help="동시에 실행할 워크플로우 수")
+    parser.add_argument("--sequential", type=int, default=20, help="순차 실행할 워크플로우 수")
+    parser.add_argument("--pool-size", type=int, default=15, help="pool_size + max_overflow")
+    parser.add_argument("--pool-timeout", type=float, default=30.0, help="커넥션 대기 한도 (초)")
+    parser.add_argument("--agent-latency", type=float, default=0.0, help="에이전트 호출 시간 (초)")
+    parser.add_argument("--db-latency", type=float, default=0.002, help="구문당 DB 왕복 시간 (초)")
+    parser.add_argument("--batch-size", type=int, default=500, help="buffered 모드 일괄 기록 행 수")
+    parser.add_argument("--flush-interval", type=float, default=0.5, help="buffered 모드 기록 주기 (초)")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
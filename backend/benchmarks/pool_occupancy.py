@@ -0,0 +1,107 @@
+"""
+커넥션 풀 점유 벤치마크
+
+고정 크기 풀에서 동시에 처리할 수 있는 워크플로우 수를 두 가지 방식으로
+비교합니다.
+
+- held:  워크플로우 전체 동안 요청 세션이 커넥션 하나를 점유 (변경 전)
+- short: 에이전트 호출 전후의 짧은 트랜잭션에서만 커넥션 사용 (변경 후)
+
+사용법:
+    cd backend
+    python -m benchmarks.pool_occupancy [--pool-size 15] [--pool-timeout 1.0]
+"""
+from typing import Dict, Any
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks._simulated_db import (
+    PoolTimeout, SimulatedPool, SimulatedSession, SleepAgent, sample_workflow
+)
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.scheduler import AgentScheduler
+
+
+def build_orchestrator(session_factory, agent_latency: float) -> AgentOrchestrator:
+    orchestrator = AgentOrchestrator(session_factory=session_factory)
+    # 커넥션 풀만 측정하도록 에이전트 속도 제한은 해제
+    orchestrator.scheduler = AgentScheduler({}, {}, {})
+    orchestrator.register_agent("crawler", SleepAgent("crawler", agent_latency * 0.2))
+    orchestrator.register_agent("writer", SleepAgent("writer", agent_latency))
+    orchestrator.register_agent("mediawiki", SleepAgent("mediawiki", agent_latency * 0.2))
+    return orchestrator
+
+
+async def run_level(mode: str, workflows: int, args: argparse.Namespace) -> Dict[str, Any]:
+    pool = SimulatedPool(args.pool_size, args.pool_timeout)
+
+    if mode == "held":
+        orchestrator = build_orchestrator(
+            lambda: SimulatedSession(None, args.db_latency), args.agent_latency
+        )
+    else:
+        orchestrator = build_orchestrator(
+            lambda: SimulatedSession(pool, args.db_latency), args.agent_latency
+        )
+
+    async def run_one() -> bool:
+        try:
+            if mode == "held":
+                async with pool.connection():
+                    await orchestrator.execute_workflow(sample_workflow())
+            else:
+                await orchestrator.execute_workflow(sample_workflow())
+            return True
+        except PoolTimeout:
+            return False
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_one() for _ in range(workflows)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "completed": sum(outcomes),
+        "timed_out": len(outcomes) - sum(outcomes),
+        "peak_in_use": pool.peak,
+        "p95_wait_ms": pool.wait_percentile(0.95) * 1000,
+        "elapsed_s": elapsed,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    levels = [args.pool_size * factor for factor in (1, 2, 4, 8, 16, 32)]
+
+    print(
+        f"pool_size={args.pool_size} pool_timeout={args.pool_timeout}s "
+        f"agent_latency={args.agent_latency}s db_latency={args.db_latency * 1000:.1f}ms"
+    )
+    print(f"{'mode':<6} {'workflows':>9} {'completed':>9} {'timeouts':>8} "
+          f"{'peak':>5} {'p95 wait':>10} {'elapsed':>8}")
+
+    sustained = {}
+    for mode in ("held", "short"):
+        sustained[mode] = 0
+        for workflows in levels:
+            stats = await run_level(mode, workflows, args)
+            print(
+                f"{mode:<6} {workflows:>9} {stats['completed']:>9} {stats['timed_out']:>8} "
+                f"{stats['peak_in_use']:>5} {stats['p95_wait_ms']:>8.1f}ms {stats['elapsed_s']:>7.2f}s"
+            )
+            if stats["timed_out"] == 0:
+                sustained[mode] = workflows
+
+    print()
+    for mode, workflows in sustained.items():
+        print(f"{mode}: sustained {workflows} concurrent workflows without pool timeouts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Connection pool occupancy benchmark")
+    parser.add_argument("--pool-size", type=int, default=15, help="pool_size + max_overflow")
+    parser.add_argument("--pool-timeout", type=float, default=1.0, help="커넥션 대기 한도 (초)")
+    parser.add_argument("--agent-latency", type=float, default=0.5, help="writer 호출 시간 (초)")
+    parser.add_argument("--db-latency", type=float, default=0.002, help="구문당 DB 왕복 시간 (초)")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""
+배치 서비스 테스트 (SQL 은 PostgreSQL 방언으로 컴파일해 확인)
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import batch as batch_service
+
+
+class FinalizeSession:
+    """배치 하위 작업의 상태별 개수를 돌려주고 UPDATE 값을 기록"""
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.updates = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        if statement.is_select:
+            return SimpleNamespace(all=lambda: list(self.counts.items()))
+        self.updates.append(statement.compile(dialect=postgresql.dialect()).params)
+        return SimpleNamespace(rowcount=1)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _finalize(counts):
+    db = FinalizeSession(counts)
+    asyncio.run(batch_service.finalize_batch(db, uuid4()))
+    return db
+
+
+def test_finalize_waits_for_remaining_workflows():
+    db = _finalize({"success": 3, "running": 1})
+    assert db.updates == []
+    assert db.commits == 0
+
+
+def test_finalize_marks_all_succeeded_batch_success():
+    [values] = _finalize({"success": 3}).updates
+    assert values["status"] == "success"
+    assert values["output_data"] == {"total": 3, "counts": {"success": 3, "failed": 0}}
+    assert values["error_message"] is None
+
+
+def test_finalize_marks_partly_failed_batch_partial():
+    [values] = _finalize({"success": 2, "failed": 1}).updates
+    assert values["status"] == "partial"
+    assert values["output_data"] == {"total": 3, "counts": {"success": 2, "failed": 1}}
+    assert values["error_message"] == "1 of 3 workflows failed"
+
+
+def test_finalize_marks_all_failed_batch_failed():
+    [values] = _finalize({"failed": 2}).updates
+    assert values["status"] == "failed"
+    assert values["error_message"] == "2 of 2 workflows failed"
+
+
+class CreateSession:
+    """작가 조회 결과를 돌려주고 추가/삽입한 작업을 기록"""
+
+    def __init__(self, artists):
+        self.artists = artists
+        self.added = []
+        self.inserted = []
+
+    def add(self, job):
+        self.added.append(job)
+
+    async def flush(self):
+        pass
+
+    async def execute(self, statement, params=None):
+        if params is not None:
+            self.inserted.extend(params)
+            return SimpleNamespace()
+        return SimpleNamespace(all=lambda: self.artists)
+
+    async def commit(self):
+        pass
+
+
+def test_create_batch_fans_out_one_workflow_per_artist():
+    artists = [
+        SimpleNamespace(id=uuid4(), name="Claude Monet", type="painter", nationality="French"),
+        SimpleNamespace(id=uuid4(), name="Frida Kahlo", type="painter", nationality=None),
+    ]
+    workflow = [{"agent_type": "crawler", "task_data": {"url": "https://example.com/{artist.name}"}}]
+    db = CreateSession(artists)
+
+    batch = asyncio.run(batch_service.create_batch(db, workflow, context={"lang": "en"}, max_concurrency=5))
+
+    assert db.added == [batch]
+    assert batch.input_data["total"] == 2
+    assert [row["parent_id"] for row in db.inserted] == [batch.id, batch.id]
+    assert [row["status"] for row in db.inserted] == ["pending", "pending"]
+    first, second = (row["input_data"] for row in db.inserted)
+    assert first["workflow"][0]["task_data"]["url"] == "https://example.com/Claude Monet"
+    assert second["workflow"][0]["task_data"]["url"] == "https://example.com/Frida Kahlo"
+    assert first["context"] == {
+        "lang": "en", "artist_id": str(artists[0].id), "artist_name": "Claude Monet", "artist_type": "painter"
+    }
+    # 템플릿 원본은 치환되지 않음
+    assert workflow[0]["task_data"]["url"] == "https://example.com/{artist.name}"
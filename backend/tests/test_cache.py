@@ -0,0 +1,64 @@
+"""
+캐시 백엔드 테스트
+"""
+import asyncio
+import os
+
+from app.services.cache import DiskCacheBackend, MemoryCacheBackend
+
+
+def test_memory_backend_evicts_least_recently_used():
+    async def main():
+        backend = MemoryCacheBackend(max_bytes=20)
+        await backend.set("a", "x" * 8)
+        await backend.set("b", "y" * 8)
+        assert await backend.get("a") == "x" * 8
+        await backend.set("c", "z" * 8)
+
+        assert await backend.get("b") is None
+        assert await backend.get("a") is not None
+        assert backend.total_bytes <= 20
+
+    asyncio.run(main())
+
+
+def test_disk_backend_expired_reads_keep_index_consistent(tmp_path):
+    async def main():
+        backend = DiskCacheBackend(str(tmp_path), max_bytes=4000)
+        keys = [f"{i:02d}" + "0" * 62 for i in range(40)]
+        for key in keys[:20]:
+            await backend.set(key, "v" * 50, ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        # 만료 항목 조회(삭제)와 저장(축출)이 동시에 실행
+        await asyncio.gather(
+            *(backend.get(key) for key in keys[:20]),
+            *(backend.set(key, "w" * 50) for key in keys[20:])
+        )
+
+        on_disk = {
+            os.path.join(root, name)
+            for root, _, files in os.walk(tmp_path)
+            for name in files if name.endswith(backend.suffix)
+        }
+        assert set(backend._index) == on_disk
+        assert sum(size for size, _ in backend._index.values()) <= backend.max_bytes
+        assert [await backend.get(key) for key in keys[:20]] == [None] * 20
+
+    asyncio.run(main())
+
+
+def test_disk_backend_does_not_remove_value_rewritten_after_expiry(tmp_path):
+    async def main():
+        backend = DiskCacheBackend(str(tmp_path), max_bytes=100_000)
+        key = "ab" + "0" * 62
+        await backend.set(key, "old", ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        path = backend._path(key)
+        assert backend._read(path) is not None  # 만료 표시
+        await backend.set(key, "new")
+        backend._remove_expired(path)
+        assert await backend.get(key) == "new"
+
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+CrawlFrontier 테스트
+"""
+import asyncio
+
+import pytest
+
+from app.services.crawl_frontier import CrawlFrontier, HostPoliteness, normalize_url
+
+
+class AllowAllRobots:
+    async def allowed(self, url):
+        return True
+
+    async def crawl_delay(self, url):
+        return None
+
+
+def _frontier(fetch, hosts, **kwargs):
+    options = {"max_concurrency": 4, "max_pages": 20, "max_depth": 1}
+    options.update(kwargs)
+    return CrawlFrontier(fetch, robots=AllowAllRobots(), hosts=hosts, **options)
+
+
+@pytest.mark.parametrize("url", ["http://example.com:80a/", "http://[::1/x", "mailto:a@example.com"])
+def test_normalize_url_rejects_malformed_and_non_http_urls(url):
+    assert normalize_url(url) is None
+    assert normalize_url(url, base="https://example.com/a") is None
+
+
+def test_normalize_url_drops_default_port_and_fragment():
+    assert normalize_url("HTTPS://Example.com:443/a#top") == "https://example.com/a"
+    assert normalize_url("b?x=1", base="http://example.com:8080/dir/") == "http://example.com:8080/dir/b?x=1"
+
+
+def test_crawl_follows_links_once_in_discovery_order_and_skips_malformed_links():
+    async def main():
+        hosts = HostPoliteness(concurrency=2, delay=0.0)
+        links = {
+            "https://a.example/": ["/one", "http://example.com:80a/", "http://[::1/x", "/one#again", "https://b.example/x"],
+            "https://a.example/one": ["/"]
+        }
+        visited = []
+
+        async def fetch(url, depth):
+            visited.append(url)
+            return {"source_url": url, "links": links.get(url, [])}
+
+        pages, failed = await _frontier(fetch, hosts).crawl(["https://a.example/"])
+
+        assert [page["source_url"] for page in pages] == ["https://a.example/", "https://a.example/one"]
+        assert visited.count("https://a.example/one") == 1
+        assert failed == []
+        assert hosts.wait_time("a.example") == 0.0
+
+    asyncio.run(main())
+
+
+def test_crawl_records_failures_and_respects_max_concurrency():
+    async def main():
+        active = 0
+        max_active = 0
+
+        async def fetch(url, depth):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if url.endswith("/bad"):
+                raise RuntimeError("boom")
+            return {"source_url": url}
+
+        seeds = [f"https://h{index}.example/" for index in range(5)] + ["https://h0.example/bad"]
+        pages, failed = await _frontier(fetch, HostPoliteness(concurrency=1, delay=0.0), max_concurrency=2).crawl(seeds)
+
+        assert len(pages) == 5
+        assert failed == [{"url": "https://h0.example/bad", "error": "boom"}]
+        assert max_active == 2
+
+    asyncio.run(main())
+
+
+def test_cancelled_crawl_releases_host_slots():
+    async def main():
+        hosts = HostPoliteness(concurrency=1, delay=0.0)
+        started = asyncio.Event()
+
+        async def fetch(url, depth):
+            started.set()
+            await asyncio.sleep(10)
+
+        crawl = asyncio.create_task(_frontier(fetch, hosts).crawl(["https://a.example/", "https://b.example/"]))
+        await started.wait()
+        crawl.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await crawl
+
+        # 다른 크롤링이 같은 호스트를 다시 쓸 수 있어야 함
+        assert hosts.try_acquire("a.example") and hosts.try_acquire("b.example")
+
+    asyncio.run(main())
+
+
+def test_error_while_scheduling_releases_host_slots():
+    async def main():
+        hosts = HostPoliteness(concurrency=1, delay=0.0)
+
+        async def fetch(url, depth):
+            if url == "https://a.example/":
+                return {"source_url": url, "links": ["/next"]}
+            await asyncio.sleep(10)
+
+        frontier = _frontier(fetch, hosts)
+
+        def broken_follow(url, seed_hosts):
+            raise RuntimeError("bug")
+
+        frontier._should_follow = broken_follow
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(frontier.crawl(["https://a.example/", "https://b.example/"]), timeout=1)
+
+        # b.example 요청은 취소되고 두 호스트 슬롯 모두 반납
+        assert hosts.try_acquire("a.example") and hosts.try_acquire("b.example")
+
+    asyncio.run(main())
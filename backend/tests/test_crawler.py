@@ -0,0 +1,100 @@
+"""
+CrawlerAgent 다중 URL 크롤링 출력 테스트
+"""
+import asyncio
+
+from app.agents import crawler as crawler_module
+from app.agents.crawler import CrawlerAgent
+from app.services.extractors import CHARS_PER_TOKEN, merge_facts
+
+
+class FakeFrontier:
+    """크롤링 대신 준비한 페이지를 반환 (두 번째 페이지는 첫 페이지의 중복)"""
+
+    def __init__(self, fetch, **kwargs):
+        pass
+
+    async def crawl(self, urls):
+        pages = [
+            {"source_url": url, "title": url, "facts": {"summary": "x" * 100, "sources": ["main_content"]},
+             "truncated": False, "unchanged": False}
+            for url in urls
+        ]
+        pages[1]["duplicate_of"] = pages[0]["source_url"]
+        return pages, []
+
+
+def test_crawl_many_drops_facts_from_every_page(monkeypatch):
+    monkeypatch.setattr(crawler_module, "CrawlFrontier", FakeFrontier)
+    monkeypatch.setattr(crawler_module.settings, "CONTENT_FINGERPRINT_ENABLED", False)
+
+    result = asyncio.run(CrawlerAgent().execute({
+        "urls": ["https://a.example/p", "https://b.example/p"],
+        "artist_name": "Pablo Picasso"
+    }))
+
+    assert result["facts"]["summary"] == "x" * 100
+    assert len(result["pages"]) == 2
+    assert all("facts" not in page for page in result["pages"])
+    assert result["pages"][1]["duplicate_of"] == "https://a.example/p"
+
+
+class FakeHTTPCache:
+    async def get(self, url):
+        # 같은 URL 을 다른 작가나 실패한 워크플로우가 먼저 받아 캐시가 신선한 경우
+        return {"text": "<html></html>", "size": 13, "truncated": False, "unchanged": True, "cache": "fresh"}
+
+
+class FakeFingerprintStore:
+    def __init__(self, changed):
+        self.changed = changed
+
+    async def check(self, artist_key, pages):
+        return [
+            {"source_url": page["source_url"], "fingerprint": f"{page['simhash']:016x}", "digest": page["digest"],
+             "distance": None, "changed": self.changed, "moved": self.changed, "duplicate_of": None}
+            for page in pages
+        ]
+
+
+def _crawl_cached_page(monkeypatch, changed):
+    async def parse(func, text):
+        return {"title": "Picasso", "facts": {"summary": "Pablo Picasso was a Spanish painter."}, "links": []}, 0.0
+
+    monkeypatch.setattr(crawler_module.settings, "CRAWLER_HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(crawler_module.settings, "CONTENT_FINGERPRINT_ENABLED", True)
+    monkeypatch.setattr(crawler_module, "crawler_http_cache", FakeHTTPCache())
+    monkeypatch.setattr(crawler_module.html_parse_pool, "run", parse)
+    monkeypatch.setattr(crawler_module, "fingerprint_store", FakeFingerprintStore(changed))
+
+    return asyncio.run(CrawlerAgent().execute({
+        "url": "https://a.example/p", "artist_name": "Pablo Picasso", "artist_id": "1"
+    }))
+
+
+def test_fresh_http_cache_does_not_mark_changed_facts_unchanged(monkeypatch):
+    result = _crawl_cached_page(monkeypatch, changed=True)
+    assert result["http_cache"] == "fresh"
+    assert result["unchanged"] is False
+    assert result["fingerprint_baseline"]["pages"][0]["moved"] is True
+
+
+def test_unchanged_comes_from_the_fingerprint_baseline(monkeypatch):
+    result = _crawl_cached_page(monkeypatch, changed=False)
+    assert result["unchanged"] is True
+
+
+def test_crawl_many_is_changed_without_fingerprints(monkeypatch):
+    monkeypatch.setattr(crawler_module, "CrawlFrontier", FakeFrontier)
+    monkeypatch.setattr(crawler_module.settings, "CONTENT_FINGERPRINT_ENABLED", False)
+
+    result = asyncio.run(CrawlerAgent().execute({
+        "urls": ["https://a.example/p", "https://b.example/p"],
+        "artist_name": "Pablo Picasso"
+    }))
+    assert result["unchanged"] is False
+
+
+def test_merge_facts_trims_description_to_budget():
+    facts = merge_facts([{"description": "word " * 1000}], token_budget=10)
+    assert len(facts["description"]) <= 10 * CHARS_PER_TOKEN
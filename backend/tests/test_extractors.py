@@ -0,0 +1,61 @@
+"""
+팩트 추출기 테스트
+"""
+from app.services.extractors import _parse, extract_page
+
+PAGE = """
+<html><head><title>Pablo Picasso - Wikipedia</title>
+<meta property="og:description" content="Spanish painter and sculptor">
+</head><body>
+<table class="infobox"><caption>Pablo Picasso</caption>
+<tr><th>Born</th><td><span class="bday">1881-10-25</span><br>Málaga, Spain</td></tr>
+<tr><th>Notable work</th><td><ul><li>Guernica (1937)</li></ul></td></tr>
+</table>
+<main><p>Pablo Ruiz Picasso was a Spanish painter, sculptor, printmaker and ceramicist.</p></main>
+<a href="/wiki/Cubism">Cubism</a>
+<a href="http://[::1/x">broken</a>
+<a href="http://example.com:80a/">bad port</a>
+</body></html>
+"""
+
+
+def test_extract_page_reads_infobox_and_summary():
+    page = extract_page(PAGE, url="https://en.wikipedia.org/wiki/Pablo_Picasso")
+    facts = page["facts"]
+
+    assert page["title"] == "Pablo Picasso - Wikipedia"
+    assert facts["name"] == "Pablo Picasso"
+    assert facts["birth_date"] == "1881-10-25"
+    assert facts["works"] == [{"title": "Guernica", "year": 1937}]
+    assert facts["description"] == "Spanish painter and sculptor"
+    assert facts["summary"].startswith("Pablo Ruiz Picasso")
+
+
+def test_malformed_links_are_skipped_without_failing_the_page():
+    page = extract_page(PAGE, url="https://en.wikipedia.org/wiki/Pablo_Picasso", with_links=True)
+
+    assert page["links"] == ["https://en.wikipedia.org/wiki/Cubism"]
+    assert page["facts"]["name"] == "Pablo Picasso"
+
+
+def test_unused_subtrees_are_pruned_while_parsing():
+    html = (
+        "<html><head><title>Page</title>"
+        "<script>var tracking = 1;</script>"
+        '<script type="application/ld+json">{"@type": "Person", "name": "Claude Monet"}</script>'
+        "</head><body>"
+        '<nav><a href="/home">Home</a></nav>'
+        "<main><p>Oscar-Claude Monet was a French painter and founder of Impressionism.</p></main>"
+        "<footer><form><input name='q'></form></footer>"
+        "</body></html>"
+    )
+
+    doc, hrefs = _parse(html)
+
+    assert doc.xpath("//nav|//footer|//form") == []
+    assert [script.get("type") for script in doc.iter("script")] == ["application/ld+json"]
+    assert hrefs == ["/home"]
+
+    page = extract_page(html, url="https://example.com/monet", with_links=True)
+    assert page["facts"]["name"] == "Claude Monet"
+    assert page["links"] == ["https://example.com/home"]
@@ -0,0 +1,87 @@
+"""
+FingerprintStore 테스트
+"""
+from types import SimpleNamespace
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.fingerprints import FingerprintStore, _to_signed, fingerprint_facts
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        if sql.startswith("SELECT"):
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: list(self.database.rows)))
+        self.database.writes.append(statement.compile(dialect=postgresql.dialect()).params)
+        return None
+
+    async def commit(self):
+        self.database.commits += 1
+
+
+class FakeDatabase:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.writes = []
+        self.commits = 0
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def _entry(url, facts):
+    return {"source_url": url, **fingerprint_facts(facts)}
+
+
+def test_check_does_not_move_baseline_until_commit():
+    async def main():
+        facts = {"birth_date": "1881-10-25", "summary": "Pablo Picasso was a Spanish painter and sculptor."}
+        entry = _entry("https://a.example/p", facts)
+        database = FakeDatabase()
+        store = FingerprintStore(session_factory=database, max_distance=3)
+
+        results = await store.check("id:1", [entry])
+        assert results[0]["changed"] and results[0]["moved"]
+        assert database.writes == [] and database.commits == 0
+
+        # 글 게시 전이면 다음 크롤링도 같은 변경을 감지
+        assert (await store.check("id:1", [entry]))[0]["changed"]
+
+        await store.commit("id:1", results)
+        assert database.commits == 1
+        assert database.writes[0]["simhash"] == _to_signed(entry["simhash"])
+
+        database.rows = [SimpleNamespace(
+            source_url=entry["source_url"], simhash=_to_signed(entry["simhash"]), digest=entry["digest"]
+        )]
+        results = await store.check("id:1", [entry])
+        assert results[0]["distance"] == 0 and not results[0]["changed"] and not results[0]["moved"]
+
+    asyncio.run(main())
+
+
+def test_check_marks_mirrors_in_the_same_crawl_as_duplicates():
+    async def main():
+        facts = {"summary": "Claude Monet was a French painter and a founder of Impressionism."}
+        store = FingerprintStore(session_factory=FakeDatabase(), max_distance=3)
+
+        first, mirror = await store.check("id:2", [
+            _entry("https://a.example/monet", facts),
+            _entry("https://b.example/monet", facts)
+        ])
+
+        assert first["changed"] and first["duplicate_of"] is None
+        assert mirror["duplicate_of"] == "https://a.example/monet" and not mirror["changed"]
+
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+작업 큐 테스트 (SQL 은 PostgreSQL 방언으로 컴파일해 확인)
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import job_queue
+
+
+class RecordingSession:
+    def __init__(self, returned_ids):
+        self.returned_ids = returned_ids
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        ids = self.returned_ids
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: ids))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_requeue_marks_running_steps_of_stale_workflows_failed():
+    async def main():
+        db = RecordingSession([uuid4(), uuid4()])
+        assert await job_queue.requeue_stale_jobs(db, timeout=60) == 2
+
+        requeue, interrupt = db.statements
+        assert "RETURNING agent_jobs.id" in requeue
+        assert "agent_jobs.parent_id IN" in interrupt
+        assert "agent_jobs.status = %(status_1)s" in interrupt
+        assert "agent_jobs.job_type != %(job_type_1)s" in interrupt
+        # 두 UPDATE 가 한 트랜잭션
+        assert db.commits == 1
+
+    asyncio.run(main())
+
+
+def test_requeue_without_stale_workflows_skips_step_update():
+    async def main():
+        db = RecordingSession([])
+        assert await job_queue.requeue_stale_jobs(db, timeout=60) == 0
+        assert len(db.statements) == 1
+        assert db.commits == 1
+
+    asyncio.run(main())
+
+
+class ConditionalUpdateSession:
+    """조건부 UPDATE 를 흉내 내는 세션 (먼저 실행한 호출만 행을 바꿈)"""
+
+    def __init__(self, status: str):
+        self.status = status
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        await asyncio.sleep(0)
+        matched = self.status == "failed"
+        if matched:
+            self.status = statement.compile().params["status"]
+        return SimpleNamespace(scalar_one_or_none=lambda: uuid4() if matched else None)
+
+    async def commit(self):
+        pass
+
+
+def test_concurrent_resume_resets_job_once():
+    async def main():
+        db = ConditionalUpdateSession("failed")
+        job_id = uuid4()
+        results = await asyncio.gather(
+            job_queue.reset_job(db, job_id, "running"),
+            job_queue.reset_job(db, job_id, "running")
+        )
+
+        assert sorted(results) == [False, True]
+        assert db.status == "running"
+        assert all("agent_jobs.status IN" in statement for statement in db.statements)
+        assert all("RETURNING agent_jobs.id" in statement for statement in db.statements)
+
+    asyncio.run(main())
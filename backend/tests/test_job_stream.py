@@ -0,0 +1,133 @@
+"""
+작업 스트림(SSE) 테스트
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import job_stream
+from app.services.job_stream import JobStreamHub
+
+
+class FakeJobs:
+    """
+    agent_jobs 조회를 흉내 내는 세션 팩토리
+
+    rows 는 작업 행 조회마다 차례로 반환할 값(마지막 값은 계속 반환),
+    step_after 는 단계 작업이 조회되기 시작하는 조회 횟수입니다.
+    """
+
+    def __init__(self, rows, step_job_id=None, step_after=0, workflow_status="running"):
+        self.rows = list(rows)
+        self.step_job_id = step_job_id
+        self.step_after = step_after
+        self.workflow_status = workflow_status
+        self.step_polls = 0
+
+    def __call__(self):
+        return FakeJobSession(self)
+
+
+class FakeJobSession:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        jobs = self.jobs
+        if "agent_jobs.step_name" in sql:
+            jobs.step_polls += 1
+            child = jobs.step_job_id if jobs.step_polls > jobs.step_after else None
+            return SimpleNamespace(scalar_one_or_none=lambda: child)
+        if "partial_output" in sql:
+            row = jobs.rows.pop(0) if len(jobs.rows) > 1 else jobs.rows[0]
+            return SimpleNamespace(one_or_none=lambda: row)
+        if sql.startswith("UPDATE"):
+            return SimpleNamespace(rowcount=1)
+        return SimpleNamespace(scalar_one_or_none=lambda: jobs.workflow_status)
+
+    async def commit(self):
+        pass
+
+
+def _row(status, partial=None, output=None):
+    return SimpleNamespace(status=status, partial_output=partial, output_data=output, error_message=None)
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+def test_follow_polls_partial_output_of_another_process():
+    async def main():
+        hub = JobStreamHub(session_factory=FakeJobs([
+            _row("running", "Hel"),
+            _row("running", "Hello"),
+            _row("success", "Hello", {"wiki_content": "Hello"}),
+        ]))
+        return await _collect(hub.follow(uuid4(), poll_interval=0.001))
+
+    events = asyncio.run(main())
+
+    assert events[:2] == [("delta", "Hel"), ("delta", "lo")]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["status"] == "success"
+    assert events[-1][1]["output"] == {"wiki_content": "Hello"}
+
+
+def test_follow_streams_local_draft_before_done():
+    async def main():
+        job_id = uuid4()
+        hub = JobStreamHub(session_factory=FakeJobs([_row("success", None, {"wiki_content": "ab"})]))
+        draft = hub.open(job_id)
+        draft.append("a")
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            draft.append("b")
+            await draft.close()
+
+        producer = asyncio.create_task(produce())
+        events = await _collect(hub.follow(job_id, poll_interval=0.001))
+        await producer
+        return events
+
+    events = asyncio.run(main())
+
+    assert events[:2] == [("snapshot", "a"), ("delta", "b")]
+    assert events[-1][0] == "done" and events[-1][1]["output"] == {"wiki_content": "ab"}
+
+
+def test_waiting_for_a_step_sends_keepalive_pings(monkeypatch):
+    monkeypatch.setattr(job_stream, "PING_INTERVAL", 0.0)
+    step_job_id = uuid4()
+
+    async def main():
+        jobs = FakeJobs([_row("success", "done", {})], step_job_id=step_job_id, step_after=2)
+        hub = JobStreamHub(session_factory=jobs)
+        return await _collect(hub.follow(uuid4(), step="write", poll_interval=0.001))
+
+    events = asyncio.run(main())
+
+    assert events[:2] == [("ping", None), ("ping", None)]
+    assert events[-1][1]["job_id"] == str(step_job_id)
+
+
+def test_step_that_never_ran_ends_the_stream():
+    async def main():
+        hub = JobStreamHub(session_factory=FakeJobs([], workflow_status="failed"))
+        return await _collect(hub.follow(uuid4(), step="write", poll_interval=0.001))
+
+    [(kind, data)] = asyncio.run(main())
+
+    assert kind == "done"
+    assert data["status"] == "failed"
+    assert data["error"] == "Step 'write' did not run"
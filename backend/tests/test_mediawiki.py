@@ -0,0 +1,211 @@
+"""
+MediaWiki 쓰기 스케줄러, 리비전 일괄 조회, 편집 에이전트 테스트
+"""
+from types import SimpleNamespace
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.agents import mediawiki as mediawiki_agent_module
+from app.agents.mediawiki import MediaWikiAgent
+from app.agents.resilience import is_retryable
+from app.services.mediawiki import EditConflictError, MediaWikiAPIError, MediaWikiWriteScheduler, RevisionLoader
+
+
+def test_throttle_codes_are_retried_only_by_the_write_scheduler():
+    async def main():
+        scheduler = MediaWikiWriteScheduler(initial=4.0, max_retries=2, default_pause=0.0)
+        sends = 0
+
+        async def send():
+            nonlocal sends
+            sends += 1
+            raise MediaWikiAPIError({"code": "maxlag", "lag": 7}, retry_after=0.0)
+
+        with pytest.raises(MediaWikiAPIError) as info:
+            await scheduler.run(send)
+
+        assert sends == 3
+        assert scheduler.throttled == 3
+        assert scheduler.limit < 4.0
+        # 오케스트레이터는 같은 오류로 단계를 다시 실행하지 않음
+        assert not is_retryable(info.value)
+
+    asyncio.run(main())
+
+
+def test_write_scheduler_recovers_after_throttle():
+    async def main():
+        scheduler = MediaWikiWriteScheduler(initial=2.0, max_retries=3, default_pause=0.0)
+        responses = [MediaWikiAPIError({"code": "ratelimited"}, retry_after=0.0), {"edit": {"result": "Success"}}]
+
+        async def send():
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        assert await scheduler.run(send) == {"edit": {"result": "Success"}}
+        assert scheduler.completed == 1
+        assert scheduler.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_other_api_errors_are_not_resent():
+    async def main():
+        scheduler = MediaWikiWriteScheduler(max_retries=3, default_pause=0.0)
+        sends = 0
+
+        async def send():
+            nonlocal sends
+            sends += 1
+            raise MediaWikiAPIError({"code": "protectedpage"})
+
+        with pytest.raises(MediaWikiAPIError):
+            await scheduler.run(send)
+        assert sends == 1
+        assert scheduler.in_flight == 0
+
+    asyncio.run(main())
+
+
+class _FakeReader:
+    def __init__(self, error: Exception = None, delay: float = 0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = []
+
+    async def read_pages(self, titles, content=True):
+        self.calls.append(list(titles))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {title: {"page_title": title, "exists": True, "sha1": title.lower()} for title in titles}
+
+
+def test_revision_loader_batches_concurrent_lookups():
+    async def main():
+        reader = _FakeReader()
+        loader = RevisionLoader(reader, window=0.01)
+
+        pages = await asyncio.gather(loader.load("A"), loader.load("B"), loader.load("A"))
+        assert [page["sha1"] for page in pages] == ["a", "b", "a"]
+        assert reader.calls == [["A", "B"]]
+        assert not loader._tasks
+
+    asyncio.run(main())
+
+
+def test_revision_loader_fails_every_waiter_on_error():
+    async def main():
+        loader = RevisionLoader(_FakeReader(error=RuntimeError("wiki down")), window=0.01)
+
+        results = await asyncio.gather(loader.load("A"), loader.load("B"), return_exceptions=True)
+        assert [str(result) for result in results] == ["wiki down", "wiki down"]
+        assert not loader._tasks
+
+    asyncio.run(main())
+
+
+def test_revision_loader_fails_waiters_when_fetch_is_cancelled():
+    async def main():
+        loader = RevisionLoader(_FakeReader(delay=10), window=0.0)
+
+        waiter = asyncio.create_task(loader.load("A"))
+        await asyncio.sleep(0.01)
+        for task in list(loader._tasks):
+            task.cancel()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+    asyncio.run(main())
+
+
+class FakeEditSession:
+    def __init__(self, response):
+        self.response = response
+        self.posts = []
+
+    async def post(self, data):
+        self.posts.append(data)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class FakeRecordSession:
+    """편집 후 작가/작품 행 기록 쿼리를 모으는 세션"""
+
+    def __init__(self, statements, linked_ids=()):
+        self.statements = statements
+        self.linked_ids = list(linked_ids)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if str(statement).startswith("SELECT"):
+            ids = self.linked_ids
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: ids))
+        return SimpleNamespace(rowcount=1)
+
+    async def commit(self):
+        pass
+
+
+class FakeRenderedPages:
+    def __init__(self):
+        self.invalidated = []
+
+    async def invalidate(self, page_id=None, revision_id=None, page_title=None):
+        self.invalidated.append((page_id, revision_id, page_title))
+
+
+BASE_REVISION = {"exists": True, "page_id": 7, "revision_id": 70, "sha1": "old", "timestamp": "2026-10-18T00:00:00Z"}
+
+
+def test_edit_conflict_fails_the_step_without_retry(monkeypatch):
+    rendered = FakeRenderedPages()
+    monkeypatch.setattr(mediawiki_agent_module, "rendered_pages", rendered)
+    statements = []
+    agent = MediaWikiAgent(
+        session=FakeEditSession(MediaWikiAPIError({"code": "editconflict"})),
+        session_factory=lambda: FakeRecordSession(statements)
+    )
+
+    with pytest.raises(EditConflictError) as info:
+        asyncio.run(agent.execute({
+            "action": "edit", "page_title": "Pablo Picasso", "content": "new text", "base_revision": BASE_REVISION
+        }))
+
+    assert str(info.value) == "Edit conflict on Pablo Picasso: editconflict"
+    assert not is_retryable(info.value)
+    assert rendered.invalidated == [(7, None, "Pablo Picasso")]
+    assert statements == []
+
+
+def test_successful_edit_reports_the_new_revision(monkeypatch):
+    monkeypatch.setattr(mediawiki_agent_module, "rendered_pages", FakeRenderedPages())
+    session = FakeEditSession({"edit": {"result": "Success", "pageid": 7, "newrevid": 71}})
+    statements = []
+    agent = MediaWikiAgent(session=session, session_factory=lambda: FakeRecordSession(statements, linked_ids=[1]))
+
+    result = asyncio.run(agent.execute({
+        "action": "edit", "page_title": "Pablo Picasso", "content": "new text", "base_revision": BASE_REVISION
+    }))
+
+    assert result["outcome"] == "edited" and result["revision_id"] == 71
+    assert session.posts[0]["basetimestamp"] == BASE_REVISION["timestamp"]
+
+    # 다른 프로세스의 렌더링 캐시가 새 리비전을 쓰도록 작가/작품 행에 기록
+    updates = [statement for statement in statements if not str(statement).startswith("SELECT")]
+    assert len(updates) == 2
+    params = updates[0].compile(dialect=postgresql.dialect()).params
+    assert params["mediawiki_revision_id"] == 71 and params["mediawiki_content"] == "new text"
@@ -0,0 +1,252 @@
+"""
+AgentOrchestrator 워크플로우 테스트
+"""
+from uuid import UUID
+import asyncio
+
+from app.agents import orchestrator as orchestrator_module
+from app.agents.base import BaseAgent
+from app.agents.orchestrator import AgentOrchestrator
+
+from tests.conftest import MemoryRecorder, StaticAgent
+
+
+class FakeFingerprintStore:
+    def __init__(self):
+        self.commits = []
+
+    async def commit(self, artist_key, pages):
+        self.commits.append((artist_key, pages))
+
+
+BASELINE = {"artist_key": "id:1", "pages": [{"source_url": "u", "fingerprint": "00", "digest": "d", "moved": True}]}
+WORKFLOW = [
+    {"name": "crawl", "agent_type": "crawler", "depends_on": []},
+    {"name": "write", "agent_type": "writer", "depends_on": ["crawl"]}
+]
+
+
+def _run(monkeypatch, writer):
+    store = FakeFingerprintStore()
+    monkeypatch.setattr(orchestrator_module, "fingerprint_store", store)
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=MemoryRecorder())
+    orchestrator.register_agent("crawler", StaticAgent("crawler", {"unchanged": False, "fingerprint_baseline": BASELINE}))
+    orchestrator.register_agent("writer", writer)
+    result = asyncio.run(orchestrator.execute_workflow(WORKFLOW, use_cache=False))
+    return result, store
+
+
+def test_fingerprint_baseline_is_committed_after_workflow_succeeds(monkeypatch):
+    result, store = _run(monkeypatch, StaticAgent("writer", {"wiki_content": "..."}))
+    assert result["status"] == "completed"
+    assert store.commits == [("id:1", BASELINE["pages"])]
+
+
+def test_fingerprint_baseline_is_not_committed_when_a_later_step_fails(monkeypatch):
+    result, store = _run(monkeypatch, StaticAgent("writer", error=ValueError("bad facts")))
+    assert result["status"] == "failed"
+    assert store.commits == []
+
+
+def test_fingerprint_baseline_is_not_committed_after_an_edit_conflict(monkeypatch):
+    result, store = _run(monkeypatch, StaticAgent("writer", {"outcome": "conflict", "page_title": "Pablo Picasso"}))
+    assert result["status"] == "completed"
+    assert store.commits == []
+
+
+class FailingStepRecorder(MemoryRecorder):
+    """단계 작업 기록에 실패하는 기록기 (execute_task 밖으로 예외가 나감)"""
+
+    async def start(self, job):
+        if job.parent_id is not None:
+            raise RuntimeError("recorder unavailable")
+        await super().start(job)
+
+
+class SlowAgent(BaseAgent):
+    def __init__(self, name):
+        super().__init__(name)
+        self.cancelled = False
+
+    async def execute(self, task_data):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {}
+
+
+def test_step_exception_fails_the_step_and_the_workflow():
+    recorder = FailingStepRecorder()
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=recorder)
+    orchestrator.register_agent("crawler", StaticAgent("crawler"))
+
+    result = asyncio.run(orchestrator.execute_workflow(WORKFLOW[:1], use_cache=False))
+
+    assert result["status"] == "failed"
+    assert result["results"] == [{"status": "error", "error": "recorder unavailable", "step": "crawl"}]
+    workflow_job = recorder.jobs[UUID(result["workflow_id"])]
+    assert workflow_job["status"] == "failed"
+    assert workflow_job["error_message"] == "recorder unavailable"
+
+
+def test_cancelled_workflow_cancels_running_steps_and_is_recorded_as_failed():
+    recorder = MemoryRecorder()
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=recorder)
+    slow = SlowAgent("crawler")
+    orchestrator.register_agent("crawler", slow)
+    orchestrator.register_agent("writer", StaticAgent("writer"))
+
+    async def main():
+        task = asyncio.create_task(orchestrator.execute_workflow(WORKFLOW, use_cache=False))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(main())
+
+    assert slow.cancelled
+    [workflow_job] = [job for job in recorder.jobs.values() if job["status"] == "failed"]
+    assert workflow_job["error_message"] == "Workflow interrupted before all steps finished"
+
+
+class TracingAgent(BaseAgent):
+    """단계 시작/종료 순서와 동시 실행 수를 기록 (task_data["label"] 로 단계 구분)"""
+
+    def __init__(self, name, delay=0.02):
+        super().__init__(name)
+        self.delay = delay
+        self.events = []
+        self.inputs = {}
+        self.active = 0
+        self.max_active = 0
+
+    async def execute(self, task_data):
+        label = task_data["label"]
+        self.inputs[label] = task_data
+        self.events.append(("start", label))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        self.events.append(("end", label))
+        return {"from": label, label: True}
+
+
+def _trace(workflow, max_parallel=None):
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=MemoryRecorder())
+    agent = TracingAgent("tracer")
+    orchestrator.register_agent("tracer", agent)
+    result = asyncio.run(orchestrator.execute_workflow(
+        workflow, context={"artist_name": "Claude Monet"}, max_parallel=max_parallel, use_cache=False
+    ))
+    return result, agent
+
+
+def _step(name, depends_on=None, **values):
+    return {"name": name, "agent_type": "tracer", "depends_on": depends_on, "task_data": {"label": name}, **values}
+
+
+def test_dag_runs_independent_steps_together_and_dependents_after():
+    workflow = [
+        _step("wikipedia", []),
+        _step("museum", []),
+        _step("draft", ["wikipedia", "museum"]),
+    ]
+    result, agent = _trace(workflow)
+
+    assert result["status"] == "completed"
+    assert [r["step"] for r in result["results"]] == ["wikipedia", "museum", "draft"]
+    assert agent.max_active == 2
+    # draft 는 두 선행 단계가 모두 끝난 뒤 시작
+    draft_start = agent.events.index(("start", "draft"))
+    assert ("end", "wikipedia") in agent.events[:draft_start]
+    assert ("end", "museum") in agent.events[:draft_start]
+    # 선행 단계 출력은 depends_on 순서대로 평탄화되어 병합되고 단계 이름으로도 전달
+    assert agent.inputs["draft"]["from"] == "museum"
+    assert agent.inputs["draft"]["wikipedia"] == {"from": "wikipedia", "wikipedia": True}
+    assert result["context"]["draft"]["from"] == "draft"
+
+
+def test_max_parallel_limits_fan_out():
+    workflow = [_step(f"source_{index}", []) for index in range(5)]
+    result, agent = _trace(workflow, max_parallel=2)
+
+    assert result["status"] == "completed"
+    assert len(result["results"]) == 5
+    assert agent.max_active == 2
+
+
+def test_steps_without_depends_on_run_in_definition_order():
+    workflow = [
+        {"agent_type": "tracer", "task_data": {"label": "first"}},
+        {"agent_type": "tracer", "task_data": {"label": "second"}},
+    ]
+    result, agent = _trace(workflow)
+
+    assert result["status"] == "completed"
+    assert agent.events == [("start", "first"), ("end", "first"), ("start", "second"), ("end", "second")]
+    # 순차 모드에서는 앞선 모든 단계의 출력이 평탄화되어 병합
+    assert agent.inputs["second"]["first"] is True
+    assert agent.inputs["second"]["artist_name"] == "Claude Monet"
+
+
+def test_failed_step_stops_dependents():
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=MemoryRecorder())
+    tracer = TracingAgent("tracer")
+    orchestrator.register_agent("tracer", tracer)
+    orchestrator.register_agent("broken", StaticAgent("broken", error=ValueError("no page")))
+    workflow = [
+        {"name": "crawl", "agent_type": "broken", "depends_on": []},
+        _step("write", ["crawl"]),
+    ]
+
+    result = asyncio.run(orchestrator.execute_workflow(workflow, use_cache=False))
+
+    assert result["status"] == "failed"
+    assert [r["step"] for r in result["results"]] == ["crawl"]
+    assert tracer.events == []
+
+
+def test_inputs_mapping_passes_only_referenced_values_and_adds_dependencies():
+    workflow = [
+        _step("wikipedia", []),
+        _step("museum", []),
+        _step("draft", [], inputs={
+            "source": "wikipedia.output",
+            "origin": "museum.output.from",
+            "artist": "context.artist_name",
+            "missing": "museum.output.nothing.here",
+        }),
+    ]
+    result, agent = _trace(workflow)
+
+    assert result["status"] == "completed"
+    # inputs 가 참조한 단계는 depends_on 에 없어도 먼저 실행
+    draft_start = agent.events.index(("start", "draft"))
+    assert ("end", "wikipedia") in agent.events[:draft_start]
+    assert ("end", "museum") in agent.events[:draft_start]
+    assert agent.inputs["draft"] == {
+        "label": "draft",
+        "source": {"from": "wikipedia", "wikipedia": True},
+        "origin": "museum",
+        "artist": "Claude Monet",
+        "missing": None,
+    }
+
+
+def test_invalid_inputs_reference_is_rejected():
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=MemoryRecorder())
+
+    try:
+        orchestrator._build_graph([_step("draft", [], inputs={"source": "wikipedia"})])
+    except ValueError as e:
+        assert "invalid input reference 'wikipedia'" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
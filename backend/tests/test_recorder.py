@@ -0,0 +1,124 @@
+"""
+BufferedJobRecorder 테스트
+"""
+from uuid import uuid4
+import asyncio
+
+from app.agents.recorder import BufferedJobRecorder
+from app.models.agent_job import AgentJob
+
+
+class FakeDatabase:
+    """execute 호출을 기록하고 available 이 False 면 커밋에서 실패하는 세션 팩토리"""
+
+    def __init__(self):
+        self.available = True
+        self.executes = 0
+        self.commits = 0
+        self.rows = 0
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, database: FakeDatabase):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.database.executes += 1
+        if not self.database.available:
+            raise ConnectionError("database unavailable")
+        self.database.rows += len(params or [])
+
+    async def commit(self):
+        self.database.commits += 1
+
+
+def _job() -> AgentJob:
+    return AgentJob(id=uuid4(), job_type="crawler", status="running")
+
+
+def test_start_and_finish_before_flush_is_one_insert():
+    async def main():
+        database = FakeDatabase()
+        recorder = BufferedJobRecorder(database, batch_size=10, flush_interval=60)
+        job = _job()
+        await recorder.start(job)
+        await recorder.finish(job.id, status="success")
+        await recorder.close()
+
+        assert database.executes == 1
+        assert database.rows == 1
+        assert recorder.stats()["rows_written"] == 1
+
+    asyncio.run(main())
+
+
+def test_failed_flush_restores_rows_and_backs_off():
+    async def main():
+        database = FakeDatabase()
+        database.available = False
+        recorder = BufferedJobRecorder(database, batch_size=2, flush_interval=0.05)
+
+        jobs = [_job() for _ in range(10)]
+        for job in jobs:
+            await recorder.start(job)
+
+        # 첫 실패 뒤에는 버퍼가 batch_size 이상이어도 바로 다시 기록하지 않음
+        assert database.executes == 1
+        assert recorder.failures == 1
+        assert recorder.pending == 10
+
+        await recorder.finish(jobs[0].id, status="success")
+        assert database.executes == 1
+
+        database.available = True
+        await asyncio.sleep(0.2)
+        assert recorder.pending == 0
+        assert database.rows == 10
+        await recorder.close()
+
+    asyncio.run(main())
+
+
+def test_later_changes_win_over_restored_rows():
+    async def main():
+        database = FakeDatabase()
+        recorder = BufferedJobRecorder(database, batch_size=100, flush_interval=60)
+        job = _job()
+        await recorder.start(job)
+        await recorder.flush()
+
+        await recorder.finish(job.id, status="running", attempts=1)
+        database.available = False
+        await recorder.flush()
+        await recorder.finish(job.id, status="success")
+
+        assert recorder._updates[job.id] == {"status": "success", "attempts": 1}
+        await recorder.close()
+
+    asyncio.run(main())
+
+
+def test_restored_buffer_is_capped():
+    async def main():
+        database = FakeDatabase()
+        database.available = False
+        recorder = BufferedJobRecorder(database, batch_size=100, flush_interval=60, max_pending=3)
+
+        for _ in range(5):
+            await recorder.start(_job())
+        await recorder.flush()
+
+        assert recorder.pending == 3
+        assert recorder.dropped == 2
+        recorder._flusher.cancel()
+
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+RenderedPageCache 테스트
+"""
+import asyncio
+
+import pytest
+
+from app.services.cache import MemoryCacheBackend
+from app.services.rendered_pages import RenderedPageCache
+
+
+class FakeWiki:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def get(self, params):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"parse": {
+            "pageid": 1,
+            "revid": 10,
+            "title": "Pablo Picasso",
+            "displaytitle": "Pablo Picasso",
+            "text": "<p>Picasso</p>"
+        }}
+
+
+def test_concurrent_misses_render_once():
+    async def main():
+        wiki = FakeWiki()
+        cache = RenderedPageCache(MemoryCacheBackend(1_000_000), wiki=wiki)
+
+        pages = await asyncio.gather(*(cache.get(page_id=1) for _ in range(3)))
+        assert wiki.calls == 1
+        assert all(page["revision_id"] == 10 for page in pages)
+
+        await cache.get(page_id=1)
+        assert wiki.calls == 1
+        assert cache.stats()["memory_hits"] == 1
+
+    asyncio.run(main())
+
+
+def test_reader_is_not_stranded_by_cancelled_render():
+    async def main():
+        wiki = FakeWiki()
+        cache = RenderedPageCache(MemoryCacheBackend(1_000_000), wiki=wiki)
+
+        first = asyncio.create_task(cache.get(page_id=1))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get(page_id=1))
+        await asyncio.sleep(0)
+
+        # 클라이언트 연결 종료 등으로 먼저 시작한 요청이 취소됨
+        first.cancel()
+        page = await asyncio.wait_for(second, timeout=1)
+        assert page["html"] == "<p>Picasso</p>"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        # 이후 조회도 멈추지 않음
+        assert (await asyncio.wait_for(cache.get(page_id=1), timeout=1))["page_id"] == 1
+
+    asyncio.run(main())
+
+
+def test_observed_latest_revision_expires_after_ttl():
+    async def main():
+        wiki = FakeWiki(delay=0)
+        cache = RenderedPageCache(MemoryCacheBackend(1_000_000), wiki=wiki, latest_ttl=0.0)
+
+        await cache.get(page_id=1)
+        await cache.get(page_id=1)
+        # DB 에 리비전이 없으면 관찰한 리비전이 만료된 뒤 최신 리비전을 다시 확인
+        assert wiki.calls == 2
+
+        # DB 에 기록된 리비전은 TTL 과 관계없이 캐시 항목을 사용
+        await cache.get(page_id=1, revision_id=10)
+        assert wiki.calls == 2
+
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+"""
+재시도 판별 및 서킷 브레이커 테스트
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.agents.resilience import CircuitBreaker, CircuitOpenError, is_retryable
+from app.services.mediawiki import MediaWikiAPIError, MediaWikiSession
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://wiki.test/api.php")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def _call(breaker: CircuitBreaker, error: Exception = None) -> None:
+    with breaker.guard():
+        if error is not None:
+            raise error
+
+
+def test_is_retryable():
+    assert is_retryable(_status_error(503))
+    assert is_retryable(httpx.ConnectTimeout("timeout"))
+    assert is_retryable(MediaWikiAPIError({"code": "readonly"}))
+    assert not is_retryable(_status_error(404))
+    assert not is_retryable(ValueError("bad input"))
+    assert not is_retryable(CircuitOpenError("writer", 1.0))
+
+
+def test_breaker_opens_after_consecutive_retryable_failures():
+    breaker = CircuitBreaker("writer", failure_threshold=2, reset_timeout=60.0)
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            _call(breaker, _status_error(503))
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        _call(breaker)
+    assert breaker.rejected == 1
+
+
+def test_non_retryable_error_does_not_reset_failures():
+    breaker = CircuitBreaker("writer", failure_threshold=2, reset_timeout=60.0)
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(breaker, _status_error(503))
+    with pytest.raises(ValueError):
+        _call(breaker, ValueError("bad input"))
+    assert breaker.failures == 1
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(breaker, _status_error(503))
+    assert breaker.state == "open"
+
+
+def test_half_open_probe_success_closes():
+    breaker = CircuitBreaker("writer", failure_threshold=1, reset_timeout=0.0)
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(breaker, _status_error(503))
+    assert breaker.state == "open"
+
+    _call(breaker)
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_half_open_probe_failure_reopens():
+    breaker = CircuitBreaker("writer", failure_threshold=1, reset_timeout=0.0)
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(breaker, _status_error(503))
+    with pytest.raises(httpx.HTTPStatusError):
+        _call(breaker, _status_error(502))
+    assert breaker.state == "open"
+
+
+def test_only_one_probe_in_half_open():
+    async def main():
+        breaker = CircuitBreaker("writer", failure_threshold=1, reset_timeout=0.0)
+        with pytest.raises(httpx.HTTPStatusError):
+            _call(breaker, _status_error(503))
+
+        release = asyncio.Event()
+
+        async def probe():
+            with breaker.guard():
+                await release.wait()
+
+        task = asyncio.create_task(probe())
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            _call(breaker)
+
+        release.set()
+        await task
+        assert breaker.state == "closed"
+
+    asyncio.run(main())
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    async def main():
+        breaker = CircuitBreaker("writer", failure_threshold=1, reset_timeout=0.0)
+        with pytest.raises(httpx.HTTPStatusError):
+            _call(breaker, _status_error(503))
+
+        async def probe():
+            with breaker.guard():
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(probe())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # 취소된 시험 호출 뒤에도 다음 호출이 시험할 수 있음
+        assert breaker.state == "half_open"
+        _call(breaker)
+        assert breaker.state == "closed"
+
+    asyncio.run(main())
+
+
+class _MockSession(MediaWikiSession):
+    def __init__(self, handler):
+        super().__init__("http://wiki.test/api.php", oauth_token="token")
+        self._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client
+
+
+def test_mediawiki_server_error_is_retryable():
+    async def main():
+        session = _MockSession(lambda request: httpx.Response(503, text="<html>Maintenance</html>"))
+        with pytest.raises(httpx.HTTPStatusError) as info:
+            await session.get({"action": "query"})
+        assert is_retryable(info.value)
+
+    asyncio.run(main())
+
+
+def test_mediawiki_api_error_keeps_code():
+    async def main():
+        session = _MockSession(
+            lambda request: httpx.Response(200, json={"error": {"code": "readonly", "info": "locked"}})
+        )
+        with pytest.raises(MediaWikiAPIError) as info:
+            await session.get({"action": "query"})
+        assert info.value.code == "readonly"
+
+    asyncio.run(main())
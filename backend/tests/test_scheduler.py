@@ -0,0 +1,78 @@
+"""
+AgentSchedule 테스트
+"""
+import asyncio
+
+from app.agents.scheduler import AgentSchedule, TokenBucket
+
+
+def test_token_bucket_reserves_in_order():
+    bucket = TokenBucket(rate=10.0, capacity=10.0)
+    assert bucket.reserve(10) == 0.0
+    # 잔량이 음수가 되며, 뒤에 예약한 호출일수록 더 오래 대기
+    first = bucket.reserve(5)
+    second = bucket.reserve(5)
+    assert 0.4 < first < second <= 1.0
+
+
+def test_waiting_calls_are_assigned_round_robin_by_fair_key():
+    async def main():
+        schedule = AgentSchedule("writer", max_in_flight=1)
+        order = []
+
+        async def call(fair_key, index):
+            await schedule.acquire(fair_key)
+            order.append((fair_key, index))
+            await asyncio.sleep(0)
+            schedule.release()
+
+        await schedule.acquire("holder")
+        tasks = [asyncio.create_task(call("batch", index)) for index in range(3)]
+        tasks.append(asyncio.create_task(call("other", 0)))
+        await asyncio.sleep(0)
+        assert schedule.queued == 4
+
+        schedule.release()
+        await asyncio.gather(*tasks)
+
+        # 큰 배치가 먼저 쌓였어도 다른 워크플로우의 호출이 두 번째로 배정됨
+        assert order[:2] == [("batch", 0), ("other", 0)]
+        assert schedule.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_leak_the_slot():
+    async def main():
+        schedule = AgentSchedule("crawler", max_in_flight=1)
+        await schedule.acquire("a")
+
+        waiter = asyncio.create_task(schedule.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert schedule.queued == 0
+
+        schedule.release()
+        assert schedule.in_flight == 0
+        await asyncio.wait_for(schedule.acquire("c"), timeout=1)
+        assert schedule.in_flight == 1
+
+    asyncio.run(main())
+
+
+def test_waiter_cancelled_after_assignment_returns_the_slot():
+    async def main():
+        schedule = AgentSchedule("crawler", max_in_flight=1)
+        await schedule.acquire("a")
+
+        waiter = asyncio.create_task(schedule.acquire("b"))
+        await asyncio.sleep(0)
+        # 슬롯을 배정받았지만 실행되기 전에 취소
+        schedule.release()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert schedule.in_flight == 0
+
+    asyncio.run(main())
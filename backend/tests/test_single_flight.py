@@ -0,0 +1,131 @@
+"""
+SingleFlight 및 이를 사용하는 LLM 응답 캐시 테스트
+"""
+from types import SimpleNamespace
+import asyncio
+
+import pytest
+
+from app.services.cache import MemoryCacheBackend, SingleFlight
+from app.services.llm_cache import LLMResponseCache
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flights = SingleFlight()
+        calls = 0
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flights.run("key", func) for _ in range(3)))
+        assert calls == 1
+        assert sorted(shared for _, shared in results) == [False, True, True]
+        assert all(value == "value" for value, _ in results)
+        assert len(flights) == 0
+
+    asyncio.run(main())
+
+
+def test_owner_exception_is_shared():
+    async def main():
+        flights = SingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flights.run("key", func), flights.run("key", func), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(flights) == 0
+
+    asyncio.run(main())
+
+
+def test_waiter_takes_over_when_owner_is_cancelled():
+    async def main():
+        flights = SingleFlight()
+        calls = 0
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        owner = asyncio.create_task(flights.run("key", func))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.run("key", func))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        value, shared = await asyncio.wait_for(waiter, timeout=1)
+        assert (value, shared) == (2, False)
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        assert len(flights) == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_affect_owner():
+    async def main():
+        flights = SingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.02)
+            return "value"
+
+        owner = asyncio.create_task(flights.run("key", func))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.run("key", func))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await owner == ("value", False)
+
+    asyncio.run(main())
+
+
+def _completion(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+        model="gpt-4"
+    )
+
+
+def test_llm_cache_coalesced_call_survives_owner_cancellation():
+    async def main():
+        cache = LLMResponseCache(MemoryCacheBackend(1_000_000), mode="read_write")
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _completion(f"response {calls}")
+
+        messages = [{"role": "user", "content": "prompt"}]
+        owner = asyncio.create_task(cache.complete(create, model="gpt-4", messages=messages))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.complete(create, model="gpt-4", messages=messages))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        response = await asyncio.wait_for(waiter, timeout=1)
+        assert response["content"] == "response 2"
+        assert response["cached"] is False
+
+        again = await cache.complete(create, model="gpt-4", messages=messages)
+        assert again["cached"] is True
+        assert calls == 2
+
+    asyncio.run(main())
@@ -0,0 +1,235 @@
+"""
+recentchanges 동기화 테스트
+"""
+from types import SimpleNamespace
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.wiki_sync import RecentChangesSync, _classify
+
+
+def _change(rcid, timestamp="2026-10-18T10:00:00Z", **values):
+    return {"rcid": rcid, "timestamp": timestamp, "type": "edit", "pageid": rcid * 10, "title": f"Page {rcid}", **values}
+
+
+class FakeWiki:
+    """recentchanges 응답을 rclimit 개씩 나눠 반환"""
+
+    def __init__(self, changes, page_size=2, database=None, delay=0.0):
+        self.changes = changes
+        self.delay = delay
+        self.page_size = page_size
+        self.database = database
+        self.requests = []
+
+    async def get(self, params):
+        self._check_unlocked()
+        self.requests.append(dict(params))
+        await asyncio.sleep(self.delay)
+        start = int(params.get("rccontinue", 0))
+        batch = self.changes[start:start + self.page_size]
+        result = {"query": {"recentchanges": batch}}
+        if start + self.page_size < len(self.changes):
+            result["continue"] = {"rccontinue": str(start + self.page_size)}
+        return result
+
+    async def read_pages(self, pageids=None, **kwargs):
+        self._check_unlocked()
+        return {
+            page_id: {"page_id": page_id, "page_title": f"Page {page_id // 10}", "exists": True,
+                      "revision_id": page_id + 1, "content": "text"}
+            for page_id in pageids
+        }
+
+    def _check_unlocked(self):
+        # 위키 조회 중에는 동기화 상태 행 잠금을 잡고 있으면 안 됨
+        assert self.database is None or not self.database.locked
+
+
+def test_read_changes_skips_processed_rcids_and_follows_continue():
+    async def main():
+        wiki = FakeWiki([_change(5), _change(6), _change(7, "2026-10-18T10:01:00Z")])
+        sync = RecentChangesSync(session_factory=None, wiki=wiki, namespaces="0", max_changes=100)
+
+        changes, cursor = await sync._read_changes({"timestamp": "2026-10-18T10:00:00Z", "rcid": 5})
+
+        assert [change["rcid"] for change in changes] == [6, 7]
+        assert cursor == {"timestamp": "2026-10-18T10:01:00Z", "rcid": 7}
+        assert wiki.requests[0]["rcstart"] == "2026-10-18T10:00:00Z"
+        assert "rcstart" not in wiki.requests[1] and wiki.requests[1]["rccontinue"] == "2"
+
+    asyncio.run(main())
+
+
+def test_read_changes_stops_at_max_changes_and_resumes_from_continue():
+    async def main():
+        wiki = FakeWiki([_change(rcid) for rcid in range(1, 6)])
+        sync = RecentChangesSync(session_factory=None, wiki=wiki, namespaces="0", max_changes=2)
+
+        changes, cursor = await sync._read_changes({"timestamp": "2026-10-18T09:00:00Z", "rcid": 0})
+        assert [change["rcid"] for change in changes] == [1, 2]
+        assert cursor["rccontinue"] == "2"
+
+        changes, cursor = await sync._read_changes(cursor)
+        assert wiki.requests[1]["rccontinue"] == "2"
+        assert [change["rcid"] for change in changes] == [3, 4]
+
+    asyncio.run(main())
+
+
+def test_read_changes_without_new_changes_keeps_cursor():
+    async def main():
+        wiki = FakeWiki([_change(5)])
+        sync = RecentChangesSync(session_factory=None, wiki=wiki, namespaces="0", max_changes=100)
+        cursor = {"timestamp": "2026-10-18T10:00:00Z", "rcid": 5}
+
+        assert await sync._read_changes(cursor) == ([], cursor)
+
+    asyncio.run(main())
+
+
+def test_classify_separates_deletions_from_page_changes():
+    changed_ids, deleted_titles = _classify([
+        _change(1),
+        _change(2, type="new"),
+        {"rcid": 3, "type": "log", "logtype": "delete", "logaction": "delete", "title": "Gone", "pageid": 0},
+        {"rcid": 4, "type": "log", "logtype": "move", "logaction": "move", "title": "Moved", "pageid": 40},
+        {"rcid": 5, "type": "log", "logtype": "delete", "logaction": "restore", "title": "Back", "pageid": 50},
+    ])
+
+    assert changed_ids == {10, 20, 40, 50}
+    assert deleted_titles == {"Gone"}
+
+
+class FakeDatabase:
+    """sync_state 행 하나와 그 잠금을 흉내 내는 세션 팩토리"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.locked = False
+        self.claimed = False
+        self.applied = 0
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+        self.state = None
+        self.claimed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.rollback()
+        return False
+
+    async def execute(self, statement, params=None):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        if "pg_try_advisory_xact_lock" in sql:
+            claimed = not self.database.claimed
+            if claimed:
+                self.database.claimed = self.claimed = True
+            return SimpleNamespace(scalar=lambda: claimed)
+        if "FOR UPDATE" in sql:
+            if self.database.locked:
+                return SimpleNamespace(scalar_one_or_none=lambda: None)
+            self.database.locked = True
+            self.state = SimpleNamespace(cursor=dict(self.database.cursor))
+            return SimpleNamespace(scalar_one_or_none=lambda: self.state)
+        if sql.startswith("SELECT sync_state.cursor"):
+            return SimpleNamespace(scalar_one_or_none=lambda: dict(self.database.cursor))
+        if sql.startswith("UPDATE"):
+            self.database.applied += 1
+        return SimpleNamespace(all=lambda: [], rowcount=0)
+
+    async def commit(self):
+        if self.state is not None:
+            self.database.cursor = self.state.cursor
+        self.database.locked = False
+        self._release_claim()
+
+    async def rollback(self):
+        self.database.locked = False
+        self._release_claim()
+
+    def _release_claim(self):
+        if self.claimed:
+            self.claimed = self.database.claimed = False
+
+
+def test_run_fetches_without_holding_the_state_lock():
+    async def main():
+        database = FakeDatabase({"timestamp": "2026-10-18T09:00:00Z", "rcid": 0})
+        wiki = FakeWiki([_change(1), _change(2), _change(3)], database=database)
+        sync = RecentChangesSync(session_factory=database, wiki=wiki, namespaces="0", max_changes=100)
+
+        stats = await sync.run()
+
+        assert stats["status"] == "synced"
+        assert stats["changes"] == 3
+        assert database.cursor == {"timestamp": "2026-10-18T10:00:00Z", "rcid": 3}
+        assert not database.locked
+
+    asyncio.run(main())
+
+
+def test_run_does_not_apply_when_cursor_moved_during_fetch():
+    async def main():
+        database = FakeDatabase({"timestamp": "2026-10-18T09:00:00Z", "rcid": 0})
+        wiki = FakeWiki([_change(1)], database=database)
+        sync = RecentChangesSync(session_factory=database, wiki=wiki, namespaces="0", max_changes=100)
+
+        original_read = sync._read_changes
+
+        async def read_changes(cursor):
+            result = await original_read(cursor)
+            # 조회하는 동안 다른 실행이 먼저 적용
+            database.cursor = {"timestamp": "2026-10-18T10:00:00Z", "rcid": 1}
+            return result
+
+        sync._read_changes = read_changes
+        stats = await sync.run()
+
+        assert stats == {"status": "busy"}
+        assert database.applied == 0
+        assert database.cursor == {"timestamp": "2026-10-18T10:00:00Z", "rcid": 1}
+
+    asyncio.run(main())
+
+
+def test_first_run_initializes_cursor_without_reading_changes():
+    async def main():
+        database = FakeDatabase({})
+        wiki = FakeWiki([_change(1)], database=database)
+        sync = RecentChangesSync(session_factory=database, wiki=wiki, namespaces="0", max_changes=100)
+
+        stats = await sync.run()
+
+        assert stats["status"] == "initialized"
+        assert database.cursor["rcid"] == 0
+        assert wiki.requests == []
+
+    asyncio.run(main())
+
+
+def test_concurrent_runs_read_the_wiki_once():
+    async def main():
+        database = FakeDatabase({"timestamp": "2026-10-18T09:00:00Z", "rcid": 0})
+        wiki = FakeWiki([_change(1), _change(2)], page_size=10, database=database, delay=0.01)
+        syncs = [
+            RecentChangesSync(session_factory=database, wiki=wiki, namespaces="0", max_changes=100)
+            for _ in range(3)
+        ]
+
+        results = await asyncio.gather(*(sync.run() for sync in syncs))
+
+        assert sorted(result["status"] for result in results) == ["busy", "busy", "synced"]
+        assert len(wiki.requests) == 1
+        assert not database.claimed
+
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+WriterAgent 섹션 모드 스케줄링 테스트
+"""
+import asyncio
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.scheduler import AgentScheduler
+from app.agents.writer import BODY_SECTIONS, WriterAgent
+
+from tests.conftest import MemoryRecorder
+
+
+class CountingWriter(WriterAgent):
+    """LLM 대신 잠시 기다렸다 응답하며 동시 요청 수를 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+
+    async def _complete(self, prompt, max_tokens, label, sink=None):
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            return f"Text for {label}."
+        finally:
+            self.active -= 1
+
+
+def _run_sectioned(max_in_flight, jobs=1):
+    orchestrator = AgentOrchestrator(session_factory=None, recorder=MemoryRecorder())
+    orchestrator.scheduler = AgentScheduler(
+        max_in_flight={"writer": max_in_flight}, requests_per_second={}, tokens_per_minute={}
+    )
+    writer = CountingWriter()
+    orchestrator.register_agent("writer", writer)
+
+    async def main():
+        return await asyncio.gather(*(
+            orchestrator.execute_task(
+                "writer",
+                {"artist_name": f"Artist {index}", "sectioned": True, "stream": False},
+                use_cache=False
+            )
+            for index in range(jobs)
+        ))
+
+    results = asyncio.run(asyncio.wait_for(main(), timeout=5))
+    return results, writer, orchestrator.scheduler.get_schedule("writer")
+
+
+def test_section_requests_share_the_writer_in_flight_limit():
+    results, writer, schedule = _run_sectioned(max_in_flight=2, jobs=3)
+
+    assert all(result["status"] == "success" for result in results)
+    assert writer.requests == 3 * (len(BODY_SECTIONS) + 1)
+    assert writer.max_active == 2
+    assert schedule.calls == writer.requests and schedule.in_flight == 0
+
+
+def test_single_writer_slot_does_not_deadlock_sections():
+    results, writer, _ = _run_sectioned(max_in_flight=1)
+
+    assert results[0]["status"] == "success"
+    assert writer.max_active == 1
+    assert "== Early Life ==" in results[0]["output"]["wiki_content"]